@@ -0,0 +1,304 @@
+"""
+micro/macro benchmark suite for the hot paths of tensorcircuit with regression tracking
+
+run the suite and save the results (with environment metadata) as json:
+
+    python suite.py -backends numpy jax -o results.json
+
+compare against a stored baseline, exit with code 1 if any case is slower than the threshold:
+
+    python suite.py -baseline baseline.json -threshold 0.2
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+thisfile = os.path.abspath(__file__)
+modulepath = os.path.dirname(os.path.dirname(os.path.dirname(thisfile)))
+sys.path.insert(0, modulepath)
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")  # cpu benchmark
+
+import tensorcircuit as tc
+
+K = tc.backend
+cases: Dict[str, Callable[[int], Callable[[], Any]]] = {}
+
+
+def case(name: str) -> Callable[..., Any]:
+    """
+    register a benchmark case, the decorated function receives the qubit number,
+    does the (untimed) setup and returns the zero-argument function to be timed
+    """
+
+    def wrapper(f: Callable[[int], Callable[[], Any]]) -> Callable[..., Any]:
+        cases[name] = f
+        return f
+
+    return wrapper
+
+
+def brickwall(c: Any, n: int, nlayers: int = 3, seed: int = 42) -> Any:
+    params = np.random.default_rng(seed).uniform(size=[nlayers, n, 2])
+    for i in range(n):
+        c.h(i)
+    for j in range(nlayers):
+        for i in range(n - 1):
+            c.cnot(i, i + 1)
+        for i in range(n):
+            c.rx(i, theta=params[j, i, 0])
+            c.rz(i, theta=params[j, i, 1])
+    return c
+
+
+def block(r: Any) -> Any:
+    # wait for the async dispatch of jax
+    return getattr(r, "block_until_ready", lambda: r)()
+
+
+@case("path_search")
+def path_search(n: int) -> Callable[[], Any]:
+    c = brickwall(tc.Circuit(n), n)
+    nodes, edges = c._copy()
+    contractor = tc.cons.get_contractor("greedy")
+    return lambda: tc.cons.contraction_report(nodes, edges, contractor=contractor)
+
+
+@case("state")
+def state(n: int) -> Callable[[], Any]:
+    return lambda: block(brickwall(tc.Circuit(n), n).state())
+
+
+@case("state_jit")
+def state_jit(n: int) -> Callable[[], Any]:
+    params = K.convert_to_tensor(np.random.default_rng(42).uniform(size=[n]))
+
+    @K.jit
+    def f(params: Any) -> Any:
+        c = brickwall(tc.Circuit(n), n)
+        for i in range(n):
+            c.ry(i, theta=params[i])
+        return c.state()
+
+    return lambda: block(f(params))
+
+
+@case("sample")
+def sample(n: int) -> Callable[[], Any]:
+    c = brickwall(tc.Circuit(n), n)
+    c.state()
+    return lambda: c.sample(batch=1024, allow_state=True, format="count_vector")
+
+
+@case("expectation_ps")
+def expectation_ps(n: int) -> Callable[[], Any]:
+    def f() -> Any:
+        c = brickwall(tc.Circuit(n), n)
+        return block(
+            sum([c.expectation_ps(z=[i, i + 1], reuse=True) for i in range(n - 1)])
+        )
+
+    return f
+
+
+@case("mps_apply")
+def mps_apply(n: int) -> Callable[[], Any]:
+    def f() -> Any:
+        c = tc.MPSCircuit(n)
+        c.set_split_rules({"max_singular_values": 16})
+        return block(brickwall(c, n).wavefunction())
+
+    return f
+
+
+@case("dm_channels")
+def dm_channels(n: int) -> Callable[[], Any]:
+    n = min(n, 8)
+
+    def f() -> Any:
+        c = brickwall(tc.DMCircuit(n), n, nlayers=1)
+        for i in range(n):
+            c.depolarizing(i, px=0.05, py=0.05, pz=0.05)
+            c.amplitudedamping(i, gamma=0.1, p=1.0)
+        return block(c.expectation_ps(z=[0]))
+
+    return f
+
+
+@case("pauli_sum")
+def pauli_sum(n: int) -> Callable[[], Any]:
+    rng = np.random.default_rng(42)
+    ls = rng.integers(0, 4, size=[20 * n, n])
+    weight = rng.normal(size=[20 * n])
+    return lambda: tc.quantum.PauliStringSum2COO(ls, weight)
+
+
+@case("qir_translation")
+def qir_translation(n: int) -> Callable[[], Any]:
+    c = brickwall(tc.Circuit(n), n, nlayers=10)
+
+    def f() -> Any:
+        qir = c.to_qir()
+        s = tc.qasm.qir2qasm(qir, n)
+        c1 = tc.Circuit.from_openqasm(s)
+        return tc.translation.qir2array(c1.to_qir())
+
+    return f
+
+
+def timing(f: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    time0 = time.perf_counter()
+    f()  # staging (jit, path finding cache etc.)
+    time1 = time.perf_counter()
+    ts = []
+    while len(ts) < repeat or sum(ts) < min_time:
+        t0 = time.perf_counter()
+        f()
+        ts.append(time.perf_counter() - t0)
+        if len(ts) >= 100 * repeat:
+            break
+    return {
+        "staging": time1 - time0,
+        "min": float(np.min(ts)),
+        "median": float(np.median(ts)),
+        "mean": float(np.mean(ts)),
+        "std": float(np.std(ts)),
+        "repeat": len(ts),
+    }
+
+
+def versions() -> Dict[str, Optional[str]]:
+    r: Dict[str, Optional[str]] = {}
+    for m in ["tensorcircuit", "numpy", "scipy", "tensornetwork", "opt_einsum", "jax"]:
+        try:
+            r[m] = __import__(m).__version__
+        except ImportError:
+            r[m] = None
+    return r
+
+
+def metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=modulepath,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import cpuinfo
+
+        cpu = cpuinfo.get_cpu_info()["brand_raw"]
+    except ImportError:
+        cpu = platform.processor()
+    return {
+        "time": datetime.datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": cpu,
+        "cpu_count": os.cpu_count(),
+        "versions": versions(),
+    }
+
+
+def run(
+    backends: List[str],
+    n: int,
+    repeat: int = 5,
+    min_time: float = 0.5,
+    filters: Optional[List[str]] = None,
+    dtype: str = "complex64",
+) -> Dict[str, Any]:
+    global K
+    results: Dict[str, Any] = {}
+    for b in backends:
+        for name, builder in cases.items():
+            if filters and not any([s in name for s in filters]):
+                continue
+            with tc.runtime_backend(b) as K, tc.runtime_dtype(dtype):
+                r = timing(builder(n), repeat, min_time)
+            results[b + "/" + name] = r
+            print(
+                "%-28s median: %.3es  min: %.3es  staging: %.3es"
+                % (b + "/" + name, r["median"], r["min"], r["staging"])
+            )
+    return results
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    return the cases whose median time is slower than the baseline by more than ``threshold``
+    (relative), the cases absent in either side are skipped
+    """
+    regressions = []
+    for k, r in results.items():
+        if k not in baseline:
+            continue
+        ratio = r["median"] / baseline[k]["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(k)
+            flag = "  REGRESSION"
+        print("%-28s %.2fx of baseline%s" % (k, ratio, flag))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="tensorcircuit benchmark suite")
+    parser.add_argument("-n", dest="n", type=int, default=10, help="# of qubits")
+    parser.add_argument(
+        "-backends", dest="backends", nargs="+", default=["numpy", "jax"]
+    )
+    parser.add_argument("-dtype", dest="dtype", type=str, default="complex64")
+    parser.add_argument("-repeat", dest="repeat", type=int, default=5)
+    parser.add_argument(
+        "-min_time",
+        dest="min_time",
+        type=float,
+        default=0.5,
+        help="min total running time (s) for each case",
+    )
+    parser.add_argument(
+        "-k", dest="filters", nargs="*", help="only run cases containing the strings"
+    )
+    parser.add_argument("-o", dest="output", type=str, help="output json path")
+    parser.add_argument("-baseline", dest="baseline", type=str, help="baseline json")
+    parser.add_argument(
+        "-threshold",
+        dest="threshold",
+        type=float,
+        default=0.2,
+        help="relative slow down to be flagged as regression",
+    )
+    args = parser.parse_args()
+    meta = metadata()
+    meta.update({"n": args.n, "dtype": args.dtype, "repeat": args.repeat})
+    results = run(
+        args.backends, args.n, args.repeat, args.min_time, args.filters, args.dtype
+    )
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=4)
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("n") != args.n:
+            print("warning: the baseline is measured with n=%s" % baseline["meta"]["n"])
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print("%s regression(s) found: %s" % (len(regressions), regressions))
+            sys.exit(1)
@@ -78,7 +78,7 @@ def sliced_core(param, n, nlayers, ps, cut, mask1, mask2):
     c = circuit(param, n, nlayers)
     ss = sliced_state(c, cut, mask1)
     ssc = sliced_state(c, cut, mask2)
-    ssc, _ = tc.Circuit.copy([ssc], conj=True)
+    ssc, _ = tc.Circuit.copy_nodes([ssc], conj=True)
     op_nodes, op_edges = sliced_op(ps, cut, mask1, mask2)
     nodes = [ss] + ssc + op_nodes
     ssc = ssc[0]
@@ -153,7 +153,7 @@ def sliced_expectation_ref(c, ps, cut):
                 mask2[j] = 1 - mask1[j]
         mask2t = tc.array_to_tensor(np.array(mask2))
         ssc = sliced_state(c, cut, mask2t)
-        ssc, _ = tc.Circuit.copy([ssc], conj=True)
+        ssc, _ = tc.Circuit.copy_nodes([ssc], conj=True)
         ps = tc.array_to_tensor(ps)
         op_nodes, op_edges = sliced_op(ps, cut, mask1t, mask2t)
         nodes = [ss] + ssc + op_nodes
@@ -193,7 +193,17 @@ if __name__ == "__main__":
         sliced_expectation_and_grad, param, n, nlayers, ops, cut, False
     )
 
+    print("built-in sliced contractor")
+    # the same memory bounded strategy without hand-written slicing
+    with tc.runtime_contractor("greedy", max_size=2**8, slice_chunk=4):
+        sliced_vg = K.jit(
+            K.value_and_grad(trivial_core, argnums=0), static_argnums=(1, 2)
+        )
+        r3 = tc.utils.benchmark(sliced_vg, param, n, nlayers)
+
     np.testing.assert_allclose(r0[0][0], r1[0][0], atol=1e-5)
+    np.testing.assert_allclose(r0[0][0], r3[0][0], atol=1e-5)
+    np.testing.assert_allclose(r0[0][1], r3[0][1], atol=1e-5)
     np.testing.assert_allclose(r2[0][0], r1[0][0], atol=1e-5)
     np.testing.assert_allclose(r0[0][1], r1[0][1], atol=1e-5)
     np.testing.assert_allclose(r2[0][1], r1[0][1], atol=1e-5)
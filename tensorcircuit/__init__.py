@@ -2,6 +2,9 @@ __version__ = "0.10.0"
 __author__ = "TensorCircuit Authors"
 __creator__ = "refraction-ray"
 
+import importlib
+from typing import Any, List
+
 from .utils import gpu_memory_share
 
 gpu_memory_share()
@@ -26,7 +29,9 @@ from . import gates
 from . import basecircuit
 from .gates import Gate
 from .circuit import Circuit, expectation
+from .statecircuit import StateCircuit, DMStateCircuit
 from .mpscircuit import MPSCircuit
+from .mpdocircuit import MPDOCircuit
 from .densitymatrix import DMCircuit as DMCircuit_reference
 from .densitymatrix import DMCircuit2
 
@@ -34,24 +39,57 @@ DMCircuit = DMCircuit2  # compatibility issue to still expose DMCircuit2
 from .gates import num_to_tensor, array_to_tensor
 from .vis import qir2tex, render_pdf
 from . import interfaces
-from . import templates
-from . import results
+from . import qasm
 from . import quantum
 from .quantum import QuOperator, QuVector, QuAdjointVector, QuScalar
-from . import compiler
-from . import cloud
-
-try:
-    from . import keras
-    from .keras import KerasLayer, KerasHardwareLayer
-except ModuleNotFoundError:
-    pass  # in case tf is not installed
-
-try:
-    from . import torchnn
-    from .torchnn import TorchLayer, TorchHardwareLayer
-except ModuleNotFoundError:
-    pass  # in case torch is not installed
+
+# submodules depending on heavy frameworks (tf, torch, qiskit, cirq, networkx ...)
+# are only imported when first accessed, see ``__getattr__`` below
+_lazy_modules = {
+    "templates",
+    "results",
+    "compiler",
+    "cloud",
+    "translation",
+    "keras",
+    "torchnn",
+    "applications",
+    "experimental",
+    "noisemodel",
+    "channels",
+    "simplify",
+    "mps_base",
+    "shadows",
+}
+_lazy_attrs = {
+    "KerasLayer": "keras",
+    "KerasHardwareLayer": "keras",
+    "TorchLayer": "torchnn",
+    "TorchHardwareLayer": "torchnn",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Lazy loading of the submodules (PEP 562), so that ``import tensorcircuit``
+    does not import the heavy frameworks until they are used.
+    """
+    if name in _lazy_modules:
+        return importlib.import_module("." + name, __name__)
+    if name in _lazy_attrs:
+        try:
+            m = importlib.import_module("." + _lazy_attrs[name], __name__)
+        except ModuleNotFoundError as e:  # in case tf or torch is not installed
+            raise AttributeError(
+                "module %r has no attribute %r: %s" % (__name__, name, e)
+            ) from e
+        return getattr(m, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | _lazy_modules | set(_lazy_attrs))
+
 
 # just for fun
 from .asciiart import set_ascii
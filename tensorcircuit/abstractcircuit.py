@@ -398,7 +398,10 @@ class AbstractCircuit:
         c: "AbstractCircuit", qir: List[Dict[str, Any]]
     ) -> "AbstractCircuit":
         for d in qir:
-            if "parameters" not in d:
+            if "kraus" in d:
+                # the channels recorded by the noisy simulators such as ``MPDOCircuit``
+                c.apply_general_kraus(d["kraus"], *d["index"], name=d["name"])  # type: ignore
+            elif "parameters" not in d:
                 c.apply_general_gate_delayed(d["gatef"], d["name"], mpo=d["mpo"])(
                     c, *d["index"], split=d["split"]
                 )
@@ -544,7 +547,9 @@ class AbstractCircuit:
         for d in self.to_qir():
             mapped_index = [logical_physical_mapping[i] for i in d["index"]]
 
-            if "parameters" not in d:
+            if "kraus" in d:
+                c.apply_general_kraus(d["kraus"], *mapped_index, name=d["name"])  # type: ignore
+            elif "parameters" not in d:
                 c.apply_general_gate_delayed(d["gatef"], d["name"], mpo=d["mpo"])(
                     c, *mapped_index, split=d["split"]
                 )
@@ -775,14 +780,28 @@ class AbstractCircuit:
 
     def to_openqasm(self, **kws: Any) -> str:
         """
-        transform circuit to openqasm via qiskit circuit,
+        transform circuit to openqasm 2.0 with the native emitter :py:func:`tensorcircuit.qasm.qir2qasm`,
+        circuits with multi-qubit general unitaries that have no native openqasm expression
+        are transformed via qiskit circuit instead,
         see https://qiskit.org/documentation/stubs/qiskit.circuit.QuantumCircuit.qasm.html
         for usage on possible options for ``kws``
 
         :return: circuit representation in openqasm format
         :rtype: str
         """
-        return self.to_qiskit(enable_instruction=True).qasm(**kws)  # type: ignore
+        from .qasm import qir2qasm
+
+        try:
+            s = qir2qasm(self._qir, self._nqubits, extra_qir=self._extra_qir)
+        except NotImplementedError:
+            return self.to_qiskit(enable_instruction=True).qasm(**kws)  # type: ignore
+        if kws.get("filename", None) is not None:
+            with open(kws["filename"], "w", encoding=kws.get("encoding", None)) as f:
+                f.write(s)
+        if kws.get("formatted", False):
+            print(s)
+            return None  # type: ignore
+        return s
 
     @classmethod
     def from_openqasm(
@@ -791,16 +810,28 @@ class AbstractCircuit:
         circuit_params: Optional[Dict[str, Any]] = None,
         keep_measure_order: bool = False,
     ) -> "AbstractCircuit":
-        from qiskit.circuit import QuantumCircuit
+        """
+        load openqasm 2.0 str as a circuit with the native parser :py:func:`tensorcircuit.qasm.qasm2tc`
 
-        if keep_measure_order is True:
-            from .translation import qiskit_from_qasm_str_ordered_measure
+        :param qasmstr: the openqasm 2.0 string
+        :type qasmstr: str
+        :param circuit_params: Extra circuit parameters in the format of ``__init__``,
+            defaults to None
+        :type circuit_params: Optional[Dict[str, Any]], optional
+        :param keep_measure_order: whether to keep the order of measure instructions as in ``qasmstr``,
+            defaults to False, where consecutive measure instructions are sorted by the qubit
+        :type keep_measure_order: bool, optional
+        :return: the circuit
+        :rtype: AbstractCircuit
+        """
+        from .qasm import qasm2tc
 
-            qiskit_circ = qiskit_from_qasm_str_ordered_measure(qasmstr)
-        else:
-            qiskit_circ = QuantumCircuit.from_qasm_str(qasmstr)
-        c = cls.from_qiskit(qiskit_circ, circuit_params=circuit_params)
-        return c
+        return qasm2tc(  # type: ignore
+            qasmstr,
+            circuit_constructor=cls,
+            circuit_params=circuit_params,
+            keep_measure_order=keep_measure_order,
+        )
 
     @classmethod
     def from_openqasm_file(
@@ -809,18 +840,23 @@ class AbstractCircuit:
         circuit_params: Optional[Dict[str, Any]] = None,
         keep_measure_order: bool = False,
     ) -> "AbstractCircuit":
-        from qiskit.circuit import QuantumCircuit
-
-        if keep_measure_order is True:
-            from .translation import qiskit_from_qasm_str_ordered_measure
+        """
+        load openqasm 2.0 file as a circuit, see :py:meth:`from_openqasm`
 
-            with open(file) as f:
-                qasmstr = f.read()
-            qiskit_circ = qiskit_from_qasm_str_ordered_measure(qasmstr)
-        else:
-            qiskit_circ = QuantumCircuit.from_qasm_file(file)
-        c = cls.from_qiskit(qiskit_circ, circuit_params=circuit_params)
-        return c
+        :param file: filename
+        :type file: str
+        :param circuit_params: Extra circuit parameters in the format of ``__init__``,
+            defaults to None
+        :type circuit_params: Optional[Dict[str, Any]], optional
+        :param keep_measure_order: whether to keep the order of measure instructions as in the file,
+            defaults to False
+        :type keep_measure_order: bool, optional
+        :return: the circuit
+        :rtype: AbstractCircuit
+        """
+        with open(file) as f:
+            qasmstr = f.read()
+        return cls.from_openqasm(qasmstr, circuit_params, keep_measure_order)
 
     def draw(self, **kws: Any) -> Any:
         """
@@ -1056,6 +1092,58 @@ class AbstractCircuit:
             jsonstr = json.load(f)
         return cls.from_json(jsonstr, circuit_params)
 
+    def to_npz(self, file: Any, compressed: bool = False) -> None:
+        """
+        circuit dumps to the binary ``.npz`` file in the compact array form of the qir,
+        see :py:func:`tensorcircuit.translation.qir2array`
+
+        :Example:
+
+        >>> c = tc.Circuit(2)
+        >>> c.h(0)
+        >>> c.rx(1, theta=0.2)
+        >>> c.to_npz("circuit.npz")
+        >>> c2 = tc.Circuit.from_npz("circuit.npz")
+
+        :param file: filename or file object to dump the circuit to
+        :type file: Any
+        :param compressed: whether to compress the file, defaults to False
+        :type compressed: bool, optional
+        """
+        from .translation import qir2array
+
+        arrays = qir2array(self.to_qir(), nqubits=self._nqubits)
+        if compressed:
+            np.savez_compressed(file, **arrays)
+        else:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def from_npz(
+        cls, file: Any, circuit_params: Optional[Dict[str, Any]] = None
+    ) -> "AbstractCircuit":
+        """
+        load the ``.npz`` file dumped by :py:meth:`to_npz` as a circuit,
+        the qir is decoded from the arrays in bulk (without the gate tensors),
+        while the circuit is still built by replaying the gates one by one as :py:meth:`from_qir`
+
+        :param file: filename or file object
+        :type file: Any
+        :param circuit_params: Extra circuit parameters in the format of ``__init__``,
+            defaults to None
+        :type circuit_params: Optional[Dict[str, Any]], optional
+        :return: the circuit
+        :rtype: AbstractCircuit
+        """
+        from .translation import array2qir
+
+        with np.load(file) as arrays:
+            qir = array2qir(arrays, with_gates=False)
+            nqubits = int(arrays["nqubits"])
+        circuit_params = dict(circuit_params or {})
+        circuit_params.setdefault("nqubits", nqubits)
+        return cls.from_qir(qir, circuit_params)
+
     def select_gate(self, which: Tensor, kraus: Sequence[Gate], *index: int) -> None:
         """
         Apply ``which``-th gate from ``kraus`` list, i.e. apply kraus[which]
@@ -202,6 +202,9 @@ class JaxBackend(jax_backend.JaxBackend, ExtendedBackend):  # type: ignore
         jnp = libjax.numpy
         jsp = libjax.scipy
 
+        from ..cons import _set_jax_x64, dtypestr
+
+        _set_jax_x64(dtypestr)
         self.name = "jax"
 
     # it is already child of numpy backend, and self.np = self.jax.np
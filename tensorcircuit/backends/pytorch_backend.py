@@ -22,7 +22,6 @@ logger = logging.getLogger(__name__)
 
 # TODO(@refraction-ray): lack stateful random methods implementation for now
 # TODO(@refraction-ray): lack scatter impl for now
-# TODO(@refraction-ray): lack sparse relevant methods for now
 # To be added once pytorch backend is ready
 
 
@@ -378,7 +377,7 @@ class PyTorchBackend(pytorch_backend.PyTorchBackend, ExtendedBackend):  # type:
         return torchlib.nn.Softmax(a, dim=axis)
 
     def onehot(self, a: Tensor, num: int) -> Tensor:
-        return torchlib.nn.functional.one_hot(a, num)
+        return torchlib.nn.functional.one_hot(a.to(torchlib.int64), num)
 
     def cumsum(self, a: Tensor, axis: Optional[int] = None) -> Tensor:
         if axis is None:
@@ -448,6 +447,26 @@ class PyTorchBackend(pytorch_backend.PyTorchBackend, ExtendedBackend):  # type:
     def to_dlpack(self, a: Tensor) -> Any:
         return torchlib.utils.dlpack.to_dlpack(a)
 
+    def coo_sparse_matrix(
+        self, indices: Tensor, values: Tensor, shape: Tensor
+    ) -> Tensor:
+        indices = torchlib.as_tensor(indices, dtype=torchlib.int64)
+        values = torchlib.as_tensor(values)
+        return torchlib.sparse_coo_tensor(indices.T, values, tuple(shape)).coalesce()
+
+    def sparse_dense_matmul(
+        self,
+        sp_a: Tensor,
+        b: Tensor,
+    ) -> Tensor:
+        return torchlib.sparse.mm(sp_a, b)
+
+    def to_dense(self, sp_a: Tensor) -> Tensor:
+        return sp_a.to_dense()
+
+    def is_sparse(self, a: Tensor) -> bool:
+        return a.is_sparse  # type: ignore
+
     def cond(
         self,
         pred: bool,
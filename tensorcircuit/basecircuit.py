@@ -3,7 +3,8 @@ Quantum circuit: common methods for all circuit classes as MixIn
 """
 # pylint: disable=invalid-name
 
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from functools import partial
 
 import numpy as np
@@ -17,12 +18,22 @@ from .quantum import (
     correlation_from_samples,
     correlation_from_counts,
     measurement_counts,
+    qwc_groups,
     sample_int2bin,
     sample_bin2int,
     sample2all,
 )
 from .abstractcircuit import AbstractCircuit
-from .cons import npdtype, backend, dtypestr, contractor, rdtypestr
+from .cons import (
+    npdtype,
+    backend,
+    dtypestr,
+    contractor,
+    rdtypestr,
+    ContractionReport,
+    contraction_report,
+    tag_contraction,
+)
 from .simplify import _split_two_qubit_gate
 from .utils import arg_alias
 
@@ -30,6 +41,18 @@ from .utils import arg_alias
 Gate = gates.Gate
 Tensor = Any
 
+# jitted marginal functions for ``batch_perfect_sampling`` keyed by the network structure
+_marginal_functions: "OrderedDict[Any, Callable[..., Tensor]]" = OrderedDict()
+_marginal_functions_maxsize = 16
+
+
+def _walsh_hadamard(p: Tensor, n: int) -> Tensor:
+    # r[s] = sum_x p[x] (-1)^{popcount(x & s)}, i.e. all Z-string correlations at once
+    for i in range(n):
+        p = backend.reshape(p, [2**i, 2, -1])
+        p = backend.stack([p[:, 0] + p[:, 1], p[:, 0] - p[:, 1]], axis=1)
+    return backend.reshape(p, [-1])
+
 
 class BaseCircuit(AbstractCircuit):
     _nodes: List[tn.Node]
@@ -38,6 +61,7 @@ class BaseCircuit(AbstractCircuit):
     split: Optional[Dict[str, Any]]
 
     is_mps = False
+    incremental = False
 
     @staticmethod
     def all_zero_nodes(n: int, d: int = 2, prefix: str = "qb-") -> List[tn.Node]:
@@ -238,7 +262,24 @@ class BaseCircuit(AbstractCircuit):
                     gateconj.out_edges[i] ^ self._front[ind + nq]
                     self._front[ind + nq] = gateconj.in_edges[i]
 
-        self.state_tensor = None  # refresh the state cache
+        t = getattr(self, "state_tensor", None)
+        if self.incremental and t is not None and not (mpo or applied or self.is_dm):
+            self.state_tensor = self._apply_on_state_tensor(t, gate.tensor, index)
+        else:
+            self.state_tensor = None  # refresh the state cache
+
+    @staticmethod
+    def _apply_on_state_tensor(
+        t: tn.Node, gate: Tensor, index: Sequence[int]
+    ) -> tn.Node:
+        # apply the gate directly on the cached state tensor in the incremental mode
+        g = tn.Node(gate)
+        noe = len(index)
+        front = list(t.edges)
+        for i, ind in enumerate(index):
+            g.get_edge(i + noe) ^ front[ind]
+            front[ind] = g.get_edge(i)
+        return tn.contract_between(g, t, output_edge_order=front)
 
     apply = apply_general_gate
 
@@ -364,6 +405,7 @@ class BaseCircuit(AbstractCircuit):
         """
         return self.measure_jit(*range(self._nqubits), with_prob=True, status=status)
 
+    @tag_contraction("measure")
     def measure_jit(
         self, *index: int, with_prob: bool = False, status: Optional[Tensor] = None
     ) -> Tuple[Tensor, Tensor]:
@@ -440,6 +482,142 @@ class BaseCircuit(AbstractCircuit):
 
     measure = measure_jit
 
+    def _marginal_function(self) -> Tuple[Callable[..., Tensor], List[Tensor]]:
+        # <psi| diag(vs[0]) x ... x diag(vs[n-1]) |psi> (or Tr(rho ...) for dm),
+        # one-hot rows fix the bits and all-one rows trace the qubits out.
+        # The returned function takes the node tensors as arguments, so that it (and its
+        # jit) is reused by every circuit with the same network structure
+        if self.is_dm is False:
+            nodes1, edge1 = self._copy()
+            nodes2, edge2 = self._copy(conj=True)
+            template = nodes1 + nodes2
+        else:
+            template, newfront = self._copy()
+            nfront = len(newfront) // 2
+            edge2 = newfront[nfront:]
+            edge1 = newfront[:nfront]
+        tensors = [node.tensor for node in template]
+        eye = backend.eye(2, dtype=dtypestr)
+        for j in range(self._nqubits):
+            m = Gate(eye)
+            m.get_edge(0) ^ edge1[j]
+            m.get_edge(1) ^ edge2[j]
+            template.append(m)
+        edges: Dict[int, int] = {}
+        structure = tuple(
+            tuple(
+                (edges.setdefault(id(e), len(edges)), e.dimension) for e in node.edges
+            )
+            for node in template
+        )
+        key = (structure, backend.name, dtypestr)
+        if key in _marginal_functions:
+            _marginal_functions.move_to_end(key)
+            return _marginal_functions[key], tensors
+        nqubits = self._nqubits
+
+        def marginal(vs: Tensor, tensors: List[Tensor]) -> Tensor:
+            newnodes = tn.replicate_nodes(template)
+            for node, t in zip(newnodes, tensors):
+                node.tensor = t
+            eye = backend.eye(2, dtype=dtypestr)
+            for j in range(nqubits):
+                newnodes[j - nqubits].tensor = vs[j][:, None] * eye
+            return backend.real(contractor(newnodes).tensor)
+
+        if backend.name != "numpy":
+            marginal = backend.jit(backend.vmap(marginal))
+        _marginal_functions[key] = marginal
+        while len(_marginal_functions) > _marginal_functions_maxsize:
+            _marginal_functions.popitem(last=False)
+        return marginal, tensors
+
+    def batch_perfect_sampling(
+        self,
+        batch: int,
+        index: Optional[Sequence[int]] = None,
+        status: Optional[Tensor] = None,
+        random_generator: Optional[Any] = None,
+    ) -> Tuple[Tensor, Tensor]:
+        """
+        Sampling a batch of bitstrings from the circuit tensor network without the state vector.
+        Qubits are sampled one after another from conditional marginals as in
+        :py:meth:`perfect_sampling`, but all shots are drawn together: each measured qubit
+        costs one vmapped contraction of the full doubled network for the whole batch
+        (one contraction per distinct prefix on numpy backend).
+        The marginal network has the same structure for every qubit and takes the node tensors
+        as inputs, so the contraction path and the jitted function are reused across qubits,
+        shots, repeated calls and circuits with the same structure (e.g. parameter sweeps).
+
+        :Example:
+
+        >>> c = tc.Circuit(2)
+        >>> c.h(0)
+        >>> c.cnot(0, 1)
+        >>> samples, probs = c.batch_perfect_sampling(4)
+        >>> samples
+        array([[1., 1.],
+               [0., 0.],
+               [0., 0.],
+               [1., 1.]], dtype=float32)
+        >>> probs
+        array([0.5, 0.5, 0.5, 0.5], dtype=float32)
+
+        :param batch: number of shots
+        :type batch: int
+        :param index: the measured qubits, defaults to None (all qubits)
+        :type index: Optional[Sequence[int]], optional
+        :param status: external randomness uniformly from [0, 1] with shape [batch, len(index)],
+            defaults to None
+        :type status: Optional[Tensor], optional
+        :param random_generator: random generator, defaults to None
+        :type random_generator: Optional[Any], optional
+        :return: the samples with shape [batch, len(index)]
+            and their theoretical probabilities with shape [batch]
+        :rtype: Tuple[Tensor, Tensor]
+        """
+        if index is None:
+            index = list(range(self._nqubits))
+        index = [i if i >= 0 else self._nqubits + i for i in index]
+        if status is None:
+            if random_generator is None:
+                random_generator = backend.get_random_state()
+            status = backend.stateful_randu(random_generator, shape=[batch, len(index)])
+        status = backend.real(backend.cast(status, dtypestr))
+
+        f, tensors = self._marginal_function()
+        if backend.name == "numpy":
+            # no intrinsic vmap, instead contract once for each distinct prefix
+            def marginal(vs: Tensor) -> Tensor:
+                uvs, inv = np.unique(
+                    np.reshape(vs, [batch, -1]), axis=0, return_inverse=True
+                )
+                ps = [f(np.reshape(v, [-1, 2]), tensors) for v in uvs]
+                return np.array(ps)[np.reshape(inv, [-1])]
+
+        else:
+
+            def marginal(vs: Tensor) -> Tensor:
+                return f(vs, tensors)
+
+        zero = gates.array_to_tensor(np.array([1, 0]))
+        one = gates.array_to_tensor(np.array([0, 1]))
+        vs = [backend.ones([batch, 2], dtype=dtypestr) for _ in range(self._nqubits)]
+        p = backend.ones([batch], dtype=rdtypestr)
+        sample = []
+        for k, j in enumerate(index):
+            vs[j] = backend.tile(zero[None, :], [batch, 1])
+            pu = marginal(backend.stack(vs, axis=1)) / p
+            eps = 0.31415926 * 1e-12
+            sign = backend.sign(status[:, k] - pu + eps) / 2 + 0.5
+            sign = backend.cast(sign, dtype=rdtypestr)
+            sign_complex = backend.cast(sign, dtypestr)[:, None]
+            vs[j] = (1 - sign_complex) * zero[None, :] + sign_complex * one[None, :]
+            sample.append(sign)
+            p = p * (pu * (1 - 2 * sign) + sign)
+        return backend.stack(sample, axis=1), p
+
+    @tag_contraction("amplitude")
     def amplitude(self, l: Union[str, Tensor]) -> Tensor:
         r"""
         Returns the amplitude of the circuit given the bitstring l.
@@ -462,6 +640,19 @@ class BaseCircuit(AbstractCircuit):
         :return: The amplitude of the circuit.
         :rtype: tn.Node.tensor
         """
+        no = self.amplitude_before(l)
+        return contractor(no).tensor
+
+    def amplitude_before(self, l: Union[str, Tensor]) -> List[tn.Node]:
+        """
+        Get the tensor network in the form of a list of nodes
+        for the amplitude calculation before the real contraction
+
+        :param l: The bitstring of 0 and 1s.
+        :type l: Union[str, Tensor]
+        :return: The nodes for the amplitude
+        :rtype: List[tn.Node]
+        """
         no, d_edges = self._copy()
         ms = []
         if self.is_dm:
@@ -501,8 +692,54 @@ class BaseCircuit(AbstractCircuit):
         no.extend(ms)
         if self.is_dm:
             no.extend(msconj)
-        return contractor(no).tensor
+        return no
+
+    def contraction_report(
+        self,
+        kind: str = "state",
+        ops: Optional[Sequence[Tuple[tn.Node, List[int]]]] = None,
+        l: Optional[Union[str, Tensor]] = None,
+    ) -> ContractionReport:
+        """
+        Run only the path finding of the current contractor and report the contraction cost,
+        including flops, peak intermediate size, total write, the path and per-step sizes,
+        without contracting the circuit.
+
+        :Example:
 
+        >>> c = tc.Circuit(4)
+        >>> for i in range(3):
+        ...     c.cnot(i, i + 1)
+        >>> c.contraction_report().peak_size
+        16
+        >>> c.contraction_report("expectation", ops=[(tc.gates.z(), [1])]).peak_size
+        16
+
+        :param kind: "state", "expectation" or "amplitude", defaults to "state"
+        :type kind: str, optional
+        :param ops: the operators for "expectation" in the same format as :py:meth:`expectation`,
+            defaults to None (the norm)
+        :type ops: Optional[Sequence[Tuple[tn.Node, List[int]]]], optional
+        :param l: the bitstring for "amplitude", defaults to None (all zeros)
+        :type l: Optional[Union[str, Tensor]], optional
+        :raises ValueError: unknown ``kind``
+        :return: the cost report
+        :rtype: ContractionReport
+        """
+        if kind == "state":
+            nodes, d_edges = self._copy()
+            return contraction_report(nodes, d_edges)
+        if kind == "expectation":
+            nodes = self.expectation_before(*(ops or []), reuse=False)
+        elif kind == "amplitude":
+            if l is None:
+                l = "0" * self._nqubits
+            nodes = self.amplitude_before(l)
+        else:
+            raise ValueError("unknown contraction report kind: %s" % kind)
+        return contraction_report(nodes)
+
+    @tag_contraction("probability")
     def probability(self) -> Tensor:
         """
         get the 2^n length probability vector over computational basis
@@ -519,6 +756,7 @@ class BaseCircuit(AbstractCircuit):
         return p
 
     @partial(arg_alias, alias_dict={"format": ["format_"]})
+    @tag_contraction("sample")
     def sample(
         self,
         batch: Optional[int] = None,
@@ -544,7 +782,8 @@ class BaseCircuit(AbstractCircuit):
         :param random_generator: random generator,  defaults to None
         :type random_generator: Optional[Any], optional
         :param status: external randomness given by tensor uniformly from [0, 1],
-            if set, can overwrite random_generator
+            if set, can overwrite random_generator, the shape is [batch] if ``allow_state``
+            else [batch, nqubits]
         :type status: Optional[Tensor]
         :return: List (if batch) of tuple (binary configuration tensor and corresponding probability)
             if the format is None, and consistent with format when given
@@ -560,24 +799,14 @@ class BaseCircuit(AbstractCircuit):
                 r = self.perfect_sampling(seed)
                 if format is None:  # batch=None, format=None, backward compatibility
                     return r
-                r = [r]  # type: ignore
+                samples = backend.reshape(r[0], [1, self._nqubits])
             else:
-
-                @backend.jit
-                def perfect_sampling(key: Any) -> Any:
-                    backend.set_random_state(key)
-                    return self.perfect_sampling()
-
-                r = []  # type: ignore
-
-                subkey = random_generator
-                for _ in range(batch):
-                    key, subkey = backend.random_split(subkey)
-                    r.append(perfect_sampling(key))  # type: ignore
-            if format is None:
-                return r
-            r = backend.stack([ri[0] for ri in r])  # type: ignore
-            r = backend.cast(r, "int32")
+                samples, probs = self.batch_perfect_sampling(
+                    batch, status=status, random_generator=random_generator
+                )
+                if format is None:
+                    return [(samples[i], probs[i]) for i in range(batch)]
+            r = backend.cast(samples, "int32")
             ch = sample_bin2int(r, self._nqubits)
         else:  # allow_state
             if batch is None:
@@ -611,6 +840,7 @@ class BaseCircuit(AbstractCircuit):
                 return r
         return sample2all(sample=ch, n=self._nqubits, format=format, jittable=True)
 
+    @tag_contraction("sample_expectation")
     def sample_expectation_ps(
         self,
         x: Optional[Sequence[int]] = None,
@@ -753,6 +983,111 @@ class BaseCircuit(AbstractCircuit):
 
     sexpps = sample_expectation_ps
 
+    def expectation_ps_sum(
+        self,
+        ls: Sequence[Sequence[int]],
+        weight: Optional[Sequence[float]] = None,
+        shots: Optional[int] = None,
+        random_generator: Optional[Any] = None,
+        status: Optional[Tensor] = None,
+        readout_error: Optional[Sequence[Any]] = None,
+    ) -> Tuple[Tensor, Tensor]:
+        """
+        Compute the expectation of a Pauli string sum by measuring qubit-wise commuting groups.
+        The Pauli strings are partitioned by :py:func:`tensorcircuit.quantum.qwc_groups`,
+        the output state is contracted only once, and each group is evaluated from one
+        basis-rotated probability vector (all the Z correlations are obtained by one
+        Walsh-Hadamard transform in the analytical case, or from the same shots if ``shots`` is given).
+
+        :Example:
+
+        >>> c = tc.Circuit(2)
+        >>> c.h(0)
+        >>> c.cnot(0, 1)
+        >>> c.expectation_ps_sum([[1, 1], [3, 3], [2, 2], [3, 0]], [1.0, 1.0, 1.0, 0.5])
+        (array(1., dtype=float32), array([ 1.,  1., -1.,  0.], dtype=float32))
+
+        :param ls: 2D list, each row is for a Pauli string,
+            e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`,
+            the same format as :py:func:`tensorcircuit.quantum.PauliStringSum2COO`
+        :type ls: Sequence[Sequence[int]]
+        :param weight: 1D Tensor, each element corresponds the weight for each Pauli string
+            defaults to None (all Pauli strings weight 1.0)
+        :type weight: Optional[Sequence[float]], optional
+        :param shots: number of measurement shots for each group, defaults to None,
+            indicating analytical result
+        :type shots: Optional[int], optional
+        :param random_generator: random_generator, defaults to None
+        :type random_generator: Optional[Any]
+        :param status: external randomness given by tensor uniformly from [0, 1]
+            with shape [ngroups, shots], if set, can overwrite random_generator
+        :type status: Optional[Tensor]
+        :param readout_error: readout_error, defaults to None
+        :type readout_error: Optional[Sequence[Any]]. Tensor, List, Tuple
+        :return: the weighted sum and the expectation of each Pauli string
+        :rtype: Tuple[Tensor, Tensor]
+        """
+        n = self._nqubits
+        lsa = np.array(ls, dtype=np.int32)
+        groups = qwc_groups(lsa)  # type: ignore
+        if shots is not None and status is None:
+            if random_generator is None:
+                status = backend.implicit_randu(shape=[len(groups), shots])
+            else:
+                status = backend.stateful_randu(
+                    random_generator, shape=[len(groups), shots]
+                )
+
+        inputs_nodes, _ = self._copy_state_tensor()
+        inputs = inputs_nodes[0].tensor
+        values = []
+        for k, group in enumerate(groups):
+            if self.is_dm is False:
+                c = type(self)(n, inputs=inputs)  # type: ignore
+            else:
+                c = type(self)(n, dminputs=inputs)  # type: ignore
+            for i, b in enumerate(np.max(lsa[group], axis=0)):
+                if b == 1:
+                    c.H(i)  # type: ignore
+                elif b == 2:
+                    c.rx(i, theta=np.pi / 2)  # type: ignore
+            p = c.probability()
+            if readout_error is not None:
+                p = self.readouterror_bs(readout_error, p)
+            support = (lsa[group] != 0).astype(np.int32)
+            if shots is None:
+                masks = support @ np.array([2 ** (n - 1 - i) for i in range(n)])
+                values.append(
+                    backend.gather1d(
+                        _walsh_hadamard(backend.real(p), n),
+                        backend.convert_to_tensor(masks),
+                    )
+                )
+            else:
+                mc = measurement_counts(
+                    p,
+                    counts=shots,
+                    format="sample_bin",
+                    status=status[k],  # type: ignore
+                    jittable=True,
+                    is_prob=True,
+                )
+                parity = backend.mod(
+                    backend.cast(mc, "int32")
+                    @ backend.convert_to_tensor(support.T.copy()),
+                    2,
+                )
+                values.append(
+                    backend.mean(backend.cast(1 - 2 * parity, rdtypestr), axis=0)  # type: ignore
+                )
+        values = backend.concat(values)
+        order = np.argsort(np.concatenate(groups))
+        values = backend.gather1d(values, backend.convert_to_tensor(order))
+        if weight is None:
+            weight = [1.0 for _ in range(len(ls))]
+        w = backend.cast(backend.convert_to_tensor(weight), rdtypestr)
+        return backend.sum(w * values), values
+
     def readouterror_bs(
         self, readout_error: Optional[Sequence[Any]] = None, p: Optional[Any] = None
     ) -> Tensor:
@@ -814,6 +1149,7 @@ class BaseCircuit(AbstractCircuit):
             self._nodes[0].tensor = inputs
             if self.is_dm:
                 self._nodes[1].tensor = backend.conj(inputs)
+            self.state_tensor = None
         else:  # TODO(@refraction-ray) replace several start as inputs
             raise NotImplementedError("not support replace with no inputs")
 
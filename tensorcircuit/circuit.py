@@ -12,7 +12,7 @@ import tensornetwork as tn
 
 from . import gates
 from . import channels
-from .cons import backend, contractor, dtypestr, npdtype
+from .cons import backend, contractor, dtypestr, npdtype, tag_contraction
 from .quantum import QuOperator, identity
 from .simplify import _full_light_cone_cancel
 from .basecircuit import BaseCircuit
@@ -44,6 +44,7 @@ class Circuit(BaseCircuit):
         inputs: Optional[Tensor] = None,
         mps_inputs: Optional[QuOperator] = None,
         split: Optional[Dict[str, Any]] = None,
+        incremental: bool = False,
     ) -> None:
         """
         Circuit object based on state simulator.
@@ -58,10 +59,16 @@ class Circuit(BaseCircuit):
         :param split: dict if two qubit gate is ready for split, including parameters for at least one of
             ``max_singular_values`` and ``max_truncation_err``.
         :type split: Optional[Dict[str, Any]]
+        :param incremental: whether to keep the cached output state once it is computed
+            and apply the following gates directly on it, so that interleaving ``state()`` or ``expectation()``
+            with gate applications only costs the newly applied gates, defaults to False.
+            The tensor network representation is kept intact for other methods.
+        :type incremental: bool, optional
         """
         self.inputs = inputs
         self.mps_inputs = mps_inputs
         self.split = split
+        self.incremental = incremental
         self._nqubits = nqubits
 
         self.circuit_param = {
@@ -69,6 +76,7 @@ class Circuit(BaseCircuit):
             "inputs": inputs,
             "mps_inputs": mps_inputs,
             "split": split,
+            "incremental": incremental,
         }
         if (inputs is None) and (mps_inputs is None):
             nodes = self.all_zero_nodes(nqubits)
@@ -165,6 +173,7 @@ class Circuit(BaseCircuit):
         self.coloring_nodes(new_nodes)
         self._nodes = new_nodes + self._nodes[self._start_index :]
         self._start_index = len(new_nodes)
+        self.state_tensor = None
 
     # TODO(@refraction-ray): add noise support in IR
     # TODO(@refraction-ray): unify mid measure to basecircuit
@@ -213,6 +222,7 @@ class Circuit(BaseCircuit):
         self._front[index] = mg2.get_edge(0)
         self._nodes.append(mg1)
         self._nodes.append(mg2)
+        self.state_tensor = None
         r = backend.convert_to_tensor(keep)
         r = backend.cast(r, "int32")
         return r
@@ -659,6 +669,7 @@ class Circuit(BaseCircuit):
         except AssertionError:
             return False
 
+    @tag_contraction("state")
     def wavefunction(self, form: str = "default") -> tn.Node.tensor:
         """
         Compute the output wavefunction from the circuit.
@@ -669,8 +680,11 @@ class Circuit(BaseCircuit):
         :return: Tensor with the corresponding shape.
         :rtype: Tensor
         """
-        nodes, d_edges = self._copy()
-        t = contractor(nodes, output_edge_order=d_edges)
+        if self.incremental:
+            t = self._copy_state_tensor()[0][0]
+        else:
+            nodes, d_edges = self._copy()
+            t = contractor(nodes, output_edge_order=d_edges)
         if form == "default":
             shape = [-1]
         elif form == "ket":
@@ -781,6 +795,7 @@ class Circuit(BaseCircuit):
 
     # TODO(@refraction-ray): more _before function like state_before? and better API?
 
+    @tag_contraction("expectation")
     def expectation(
         self,
         *ops: Tuple[tn.Node, List[int]],
@@ -1,5 +1,6 @@
 from . import apis
 from . import abstraction
+from . import cache
 from . import wrapper
 from .wrapper import batch_expectation_ps
 from .apis import submit_task
@@ -301,6 +301,8 @@ class Task:
         self.id_ = id_
         self.device = device
         self.more_details: Dict[str, Any] = {}
+        # fingerprint to fill the result cache with, see ``cache.ResultCache``
+        self.cache_key: Optional[str] = None
 
     def __repr__(self) -> str:
         return self.device.__repr__() + sep2 + self.id_
@@ -335,6 +337,19 @@ class Task:
         if blocked is False:
             dt = get_task_details(self, **kws)
             dt.update(self.more_details)
+            if self.cache_key is not None and not kws.get("prettify", False):
+                from .cache import get_result_cache
+
+                cache = get_result_cache()
+                if dt.get("state", None) == "completed":
+                    if cache is not None:
+                        cache.put(self.cache_key, dt)
+                    self.cache_key = None
+                elif dt.get("state", None) == "failed":
+                    # to be resubmitted next time
+                    if cache is not None:
+                        cache.remove_submitted(self.cache_key)
+                    self.cache_key = None
             return dt
         s = self.state()
         tries = 0
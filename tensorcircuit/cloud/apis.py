@@ -10,7 +10,10 @@ import os
 import sys
 import logging
 
+from ..abstractcircuit import AbstractCircuit
+from ..utils import is_sequence
 from .abstraction import Provider, Device, Task, sep, sep2
+from .cache import CachedTask, get_result_cache, result_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -421,6 +424,8 @@ def submit_task(
     .. seealso::
 
         :py:meth:`tensorcircuit.cloud.tencent.submit_task`
+        :py:func:`tensorcircuit.cloud.cache.set_result_cache`, with the result cache enabled,
+        circuits with cached results are not submitted again
 
     :param provider: _description_, defaults to None
     :type provider: Optional[Union[str, Provider]], optional
@@ -450,6 +455,14 @@ def submit_task(
 
     if token is None:
         token = device.get_token()  # type: ignore
+    if get_result_cache() is not None:
+        return _submit_task_with_cache(provider, device, token, **task_kws)
+    return _submit_task(provider, device, token, **task_kws)
+
+
+def _submit_task(
+    provider: Provider, device: Device, token: Optional[str], **task_kws: Any
+) -> List[Task]:
     if provider.name == "tencent":  # type: ignore
         return tencent.submit_task(device, token, **task_kws)  # type: ignore
     elif provider.name == "local":  # type: ignore
@@ -460,6 +473,69 @@ def submit_task(
         raise ValueError("Unsupported provider: %s" % provider.name)  # type: ignore
 
 
+def _submit_task_with_cache(
+    provider: Provider, device: Device, token: Optional[str], **task_kws: Any
+) -> List[Task]:
+    """
+    Only submit the circuits whose results are not in the result cache
+    and which are not in flight, the ids of the submitted tasks are recorded right away,
+    and the cache is filled when the details of the submitted tasks are queried as completed
+    """
+    cache = get_result_cache()
+    key = "circuit" if task_kws.get("circuit", None) is not None else "source"
+    circuits = task_kws.get(key, None)
+    single = not is_sequence(circuits)
+    if single:
+        circuits = [circuits]
+    if not all([isinstance(c, (str, AbstractCircuit)) for c in circuits]):  # type: ignore
+        # e.g. qiskit circuit, no canonical hash
+        return _submit_task(provider, device, token, **task_kws)
+    shots = task_kws.get("shots", None)
+    shotss = shots if is_sequence(shots) else [shots] * len(circuits)  # type: ignore
+    options = {k: v for k, v in task_kws.items() if k not in [key, "shots"]}
+    keys = [
+        result_fingerprint(c, device, s, **options) for c, s in zip(circuits, shotss)  # type: ignore
+    ]
+    tasks: List[Task] = []
+    miss = []
+    for i, k in enumerate(keys):
+        dt = cache.get(k)  # type: ignore
+        id_ = cache.get_submitted(k) if dt is None else None  # type: ignore
+        if dt is not None:
+            tasks.append(CachedTask(dt.get("id", k), device, dt))
+        elif id_ is not None:
+            # attach to the task submitted before, e.g. by a crashed process
+            t = Task(id_, device)
+            t.cache_key = k
+            tasks.append(t)
+        else:
+            tasks.append(None)  # type: ignore
+            miss.append(i)
+    logger.info(
+        "%s of %s circuits are found in the result cache or in flight"
+        % (len(keys) - len(miss), len(keys))
+    )
+    if miss:
+        if single:
+            ts = _submit_task(provider, device, token, **task_kws)
+        else:
+            task_kws[key] = [circuits[i] for i in miss]  # type: ignore
+            if is_sequence(shots):
+                task_kws["shots"] = [shots[i] for i in miss]  # type: ignore
+            ts = _submit_task(provider, device, token, **task_kws)
+        if not is_sequence(ts):
+            ts = [ts]  # type: ignore
+        for i, t in zip(miss, ts):
+            t.cache_key = keys[i]
+            tasks[i] = t
+            # the local tasks live in this process only and are completed on submission
+            if provider.name != "local":  # type: ignore
+                cache.put_submitted(keys[i], t.id_)  # type: ignore
+    if single:
+        return tasks[0]  # type: ignore
+    return tasks
+
+
 def resubmit_task(
     task: Optional[Union[str, Task]],
     token: Optional[str] = None,
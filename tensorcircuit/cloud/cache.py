@@ -0,0 +1,269 @@
+"""
+opt-in persistent cache of task results, keyed by the content of the submission
+"""
+
+from contextlib import closing
+from typing import Any, Dict, Optional, Union
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from ..abstractcircuit import AbstractCircuit
+from ..utils import get_cache_dir
+from .abstraction import Device, Task
+
+logger = logging.getLogger(__name__)
+
+# submission options which have no effect on the results
+_irrelevant_options = ["prior", "remarks", "group"]
+
+
+def result_fingerprint(
+    circuit: Union[str, AbstractCircuit],
+    device: Union[str, Device],
+    shots: Optional[int] = None,
+    **kws: Any,
+) -> str:
+    """
+    Hash the task submission: the (compiled) circuit in openqasm, the device name, the shots
+    and the other submission options such as the compiling options.
+
+    :Example:
+
+    >>> c = tc.Circuit(2)
+    >>> c.h(0)
+    >>> k1 = tc.cloud.cache.result_fingerprint(c, "local::testing", 1024)
+    >>> k2 = tc.cloud.cache.result_fingerprint(c.to_openqasm(), "local::testing", 1024)
+    >>> k1 == k2
+    True
+
+    :param circuit: the circuit or its openqasm source
+    :type circuit: Union[str, AbstractCircuit]
+    :param device: the device (or its full name such as ``tencent::9gmon``)
+    :type device: Union[str, Device]
+    :param shots: measurement shots, defaults to None (the default shots of the provider)
+    :type shots: Optional[int], optional
+    :return: the hex sha256 fingerprint
+    :rtype: str
+    """
+    if not isinstance(circuit, str):
+        circuit = circuit.to_openqasm()
+    if shots is not None:
+        shots = int(shots)
+    options = {k: v for k, v in kws.items() if k not in _irrelevant_options}
+    problem = [circuit, str(device), shots, options]
+    return hashlib.sha256(
+        json.dumps(problem, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache (a sqlite file) of the details of completed tasks keyed by
+    :py:func:`result_fingerprint`, shared across processes and restarts,
+    so that the same job is never sent to (and waited on) the device twice.
+    The ids of the submitted tasks are also recorded under their fingerprints until completion,
+    so that the jobs still in flight (e.g. when the process crashed) are attached to
+    instead of resubmitted.
+    Entries older than ``ttl`` are expired, and the least recently used entries
+    are evicted when there are more than ``maxsize`` of them.
+
+    :Example:
+
+    >>> tc.cloud.cache.set_result_cache(ttl=24 * 3600, maxsize=10000)
+    >>> t = tc.cloud.apis.submit_task(device="local::testing", circuit=c)  # run
+    >>> t = tc.cloud.apis.submit_task(device="local::testing", circuit=c)  # from cache
+    """
+
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        ttl: Optional[float] = None,
+        maxsize: Optional[int] = None,
+    ):
+        """
+        :param filename: the sqlite file path, defaults to None, i.e. ``task_results.sqlite``
+            in :py:func:`tensorcircuit.utils.get_cache_dir`
+        :type filename: Optional[str], optional
+        :param ttl: the time to live (s) of the entries, defaults to None (never expire)
+        :type ttl: Optional[float], optional
+        :param maxsize: the max number of entries, defaults to None for unbounded
+        :type maxsize: Optional[int], optional
+        """
+        if filename is None:
+            filename = os.path.join(get_cache_dir(), "task_results.sqlite")
+        self.filename = filename
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                "details TEXT, created REAL, accessed REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS submitted (key TEXT PRIMARY KEY, "
+                "id TEXT, created REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # a fresh connection per operation is thread and multiprocess safe
+        return sqlite3.connect(self.filename, timeout=60)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the task details for the fingerprint ``key``, None if not cached or expired.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT details, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute(
+                    "UPDATE results SET accessed = ? WHERE key = ?", (now, key)
+                )
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])  # type: ignore
+
+    def put(self, key: str, details: Dict[str, Any]) -> None:
+        """
+        Cache the details of the completed task for the fingerprint ``key``,
+        expired and least recently used entries are evicted if necessary.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, details, created, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(details, default=str), now, now),
+            )
+            conn.execute("DELETE FROM submitted WHERE key = ?", (key,))
+            if self.ttl is not None:
+                conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+            if self.maxsize is not None:
+                conn.execute(
+                    "DELETE FROM results WHERE key NOT IN "
+                    "(SELECT key FROM results ORDER BY accessed DESC LIMIT ?)",
+                    (self.maxsize,),
+                )
+
+    def get_submitted(self, key: str) -> Optional[str]:
+        """
+        Get the id of the task submitted but not yet completed for the fingerprint ``key``,
+        None if there is no such task or it is expired.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, created FROM submitted WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return None
+        return row[0]  # type: ignore
+
+    def put_submitted(self, key: str, id_: str) -> None:
+        """
+        Record the id of the task just submitted for the fingerprint ``key``.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO submitted (key, id, created) VALUES (?, ?, ?)",
+                (key, id_, time.time()),
+            )
+
+    def remove_submitted(self, key: str) -> None:
+        """
+        Forget the task submitted for the fingerprint ``key``, e.g. when it failed.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM submitted WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """
+        Remove all the cached results and submitted task ids.
+        """
+        self.hits = 0
+        self.misses = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM results")
+            conn.execute("DELETE FROM submitted")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]  # type: ignore
+
+    def __contains__(self, key: str) -> bool:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and (
+            self.ttl is None or time.time() - row[0] <= self.ttl
+        )
+
+
+class CachedTask(Task):
+    """
+    Task whose details are read from :py:class:`ResultCache`, nothing is sent to the device
+    """
+
+    def __init__(
+        self, id_: str, device: Optional[Device], details: Dict[str, Any]
+    ) -> None:
+        super().__init__(id_, device)
+        self.cached_details = details
+
+    def details(self, blocked: bool = False, **kws: Any) -> Dict[str, Any]:
+        dt = dict(self.cached_details)
+        dt.update(self.more_details)
+        return dt
+
+
+result_cache: Optional[ResultCache] = None
+
+
+def set_result_cache(
+    cache: Union[bool, str, ResultCache] = True, **kws: Any
+) -> Optional[ResultCache]:
+    """
+    Enable (or disable) the task result cache consulted by :py:func:`tensorcircuit.cloud.apis.submit_task`
+    (and thus :py:func:`tensorcircuit.cloud.wrapper.batch_expectation_ps`) before anything is sent.
+
+    :param cache: True for the default sqlite file, str for the sqlite file path,
+        or the ``ResultCache`` object, False to disable the cache, defaults to True
+    :type cache: Union[bool, str, ResultCache], optional
+    :param kws: ``ttl`` and ``maxsize`` for the new ``ResultCache``
+    :type kws: Any
+    :return: the cache in use, None if disabled
+    :rtype: Optional[ResultCache]
+    """
+    global result_cache
+    if cache is False:
+        result_cache = None
+    elif cache is True:
+        result_cache = ResultCache(**kws)
+    elif isinstance(cache, str):
+        result_cache = ResultCache(cache, **kws)
+    else:
+        result_cache = cache
+    return result_cache
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Get the task result cache in use, None if the cache is disabled (the default).
+
+    :return: the cache in use
+    :rtype: Optional[ResultCache]
+    """
+    return result_cache
@@ -7,6 +7,7 @@ import inspect
 import logging
 import os
 import sys
+import threading
 import time
 
 import requests
@@ -104,17 +105,45 @@ def reconnect(tries: int = 5, timeout: int = 12) -> Callable[..., Any]:
     return robustify
 
 
-rget = reconnect()(requests.get)
-rpost = reconnect()(requests.post)
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    The ``requests.Session`` shared by all the http requests of the cloud module,
+    so that the connections are pooled and kept alive across requests (and threads).
+
+    :return: the pooled session
+    :rtype: requests.Session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+    return _session
+
+
+@reconnect()
+def rget(*args: Any, **kws: Any) -> Any:
+    return get_session().get(*args, **kws)
+
+
+@reconnect()
+def rpost(*args: Any, **kws: Any) -> Any:
+    return get_session().post(*args, **kws)
 
 
 @reconnect()
 def rget_json(*args: Any, **kws: Any) -> Any:
-    r = requests.get(*args, **kws)
+    r = get_session().get(*args, **kws)
     return r.json()
 
 
 @reconnect()
 def rpost_json(*args: Any, **kws: Any) -> Any:
-    r = requests.post(*args, **kws)
+    r = get_session().post(*args, **kws)
     return r.json()
@@ -1,8 +1,22 @@
 """
 higher level wrapper shortcut for submit_task
 """
-from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from operator import methodcaller
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 import logging
+import queue
+import threading
 import time
 
 import numpy as np
@@ -16,16 +30,206 @@ from ..quantum import ps2xyz
 from ..compiler import DefaultCompiler
 from ..compiler.simple_compiler import simple_compile
 from .apis import submit_task, get_device
-from .abstraction import Device
+from .abstraction import Device, Task, TaskFailed
 
 
 logger = logging.getLogger(__name__)
 Tensor = Any
 
 
+class BatchRunner:
+    """
+    Run many circuits on the cloud device concurrently.
+    The circuits are submitted chunk by chunk in a background thread,
+    while the tasks already submitted are polled in rounds by a thread pool
+    (one status query per pending task, all issued concurrently in each round).
+    The polling interval is doubled (up to ``max_poll_interval``)
+    after each round where no task finishes, and the results are yielded as they complete.
+
+    :Example:
+
+    >>> runner = tc.cloud.wrapper.BatchRunner("local::testing", batch_limit=2)
+    >>> for i, r in runner.as_completed(cs, shots=1024):
+    ...     print(i, r)
+
+    :param device: The device str or object to run the circuits
+    :type device: Any
+    :param batch_limit: max number of circuits in one submission, defaults to 64
+    :type batch_limit: int, optional
+    :param max_workers: number of threads for concurrent status queries, defaults to 8
+    :type max_workers: int, optional
+    :param submit_interval: sleep time (s) between two submissions, defaults to None,
+        i.e. 1.5 for tencent provider (in case of the duplicate request protection) and 0 otherwise
+    :type submit_interval: Optional[float], optional
+    :param poll_interval: initial sleep time (s) between two polling rounds, defaults to 0.2
+    :type poll_interval: float, optional
+    :param max_poll_interval: max sleep time (s) between two polling rounds, defaults to 8.0
+    :type max_poll_interval: float, optional
+    :param timeout: raise ``TimeoutError`` if the tasks are not all finished
+        in ``timeout`` seconds, defaults to None (wait forever)
+    :type timeout: Optional[float], optional
+    :param kws: other keyword arguments passed to ``submit_task``
+    :type kws: Any
+    """
+
+    def __init__(
+        self,
+        device: Any,
+        batch_limit: int = 64,
+        max_workers: int = 8,
+        submit_interval: Optional[float] = None,
+        poll_interval: float = 0.2,
+        max_poll_interval: float = 8.0,
+        timeout: Optional[float] = None,
+        **kws: Any,
+    ):
+        self.device = device
+        self.batch_limit = batch_limit
+        self.max_workers = max_workers
+        if submit_interval is None:
+            # TODO(@refraction-ray) whether the sleep time is enough for tquk?
+            # incase duplicae request error protection
+            if get_device(device).provider.name == "tencent":
+                submit_interval = 1.5
+            else:
+                submit_interval = 0.0
+        self.submit_interval = submit_interval
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+        self.kws = kws
+
+    def as_completed(
+        self, cs: Sequence[Circuit], shots: int = 8192, **kws: Any
+    ) -> Iterator[Tuple[int, counts.ct]]:
+        """
+        Submit the circuits and yield the results in completion order
+
+        :param cs: the circuits to run
+        :type cs: Sequence[Circuit]
+        :param shots: measurement shots for each circuit, defaults to 8192
+        :type shots: int, optional
+        :yield: pairs of the circuit index in ``cs`` and its count dict result
+        :rtype: Iterator[Tuple[int, counts.ct]]
+        """
+        kws = {**self.kws, **kws}
+        css = [
+            cs[i : i + self.batch_limit] for i in range(0, len(cs), self.batch_limit)
+        ]
+        submitted: "queue.Queue[Any]" = queue.Queue()
+        # set when the consumer stops (finished, failed, timeout or break),
+        # so that no more (paid) tasks are submitted
+        stop = threading.Event()
+
+        def submit() -> None:
+            try:
+                offset = 0
+                for i, cssi in enumerate(css):
+                    if i > 0 and self.submit_interval > 0:
+                        stop.wait(self.submit_interval)
+                    if stop.is_set():
+                        return
+                    ts = submit_task(
+                        circuit=cssi, shots=shots, device=self.device, **kws
+                    )
+                    if not is_sequence(ts):
+                        ts = [ts]  # type: ignore
+                    submitted.put((offset, ts))
+                    offset += len(cssi)
+                submitted.put(None)
+            except Exception as e:  # pylint: disable=broad-except
+                submitted.put(e)
+
+        threading.Thread(target=submit, daemon=True).start()
+        try:
+            pending: Dict[int, Task] = {}
+            submitting = True
+            interval = self.poll_interval
+            time0 = time.time()
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                while submitting or pending:
+                    # collect the newly submitted tasks, wait for them if nothing to poll
+                    while submitting:
+                        try:
+                            item = submitted.get(block=not pending)
+                        except queue.Empty:
+                            break
+                        if item is None:
+                            submitting = False
+                        elif isinstance(item, Exception):
+                            raise item
+                        else:
+                            pending.update(
+                                {item[0] + j: t for j, t in enumerate(item[1])}
+                            )
+                    tasks = list(pending.items())
+                    details = executor.map(
+                        methodcaller("details"), [t for _, t in tasks]
+                    )
+                    finished = False
+                    for (i, t), dt in zip(tasks, details):
+                        if dt["state"] == "completed":
+                            del pending[i]
+                            finished = True
+                            yield i, counts.sort_count(dt["results"])
+                        elif dt["state"] in ["failed"]:
+                            raise TaskFailed(t.id_, dt["state"], dt.get("err", ""))
+                    if not pending:
+                        continue
+                    if self.timeout is not None and time.time() - time0 > self.timeout:
+                        raise TimeoutError(
+                            "%s tasks are still unfinished after %s seconds"
+                            % (len(pending), self.timeout)
+                        )
+                    if finished:
+                        interval = self.poll_interval
+                    else:
+                        interval = min(2 * interval, self.max_poll_interval)
+                    time.sleep(interval)
+        finally:
+            stop.set()
+
+    def run(
+        self, cs: Sequence[Circuit], shots: int = 8192, **kws: Any
+    ) -> List[counts.ct]:
+        """
+        Submit the circuits and collect all the results
+
+        :param cs: the circuits to run
+        :type cs: Sequence[Circuit]
+        :param shots: measurement shots for each circuit, defaults to 8192
+        :type shots: int, optional
+        :return: count dict results in the same order as ``cs``
+        :rtype: List[counts.ct]
+        """
+        logger.info(f"submit task on {self.device} for {len(cs)} circuits")
+        time0 = time.time()
+        l: List[counts.ct] = [None] * len(cs)  # type: ignore
+        for i, r in self.as_completed(cs, shots, **kws):
+            l[i] = r
+        time1 = time.time()
+        logger.info(
+            f"finished collecting count results of {len(cs)} tasks in {round(time1-time0, 4)} seconds"
+        )
+        return l
+
+
 def batch_submit_template(
     device: str, batch_limit: int = 64, **kws: Any
 ) -> Callable[..., List[counts.ct]]:
+    """
+    Return the batch circuit running function on ``device``,
+    see :py:class:`BatchRunner` for the supported keyword arguments
+
+    :param device: The device str or object to run the circuits
+    :type device: str
+    :param batch_limit: max number of circuits in one submission, defaults to 64
+    :type batch_limit: int, optional
+    :return: ``run(cs, shots=8192, **kws)`` returning count dict results of ``cs``
+    :rtype: Callable[..., List[counts.ct]]
+    """
+    runner = BatchRunner(device, batch_limit, **kws)
+
     def run(
         cs: Union[Circuit, Sequence[Circuit]], shots: int = 8192, **nkws: Any
     ) -> List[counts.ct]:
@@ -36,38 +240,7 @@ def batch_submit_template(
         if not is_sequence(cs):
             cs = [cs]  # type: ignore
             single = True
-        # for c in cs:  # type: ignore
-        #     ts.append(submit_task(circuit=c, shots=shots, device=device))
-        #     time.sleep(0.3)
-        kws.update(nkws)
-        if len(cs) <= batch_limit:  # type: ignore
-            css = [cs]
-        else:
-            ntimes = len(cs) // batch_limit  # type: ignore
-            if ntimes * batch_limit == len(cs):  # type: ignore
-                css = [
-                    cs[i * batch_limit : (i + 1) * batch_limit] for i in range(ntimes)  # type: ignore
-                ]
-            else:
-                css = [
-                    cs[i * batch_limit : (i + 1) * batch_limit] for i in range(ntimes)  # type: ignore
-                ] + [
-                    cs[ntimes * batch_limit :]  # type: ignore
-                ]
-        tss = []
-        logger.info(f"submit task on {device} for {len(cs)} circuits")  # type: ignore
-        time0 = time.time()
-        for i, cssi in enumerate(css):
-            tss += submit_task(circuit=cssi, shots=shots, device=device, **kws)
-            if i < len(css) - 1:
-                time.sleep(1.5)
-            # TODO(@refraction-ray) whether the sleep time is enough for tquk?
-            # incase duplicae request error protection
-        l = [t.results() for t in tss]
-        time1 = time.time()
-        logger.info(
-            f"finished collecting count results of {len(cs)} tasks in {round(time1-time0, 4)} seconds"  # type: ignore
-        )
+        l = runner.run(cs, shots, **nkws)  # type: ignore
         if single is False:
             return l
         return l[0]  # type: ignore
@@ -117,8 +290,8 @@ def reduce_and_evaluate(
     reduced_dict = {}
     recover_dict = {}
     # merge the same circuit
-    for j, c in enumerate(cs):
-        key = hash(c.to_openqasm())
+    keys = [c.to_openqasm() for c in cs]
+    for j, (c, key) in enumerate(zip(cs, keys)):
         if key not in reduced_dict:
             reduced_dict[key] = [j]
             reduced_cs.append(c)
@@ -137,8 +310,7 @@ def reduce_and_evaluate(
 
     reduced_raw_counts = run(reduced_cs, shots)
     raw_counts: List[Dict[str, int]] = [None] * len(cs)  # type: ignore
-    for i, c in enumerate(cs):
-        key = hash(c.to_openqasm())
+    for i, key in enumerate(keys):
         raw_counts[i] = reduced_raw_counts[recover_dict[key]]
     return raw_counts
 
@@ -4,4 +4,5 @@ only reserve for internal use
 """
 from .composed_compiler import Compiler, DefaultCompiler, default_compile
 from . import simple_compiler
+from . import dag
 from . import qiskit_compiler
@@ -0,0 +1,266 @@
+"""
+Dependency DAG representation of the qir for linear time circuit simplification
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import gates
+from ..utils import is_sequence
+
+
+# the basis each gate is diagonal in on each of its qubits,
+# two gates commute if they are diagonal in the same basis on all their shared qubits
+_gate_basis: Dict[str, Tuple[str, ...]] = {
+    "i": ("z",),
+    "z": ("z",),
+    "s": ("z",),
+    "sd": ("z",),
+    "t": ("z",),
+    "td": ("z",),
+    "rz": ("z",),
+    "phase": ("z",),
+    "x": ("x",),
+    "rx": ("x",),
+    "cz": ("z", "z"),
+    "rzz": ("z", "z"),
+    "crz": ("z", "z"),
+    "cphase": ("z", "z"),
+    "rxx": ("x", "x"),
+    "cnot": ("z", "x"),
+    "crx": ("z", "x"),
+}
+
+
+class DAGNode:
+    """
+    A gate in :py:class:`QirDAG`, linked to its predecessor and successor on each qubit.
+    """
+
+    __slots__ = ["item", "index", "prev", "next", "alive"]
+
+    def __init__(self, item: Dict[str, Any], index: Tuple[int, ...]):
+        self.item = item
+        self.index = index
+        self.prev: Dict[int, Optional["DAGNode"]] = {}
+        self.next: Dict[int, Optional["DAGNode"]] = {}
+        self.alive = True
+
+    @property
+    def name(self) -> str:
+        if "gatef" in self.item:
+            return self.item["gatef"].n  # type: ignore
+        return self.item.get("name", "")  # type: ignore
+
+
+class QirDAG:
+    """
+    Dependency DAG of the qir, where each gate is linked to the previous and next gate on each of its qubits,
+    so that gates can be appended, replaced and removed in constant time.
+
+    :Example:
+
+    >>> c = tc.Circuit(2)
+    >>> c.h(0)
+    >>> c.cnot(0, 1)
+    >>> dag = tc.compiler.dag.QirDAG.from_qir(c.to_qir())
+    >>> dag.last[1].prev[0].name
+    'h'
+    """
+
+    def __init__(self) -> None:
+        self.nodes: List[DAGNode] = []
+        self.last: Dict[int, DAGNode] = {}
+
+    @classmethod
+    def from_qir(cls, qir: List[Dict[str, Any]]) -> "QirDAG":
+        dag = cls()
+        for d in qir:
+            dag.append(d)
+        return dag
+
+    def append(self, item: Dict[str, Any]) -> DAGNode:
+        """
+        Append the gate ``item`` (in qir format) at the end of the circuit.
+        """
+        node = DAGNode(item, tuple(item["index"]))
+        for q in node.index:
+            p = self.last.get(q, None)
+            node.prev[q] = p
+            node.next[q] = None
+            if p is not None:
+                p.next[q] = node
+            self.last[q] = node
+        self.nodes.append(node)
+        return node
+
+    def remove(self, node: DAGNode) -> None:
+        """
+        Remove the gate ``node`` from the circuit, relinking its neighbours.
+        """
+        for q in node.index:
+            p, n = node.prev[q], node.next[q]
+            if p is not None:
+                p.next[q] = n
+            if n is not None:
+                n.prev[q] = p
+            elif self.last.get(q, None) is node:
+                if p is None:
+                    del self.last[q]
+                else:
+                    self.last[q] = p
+        node.alive = False
+
+    def to_qir(self) -> List[Dict[str, Any]]:
+        """
+        The qir of the remaining gates in a topological order.
+        """
+        return [node.item for node in self.nodes if node.alive]
+
+    def __len__(self) -> int:
+        return len([node for node in self.nodes if node.alive])
+
+
+def commute(a: DAGNode, b: DAGNode) -> bool:
+    """
+    Whether the two gates commute, judged by the bases they are diagonal in on the shared qubits.
+    False is returned if unknown.
+    """
+    ba = _gate_basis.get(a.name, None)
+    bb = _gate_basis.get(b.name, None)
+    if ba is None or bb is None:
+        return False
+    for i, q in enumerate(a.index):
+        if q in b.index and ba[i] != bb[b.index.index(q)]:
+            return False
+    return True
+
+
+def _get_theta(qir_item: Dict[str, Any]) -> float:
+    theta = qir_item["parameters"].get("theta", 0.0)
+    if is_sequence(theta) and len(theta) == 1:
+        return theta[0]  # type: ignore
+    return theta  # type: ignore
+
+
+def _combinable(a: DAGNode, b: DAGNode, rules: Dict[Tuple[str, str], str]) -> bool:
+    return (a.name, b.name) in rules or a.name == b.name + "d" or a.name + "d" == b.name
+
+
+def _combine(
+    a: DAGNode, b: DAGNode, rules: Dict[Tuple[str, str], str]
+) -> Optional[Dict[str, Any]]:
+    # the qir item for gate a followed by gate b, None for identity
+    nn = rules.get((a.name, b.name), "i")
+    if nn == "i":
+        return None
+    param = {}
+    if nn.startswith("r") or nn.startswith("cr"):
+        param = {"theta": _get_theta(a.item) + _get_theta(b.item)}
+    return {
+        "gatef": getattr(gates, nn),
+        "name": nn,
+        "mpo": False,
+        "split": False,
+        "parameters": param,
+        "index": a.item["index"],
+    }
+
+
+def _reachable(node: DAGNode, target: DAGNode, q: int, lookback: int) -> bool:
+    # whether ``target`` is reached from ``node`` backwards on qubit ``q``
+    # by only passing through gates commuting with ``node``
+    p = node.prev[q]
+    for _ in range(lookback):
+        if p is None:
+            return False
+        if p is target:
+            return True
+        if not commute(p, node):
+            return False
+        p = p.prev[q]
+    return False
+
+
+def _find_partner(
+    node: DAGNode, rules: Dict[Tuple[str, str], str], lookback: int
+) -> Optional[DAGNode]:
+    q0 = node.index[0]
+    p = node.prev[q0]
+    for _ in range(lookback):
+        if p is None:
+            return None
+        if p.index == node.index and _combinable(p, node, rules):
+            for q in node.index[1:]:
+                if not _reachable(node, p, q, lookback):
+                    return None
+            return p
+        if not commute(p, node):
+            return None
+        p = p.prev[q0]
+    return None
+
+
+def _is_identity(item: Dict[str, Any], rtol: float, atol: float) -> bool:
+    if "gatef" in item and item["gatef"].n == "i":
+        return True
+    if "parameters" not in item:
+        # fixed gates are not identity
+        return False
+    from .simple_compiler import _get_matrix
+
+    m = _get_matrix(item)
+    # upto a phase
+    return np.allclose(  # type: ignore
+        m / (m[0, 0] + 1e-8), np.eye(m.shape[0]), rtol=rtol, atol=atol
+    )
+
+
+def dag_simplify(
+    qir: List[Dict[str, Any]],
+    rules: Dict[Tuple[str, str], str],
+    prune: bool = True,
+    rtol: float = 1e-3,
+    atol: float = 1e-3,
+    lookback: int = 16,
+) -> List[Dict[str, Any]]:
+    """
+    Simplify the qir in a single sweep on :py:class:`QirDAG`:
+    each gate is cancelled or merged (by ``rules``) with a previous gate on the same qubits,
+    looking through at most ``lookback`` commuting gates, and the merged gate is recursively
+    combined with its predecessors. Gates that are identity up to a phase are pruned if ``prune``.
+
+    :param qir: the qir to be simplified
+    :type qir: List[Dict[str, Any]]
+    :param rules: the merge rules, see ``simple_compiler.default_merge_rules``
+    :type rules: Dict[Tuple[str, str], str]
+    :param prune: whether to prune the identity gates, defaults to True
+    :type prune: bool, optional
+    :param rtol: rtol for identity pruning, defaults to 1e-3
+    :type rtol: float, optional
+    :param atol: atol for identity pruning, defaults to 1e-3
+    :type atol: float, optional
+    :param lookback: the max number of commuting gates to look through, defaults to 16
+    :type lookback: int, optional
+    :return: the simplified qir
+    :rtype: List[Dict[str, Any]]
+    """
+    dag = QirDAG()
+    for d in qir:
+        if prune and _is_identity(d, rtol, atol):
+            continue
+        node = dag.append(d)
+        while True:
+            p = _find_partner(node, rules, lookback)
+            if p is None:
+                break
+            item = _combine(p, node, rules)
+            dag.remove(node)
+            if item is None or (prune and _is_identity(item, rtol, atol)):
+                dag.remove(p)
+                break
+            # the merged gate takes the position of the earlier one
+            p.item = item
+            node = p
+    return dag.to_qir()
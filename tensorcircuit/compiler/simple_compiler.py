@@ -8,8 +8,10 @@ from copy import copy
 import numpy as np
 
 from ..abstractcircuit import AbstractCircuit
-from ..cons import backend
+from ..cons import backend, dtypestr
 from ..quantum import QuOperator
+from ..gates import apply_gate_tensor
+from .dag import dag_simplify
 from .. import gates
 from ..utils import is_sequence
 
@@ -168,86 +170,19 @@ default_merge_rules = {
     ("h", "h"): "i",
     ("rz", "rz"): "rz",
     ("rx", "rx"): "rx",
-    ("ry", "ry"): "rx",
+    ("ry", "ry"): "ry",
     ("rzz", "rzz"): "rzz",
     ("rxx", "rxx"): "rxx",
     ("ryy", "ryy"): "ryy",
     ("crz", "crz"): "crz",
     ("crx", "crx"): "crx",
-    ("cry", "cry"): "crx",
+    ("cry", "cry"): "cry",
     ("cnot", "cnot"): "i",
     ("cz", "cz"): "i",
     ("cy", "cy"): "i",
 }
 
 
-def _find_next(qir: List[Dict[str, Any]], i: int) -> Optional[int]:
-    # if qir[i] is None:
-    # return None
-    index = qir[i]["index"]
-    for j, item in enumerate(qir[i + 1 :]):
-        # if item is not None:
-        if item["index"] == index:
-            return j + i + 1
-        for ind in item["index"]:
-            if ind in index:
-                return None
-    return None
-
-
-def _get_theta(qir_item: Dict[str, Any]) -> float:
-    theta = qir_item["parameters"].get("theta", 0.0)
-    if is_sequence(theta) and len(theta) == 1:
-        return theta[0]  # type: ignore
-    return theta  # type: ignore
-
-
-def _merge(
-    qir: List[Dict[str, Any]], rules: Dict[Tuple[str, ...], str]
-) -> Tuple[List[Dict[str, Any]], bool]:
-    i = 0
-    flg = False
-    while i < len(qir) - 1:
-        j = _find_next(qir, i)
-
-        if j is not None:
-            if (qir[i]["gatef"].n, qir[j]["gatef"].n) in rules:
-                nn = rules[(qir[i]["gatef"].n, qir[j]["gatef"].n)]
-                if nn == "i":
-                    del qir[i]
-                    del qir[j - 1]
-                    # qir[i] = None
-                    # qir[j] = None
-                else:
-                    param = {}
-                    if nn.startswith("r") or nn.startswith("cr"):
-                        param = {"theta": _get_theta(qir[i]) + _get_theta(qir[j])}
-                    qir[i] = {
-                        "gatef": getattr(gates, nn),
-                        "name": nn,
-                        "mpo": False,
-                        "split": False,
-                        "parameters": param,
-                        "index": qir[i]["index"],
-                    }
-                    del qir[j]
-                    # qir[j] = None
-                flg = True
-                # return qir, flg
-            elif (
-                qir[i]["gatef"].n == qir[j]["gatef"].n + "d"
-                or qir[i]["gatef"].n + "d" == qir[j]["gatef"].n
-            ):
-                del qir[i]
-                del qir[j - 1]
-                # qir[i] = None
-                # qir[j] = None
-                flg = True
-                # return qir, True
-        i += 1
-    return qir, flg
-
-
 def merge(
     circuit: Union[AbstractCircuit, List[Dict[str, Any]]],
     rules: Optional[Dict[Tuple[str, ...], str]] = None,
@@ -262,9 +197,7 @@ def merge(
     else:
         qir = circuit.to_qir()
         output = "tc"
-    flg = True
-    while flg:
-        qir, flg = _merge(qir, merge_rules)  # type: ignore
+    qir = dag_simplify(qir, merge_rules, prune=False)
     if output in ["qir"]:
         return qir
     elif output in ["tc", "circuit"]:
@@ -272,6 +205,143 @@ def merge(
         return c
 
 
+def _get_tensor(qir_item: Dict[str, Any]) -> Any:
+    # backend version of ``_get_matrix`` that keeps jit and AD
+    if "gate" in qir_item:
+        op = qir_item["gate"]
+    else:
+        op = qir_item["gatef"](**qir_item.get("parameters", {}))
+    if isinstance(op, QuOperator):
+        return op.eval_matrix()
+    return op.tensor
+
+
+def _fuse_block(items: List[Dict[str, Any]], qubits: List[int], n: int) -> Any:
+    w = len(qubits)
+    u = backend.eye(2**w, dtype=dtypestr)
+    u = backend.reshape(u, [2 for _ in range(w)] + [2**w])
+    for d in items:
+        index = [qubits.index(i if i >= 0 else n + i) for i in d["index"]]
+        u = apply_gate_tensor(u, backend.cast(_get_tensor(d), dtypestr), index)
+    return backend.reshape(u, [2 for _ in range(2 * w)])
+
+
+def _fuse(qir: List[Dict[str, Any]], max_width: int, n: int) -> List[Dict[str, Any]]:
+    # blocks in the output order, each as (qubits, qir items), None for the merged ones
+    blocks: List[Optional[Tuple[List[int], List[Dict[str, Any]]]]] = []
+    active: Dict[int, int] = {}  # qubit -> the open block on it
+    for d in qir:
+        index = [i if i >= 0 else n + i for i in d["index"]]
+        bids = sorted(set(active[i] for i in index if i in active))
+        qubits: List[int] = []
+        for b in bids:
+            qubits.extend(blocks[b][0])  # type: ignore
+        qubits.extend([i for i in index if i not in qubits])
+        if len(qubits) <= max_width:
+            # merge the open blocks on these qubits into one, they act on disjoint qubits
+            # and no later gate touches them, so they can be moved next to each other
+            items: List[Dict[str, Any]] = []
+            for b in bids:
+                items.extend(blocks[b][1])  # type: ignore
+                blocks[b] = None
+            blocks.append((qubits, items + [d]))
+            for i in qubits:
+                active[i] = len(blocks) - 1
+        else:
+            # close the open blocks touched by this gate
+            for i in [i for i, b in active.items() if b in bids]:
+                del active[i]
+            blocks.append((index, [d]))
+            if len(index) <= max_width:
+                for i in index:
+                    active[i] = len(blocks) - 1
+    nqir = []
+    for block in blocks:
+        if block is None:
+            continue
+        qubits, items = block
+        if len(items) == 1:
+            nqir.append(items[0])
+        else:
+            nqir.append(
+                {
+                    "gatef": getattr(gates, "any"),
+                    "name": "any",
+                    "mpo": False,
+                    "split": None,
+                    "parameters": {"unitary": _fuse_block(items, qubits, n)},
+                    "index": tuple(qubits),
+                }
+            )
+    return nqir
+
+
+def fuse(
+    circuit: Union[AbstractCircuit, List[Dict[str, Any]]],
+    max_width: int = 2,
+    **kws: Any
+) -> Any:
+    """
+    Gate fusion: greedily fuse the runs of gates acting on the same small set of qubits
+    into dense unitaries on at most ``max_width`` qubits (as ``any`` gates).
+    The fused unitaries are computed with the backend so that the pass is jittable and differentiable.
+
+    :Example:
+
+    >>> c = tc.Circuit(3)
+    >>> c.h(0)
+    >>> c.rx(1, theta=0.2)
+    >>> c.cnot(0, 1)
+    >>> c.rzz(0, 1, theta=0.3)
+    >>> c.cnot(1, 2)
+    >>> c1 = tc.compiler.simple_compiler.fuse(c, max_width=2)
+    >>> len(c1.to_qir())
+    2
+
+    :param circuit: the circuit or its qir
+    :type circuit: Union[AbstractCircuit, List[Dict[str, Any]]]
+    :param max_width: the max number of qubits for the fused gates, defaults to 2
+    :type max_width: int, optional
+    :return: the fused circuit or qir (in the same form as the input)
+    :rtype: Any
+    """
+    if isinstance(circuit, list):
+        qir = circuit
+        n = max([max(d["index"]) for d in qir] + [-1]) + 1
+        return _fuse(qir, max_width, n)
+    qir = circuit.to_qir()
+    qir = _fuse(qir, max_width, circuit._nqubits)
+    c: Any = type(circuit).from_qir(qir, circuit.circuit_param)
+    return c
+
+
+def fuse_compile(
+    circuit: Any,
+    info: Optional[Dict[str, Any]] = None,
+    output: str = "tc",
+    compiled_options: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    The gate fusion compiler stage for :py:class:`tensorcircuit.compiler.Compiler`,
+    see :py:func:`fuse`, ``compiled_options`` can include ``max_width``.
+    """
+    if compiled_options is None:
+        compiled_options = {}
+    len0 = len(circuit.to_qir())
+    for d in circuit._extra_qir:
+        if d["pos"] < len0 - 1:
+            raise ValueError(
+                "TC's gate fusion doesn't support measurement/reset instructions \
+                in the middle of the circuit"
+            )
+    c = fuse(circuit, **compiled_options)
+    len1 = len(c.to_qir())
+    for d in circuit._extra_qir:
+        d["pos"] = len1
+        c._extra_qir.append(d)
+    return (c, info)
+
+
 def simple_compile(
     circuit: Any,
     info: Optional[Dict[str, Any]] = None,
@@ -291,17 +361,17 @@ def simple_compile(
     c = replace_r(circuit, **compiled_options)
     c = replace_u(c, **compiled_options)
     qir = c.to_qir()
-    len0 = len(qir)
-    qir = merge(qir, **compiled_options)
-    qir = prune(qir, **compiled_options)
+    merge_rules = copy(default_merge_rules)
+    if compiled_options.get("rules", None) is not None:
+        merge_rules.update(compiled_options["rules"])
+    qir = dag_simplify(
+        qir,
+        merge_rules,
+        prune=True,
+        rtol=compiled_options.get("rtol", 1e-3),
+        atol=compiled_options.get("atol", 1e-3),
+    )
     len1 = len(qir)
-    while len1 != len0:
-        len0 = len1
-        qir = merge(qir, **compiled_options)
-        if len(qir) == len0:
-            break
-        qir = prune(qir, **compiled_options)
-        len1 = len(qir)
 
     c = type(circuit).from_qir(qir, circuit.circuit_param)
 
@@ -3,13 +3,30 @@ Constants and setups
 """
 # pylint: disable=invalid-name
 
+import hashlib
+import json
 import logging
+import os
+import sqlite3
 import sys
 import time
-from contextlib import contextmanager
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
 from functools import partial, reduce, wraps
 from operator import mul
-from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
 import opt_einsum
@@ -19,6 +36,7 @@ from tensornetwork.backend_contextmanager import get_default_backend
 from .backends.numpy_backend import NumpyBackend
 from .backends import get_backend
 from .simplify import _multi_remove
+from .utils import get_cache_dir
 
 logger = logging.getLogger(__name__)
 
@@ -151,16 +169,9 @@ def set_dtype(dtype: Optional[str] = None, set_global: bool = True) -> Tuple[str
     else:
         raise ValueError(f"Unsupported data type: {dtype}")
 
-    try:
-        from jax.config import config
-    except ImportError:
-        config = None  # type: ignore
-
-    if config is not None:
-        if dtype == "complex128":
-            config.update("jax_enable_x64", True)
-        elif dtype == "complex64":
-            config.update("jax_enable_x64", False)
+    # jax is not imported here if not yet, the jax backend syncs the x64 flag when created
+    if "jax" in sys.modules:
+        _set_jax_x64(dtype)
 
     if set_global:
         npdtype = getattr(np, dtype)
@@ -178,6 +189,18 @@ def set_dtype(dtype: Optional[str] = None, set_global: bool = True) -> Tuple[str
 
 get_dtype = partial(set_dtype, set_global=False)
 
+
+def _set_jax_x64(dtype: str) -> None:
+    try:
+        from jax.config import config
+    except ImportError:
+        return
+    if dtype == "complex128":
+        config.update("jax_enable_x64", True)
+    elif dtype == "complex64":
+        config.update("jax_enable_x64", False)
+
+
 set_dtype()
 
 
@@ -260,7 +283,11 @@ def _merge_single_gates(
             e0 = n0[0]
         njs = [i for i, n in enumerate(nodes) if id(n) in [id(e0.node1), id(e0.node2)]]
         qjs = [i for i, n in enumerate(queue) if id(n) in [id(e0.node1), id(e0.node2)]]
-        new_node = tn.contract(e0)
+        if e0.node1 is e0.node2:
+            new_node = tn.contract(e0)
+        else:
+            # also contract the parallel edges, e.g. a two-leg node sandwiched by a multi-qubit gate
+            new_node = tn.contract_between(e0.node1, e0.node2)
         total_size += _sizen(new_node)
 
         logger.debug(
@@ -278,6 +305,44 @@ def _merge_single_gates(
     return nodes, total_size
 
 
+def _fuse_nodes(
+    nodes: List[Any], max_width: int = 2, total_size: Optional[int] = None
+) -> Tuple[List[Any], int]:
+    # gate fusion on the tensor network level: greedily contract neighbouring nodes
+    # as long as the merged node has at most ``2 * max_width`` edges
+    slots: List[Any] = list(nodes)
+    if total_size is None:
+        total_size = sum([_sizen(t) for t in slots])
+    where = {id(n): i for i, n in enumerate(slots)}
+    queue = list(range(len(slots)))
+    while queue:
+        i = queue.pop()
+        n0 = slots[i]
+        if n0 is None:
+            continue
+        for e in n0.edges:
+            if e.is_dangling() or e.is_trace():
+                continue
+            n1 = e.node2 if e.node1 is n0 else e.node1
+            j = where.get(id(n1), None)
+            if j is None:
+                continue
+            shared = len(tn.get_shared_edges(n0, n1))
+            if len(n0.edges) + len(n1.edges) - 2 * shared > 2 * max_width:
+                continue
+            new_node = tn.contract_between(n0, n1)
+            total_size += _sizen(new_node)
+            del where[id(n0)]
+            del where[id(n1)]
+            k = max(i, j)
+            slots[min(i, j)] = None
+            slots[k] = new_node
+            where[id(new_node)] = k
+            queue.append(k)
+            break
+    return [n for n in slots if n is not None], total_size
+
+
 def experimental_contractor(
     nodes: List[Any],
     output_edge_order: Optional[List[Any]] = None,
@@ -450,9 +515,11 @@ def _get_path(
     return algorithm(input_sets, output_set, size_dict), nodes
 
 
-def _get_path_cache_friendly(
-    nodes: List[tn.Node], algorithm: Any
-) -> Tuple[List[Tuple[int, int]], List[tn.Node]]:
+def _canonical_nodes(
+    nodes: List[tn.Node],
+) -> Tuple[List[tn.Node], Dict[int, int]]:
+    # relabel edges by the order of appearance and sort nodes by their relabeled edges,
+    # so that the resulting contraction problem only depends on the network structure
     nodes = list(nodes)
     mapping_dict = {}
     i = 0
@@ -461,11 +528,17 @@ def _get_path_cache_friendly(
             if id(e) not in mapping_dict:
                 mapping_dict[id(e)] = i
                 i += 1
-    # TODO(@refraction-ray): may be not that cache friendly, since the edge id correspondence is not that fixed?
     input_sets = [set([mapping_dict[id(e)] for e in node.edges]) for node in nodes]
     placeholder = [[1e20 for _ in range(100)]]
     order = np.argsort(np.array(list(map(sorted, input_sets)) + placeholder, dtype=object))[:-1]  # type: ignore
     nodes_new = [nodes[i] for i in order]
+    return nodes_new, mapping_dict
+
+
+def _get_path_cache_friendly(
+    nodes: List[tn.Node], algorithm: Any
+) -> Tuple[List[Tuple[int, int]], List[tn.Node]]:
+    nodes_new, mapping_dict = _canonical_nodes(nodes)
     if isinstance(algorithm, list):
         return algorithm, nodes_new
 
@@ -482,6 +555,204 @@ def _get_path_cache_friendly(
     # directly get input_sets, output_set and size_dict by using identity function as algorithm
 
 
+def structure_fingerprint(
+    input_sets: Sequence[Any],
+    output_set: Any,
+    size_dict: Dict[Any, int],
+    **kws: Any,
+) -> str:
+    """
+    Hash the contraction problem given in ``opt_einsum`` format (the same inputs the path finder sees),
+    extra keyword arguments such as the optimizer tag and ``memory_limit`` are also hashed in.
+
+    :param input_sets: the edge labels of each node, the order of nodes matters
+    :type input_sets: Sequence[Any]
+    :param output_set: the dangling edge labels
+    :type output_set: Any
+    :param size_dict: the mapping from edge label to edge dimension
+    :type size_dict: Dict[Any, int]
+    :return: the hex sha256 fingerprint
+    :rtype: str
+    """
+    problem = [
+        [sorted(s) for s in input_sets],
+        sorted(output_set),
+        sorted([[k, int(v)] for k, v in size_dict.items()]),
+        sorted([[k, str(v)] for k, v in kws.items()]),
+    ]
+    return hashlib.sha256(json.dumps(problem).encode()).hexdigest()
+
+
+def network_fingerprint(nodes: List[tn.Node], **kws: Any) -> str:
+    """
+    Structure-only fingerprint of a tensor network: it depends on the node connectivity
+    and edge dimensions (and node order), but not on tensor values or Python object ids,
+    so the same circuit built twice (or in another process) gives the same fingerprint.
+
+    :Example:
+
+    >>> c1 = tc.Circuit(3)
+    >>> c1.rx(0, theta=0.2)
+    >>> c2 = tc.Circuit(3)
+    >>> c2.rx(0, theta=0.5)
+    >>> tc.cons.network_fingerprint(c1._nodes) == tc.cons.network_fingerprint(c2._nodes)
+    True
+
+    :param nodes: the list of ``tn.Node``
+    :type nodes: List[tn.Node]
+    :return: the hex sha256 fingerprint
+    :rtype: str
+    """
+    nodes_new, mapping_dict = _canonical_nodes(nodes)
+    input_sets = [[mapping_dict[id(e)] for e in node.edges] for node in nodes_new]
+    output_set = [mapping_dict[id(e)] for e in tn.get_subgraph_dangling(nodes_new)]
+    size_dict = {
+        mapping_dict[id(edge)]: edge.dimension for edge in tn.get_all_edges(nodes_new)
+    }
+    return structure_fingerprint(input_sets, output_set, size_dict, **kws)
+
+
+class PathCache:
+    """
+    LRU cache of contraction paths keyed by the structure fingerprint of the tensor network,
+    optionally persisted in a sqlite file so that paths are shared across processes and restarts.
+
+    :Example:
+
+    >>> cache = tc.cons.PathCache(maxsize=128, persist=True)
+    >>> tc.set_contractor("greedy", path_cache=cache)
+    """
+
+    def __init__(
+        self, maxsize: Optional[int] = 1024, persist: Union[bool, str] = False
+    ):
+        """
+        :param maxsize: the max number of paths kept in memory, defaults to 1024, None for unbounded
+        :type maxsize: Optional[int], optional
+        :param persist: whether to persist paths on disk, True for the default file
+            ``contraction_paths.sqlite`` in :py:func:`tensorcircuit.utils.get_cache_dir`,
+            str for the sqlite file path, defaults to False
+        :type persist: Union[bool, str], optional
+        """
+        self.maxsize = maxsize
+        self._paths: "OrderedDict[str, List[Tuple[int, ...]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if persist is True:
+            self.filename: Optional[str] = os.path.join(
+                get_cache_dir(), "contraction_paths.sqlite"
+            )
+        elif persist:
+            self.filename = persist  # type: ignore
+        else:
+            self.filename = None
+        if self.filename is not None:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS paths (key TEXT PRIMARY KEY, path TEXT)"
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        # a fresh connection per operation is fork and multiprocess safe
+        return sqlite3.connect(self.filename, timeout=60)  # type: ignore
+
+    def _remember(self, key: str, path: List[Tuple[int, ...]]) -> None:
+        self._paths[key] = path
+        self._paths.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._paths) > self.maxsize:
+                self._paths.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[Tuple[int, ...]]]:
+        """
+        Get the contraction path for the fingerprint ``key``, None if not cached.
+        """
+        if key in self._paths:
+            self._paths.move_to_end(key)
+            self.hits += 1
+            return self._paths[key]
+        if self.filename is not None:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT path FROM paths WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None:
+                path = [tuple(ab) for ab in json.loads(row[0])]
+                self._remember(key, path)
+                self.hits += 1
+                return path
+        self.misses += 1
+        return None
+
+    def put(self, key: str, path: Sequence[Sequence[int]]) -> None:
+        """
+        Cache the contraction path for the fingerprint ``key``.
+        """
+        path = [tuple(int(i) for i in ab) for ab in path]
+        self._remember(key, path)  # type: ignore
+        if self.filename is not None:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO paths (key, path) VALUES (?, ?)",
+                    (key, json.dumps(path)),
+                )
+
+    def clear(self, persisted: bool = False) -> None:
+        """
+        Clear the in-memory paths, and also the on-disk ones if ``persisted`` is True.
+        """
+        self._paths.clear()
+        self.hits = 0
+        self.misses = 0
+        if persisted and self.filename is not None:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM paths")
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._paths
+
+
+def path_cache_decorator(
+    algorithm: Callable[..., Any], path_cache: PathCache, tag: Optional[str] = None
+) -> Callable[..., Any]:
+    """
+    Wrap a path finder so that the search is skipped for tensor networks
+    whose structure has been seen before.
+
+    :param algorithm: the path finder with ``opt_einsum`` signature
+    :type algorithm: Callable[..., Any]
+    :param path_cache: the cache to consult and fill
+    :type path_cache: PathCache
+    :param tag: the name distinguishing paths from different path finders in one cache,
+        defaults to None (the name of ``algorithm``)
+    :type tag: Optional[str], optional
+    :return: the path finder with cache
+    :rtype: Callable[..., Any]
+    """
+    if tag is None:
+        tag = getattr(algorithm, "__name__", type(algorithm).__name__)
+
+    def new_algorithm(
+        input_sets: Sequence[Any],
+        output_set: Any,
+        size_dict: Dict[Any, int],
+        **kws: Any,
+    ) -> Any:
+        key = structure_fingerprint(
+            input_sets, output_set, size_dict, path_finder=tag, **kws
+        )
+        path = path_cache.get(key)
+        if path is None:
+            path = algorithm(input_sets, output_set, size_dict, **kws)
+            path_cache.put(key, path)
+        return path
+
+    return new_algorithm
+
+
 # some contractor setup usages
 """
 import cotengra as ctg
@@ -519,6 +790,130 @@ tc.set_contractor("custom", optimizer=opt_reconf)
 """
 
 
+F = TypeVar("F", bound=Callable[..., Any])
+contraction_hooks: List[Callable[[Dict[str, Any]], None]] = []
+# per thread (and per asyncio task) stack of the caller tags
+_contraction_callers: ContextVar[Tuple[str, ...]] = ContextVar(
+    "_contraction_callers", default=()
+)
+
+
+def add_contraction_hook(
+    hook: Callable[[Dict[str, Any]], None]
+) -> Callable[[Dict[str, Any]], None]:
+    """
+    Register a callback invoked with a structured event dict after each contraction
+    by the ``opt_einsum`` based contractors (i.e. except "plain" and "tng").
+    The event contains:
+
+    - ``caller``: the circuit method triggering the contraction, i.e. "state", "densitymatrix"
+      (for ``DMCircuit``), "expectation", "amplitude", "probability", "measure", "sample",
+      "sample_expectation", or the tag given by :py:func:`contraction_caller`, "" if unknown
+    - ``nodes``: the number of nodes in the tensor network
+    - ``path_time``: the path finding time in seconds
+    - ``contraction_time``: the contraction time in seconds
+      (the tracing time if the contraction is jitted)
+    - ``flops``: the estimated number of multiply-adds
+    - ``peak_size``: the number of elements of the largest intermediate tensor
+    - ``peak_bytes``: the bytes of the largest intermediate tensor
+    - ``bytes``: the total bytes allocated for all intermediate tensors
+    - ``nslices``: the number of slices
+    - ``backend``: the backend name
+
+    The function can also be used as a decorator.
+
+    :Example:
+
+    >>> events = []
+    >>> hook = tc.cons.add_contraction_hook(events.append)
+    >>> c = tc.Circuit(3)
+    >>> c.h(0)
+    >>> c.cnot(0, 1)
+    >>> s = c.state()
+    >>> events[-1]["caller"]
+    'state'
+    >>> tc.cons.remove_contraction_hook(hook)
+
+    :param hook: the callback receiving the event dict
+    :type hook: Callable[[Dict[str, Any]], None]
+    :return: the hook itself
+    :rtype: Callable[[Dict[str, Any]], None]
+    """
+    contraction_hooks.append(hook)
+    return hook
+
+
+def remove_contraction_hook(hook: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Unregister the callback added by :py:func:`add_contraction_hook`.
+
+    :param hook: the callback to be removed
+    :type hook: Callable[[Dict[str, Any]], None]
+    """
+    contraction_hooks.remove(hook)
+
+
+@contextmanager
+def contraction_caller(name: str) -> Iterator[None]:
+    """
+    Context manager tagging the contractions within as triggered by ``name`` in the hook events,
+    the outermost tag wins, e.g. the state contraction within sampling is tagged as "sample".
+
+    :param name: the caller tag
+    :type name: str
+    """
+    token = _contraction_callers.set(_contraction_callers.get() + (name,))
+    try:
+        yield
+    finally:
+        _contraction_callers.reset(token)
+
+
+def tag_contraction(name: str) -> Callable[[F], F]:
+    """
+    Decorator version of :py:func:`contraction_caller`, which costs nothing if no hook is registered.
+
+    :param name: the caller tag
+    :type name: str
+    """
+
+    def wrapper(f: F) -> F:
+        @wraps(f)
+        def wrapped(*args: Any, **kws: Any) -> Any:
+            if not contraction_hooks:
+                return f(*args, **kws)
+            with contraction_caller(name):
+                return f(*args, **kws)
+
+        return wrapped  # type: ignore
+
+    return wrapper
+
+
+def _emit_contraction_event(
+    report: "ContractionReport",
+    nnodes: int,
+    path_time: float,
+    contraction_time: float,
+) -> None:
+    itemsize = np.dtype(dtypestr).itemsize
+    callers = _contraction_callers.get()
+    event = {
+        "caller": callers[0] if callers else "",
+        "nodes": nnodes,
+        "path_time": path_time,
+        "contraction_time": contraction_time,
+        "flops": report.flops,
+        "peak_size": report.peak_size,
+        "peak_bytes": report.peak_size * itemsize,
+        "bytes": report.write * itemsize,
+        "nslices": report.nslices,
+        "backend": backend.name,
+    }
+    for hook in contraction_hooks:
+        hook(event)
+
+
 def _base(
     nodes: List[tn.Node],
     algorithm: Any,
@@ -526,6 +921,9 @@ def _base(
     ignore_edge_order: bool = False,
     total_size: Optional[int] = None,
     debug_level: int = 0,
+    max_size: Optional[int] = None,
+    slice_chunk: Optional[int] = None,
+    slice_workers: Optional[int] = None,
 ) -> tn.Node:
     """
     The base method for all `opt_einsum` contractors.
@@ -542,6 +940,13 @@ def _base(
     :type ignore_edge_order: bool
     :param total_size: The total size of the tensor network.
     :type total_size: Optional[int], optional
+    :param max_size: If given, the contraction is sliced so that no intermediate tensor
+        has more than ``max_size`` elements, see :py:func:`get_slices`.
+    :type max_size: Optional[int], optional
+    :param slice_chunk: The number of slices contracted together via vmap, defaults to None
+    :type slice_chunk: Optional[int], optional
+    :param slice_workers: The number of processes for the slices (numpy backend), defaults to None
+    :type slice_workers: Optional[int], optional
     :raises ValueError:"The final node after contraction has more than
         one remaining edge. In this case `output_edge_order` has to be provided," or
         "Output edges are not equal to the remaining non-contracted edges of the final node."
@@ -581,6 +986,10 @@ def _base(
 
     if len(nodes) == 1:
         # There's nothing to contract.
+        if debug_level == 2:
+            return _dry_run_node(nodes, [], output_edge_order, max_size)
+        if contraction_hooks and debug_level == 0:
+            _emit_contraction_event(_nodes_report(nodes, []), 1, 0.0, 0.0)
         if ignore_edge_order:
             return list(nodes)[0]
         return list(nodes)[0].reorder_edges(output_edge_order)
@@ -591,14 +1000,28 @@ def _base(
     # if isinstance(algorithm, list):
     #     path = algorithm
     # else:
+    time0 = time.perf_counter()
     path, nodes = _get_path_cache_friendly(nodes, algorithm)
     if debug_level == 2:  # do nothing
-        if output_edge_order:
-            shape = [e.dimension for e in output_edge_order]
-        else:
-            shape = []
-        return tn.Node(backend.zeros(shape))
+        return _dry_run_node(nodes, path, output_edge_order, max_size)
     logger.info("the contraction path is given as %s" % str(path))
+    hooked = bool(contraction_hooks) and debug_level == 0
+    if hooked:
+        time1 = time.perf_counter()
+        # the cost is estimated before the nodes are consumed by the contraction
+        report = _nodes_report(nodes, path, max_size)
+        nnodes = len(nodes)
+    if max_size is not None and debug_level == 0:
+        if ignore_edge_order or output_edge_order is None:
+            output_edge_order = list(tn.get_subgraph_dangling(nodes))
+        r = _sliced_base(
+            nodes, path, output_edge_order, max_size, slice_chunk, slice_workers
+        )
+        if hooked:
+            _emit_contraction_event(
+                report, nnodes, time1 - time0, time.perf_counter() - time1
+            )
+        return r
     if total_size is None:
         total_size = sum([_sizen(t) for t in nodes])
     for ab in path:
@@ -627,6 +1050,499 @@ def _base(
     final_node = nodes[0]  # nodes were connected, we checked this
     if not ignore_edge_order:
         final_node.reorder_edges(output_edge_order)
+    if hooked:
+        _emit_contraction_event(
+            report, nnodes, time1 - time0, time.perf_counter() - time1
+        )
+    return final_node
+
+
+def _path_sizes(
+    input_lists: List[List[int]],
+    path: Sequence[Sequence[int]],
+    size_dict: Dict[int, int],
+) -> List[Tuple[int, List[int]]]:
+    # sizes and indices of all input and intermediate tensors along the path
+    lists = [list(l) for l in input_lists]
+    r = []
+    for l in lists:
+        r.append((reduce(mul, [size_dict[i] for i in l], 1), l))
+    for ab in path:
+        if len(ab) < 2:
+            continue
+        a, b = ab
+        la, lb = lists[a], lists[b]
+        l = [i for i in la if i not in lb] + [i for i in lb if i not in la]
+        lists = _multi_remove(lists, [a, b])
+        lists.append(l)
+        r.append((reduce(mul, [size_dict[i] for i in l], 1), l))
+    return r
+
+
+class ContractionReport:
+    """
+    The cost of contracting a tensor network along a given path, estimated without any contraction,
+    see :py:func:`contraction_report`.
+    All sizes are in number of tensor elements. For the sliced contraction (``max_size``),
+    the sizes are for one slice while ``flops`` and ``write`` are summed over all slices.
+
+    :Example:
+
+    >>> c = tc.Circuit(10)
+    >>> for i in range(9):
+    ...     c.cnot(i, i + 1)
+    >>> r = c.contraction_report()
+    >>> r.peak_size
+    1024
+    >>> r.to_dict().keys()
+    dict_keys(['flops', 'peak_size', 'write', 'path', 'sizes', 'sliced', 'nslices'])
+    """
+
+    def __init__(
+        self,
+        path: Sequence[Sequence[int]],
+        sizes: Sequence[int],
+        flops: Sequence[int],
+        sliced: Optional[Sequence[int]] = None,
+        nslices: int = 1,
+    ):
+        """
+        :param path: the contraction path in the ``opt_einsum`` linear format
+        :type path: Sequence[Sequence[int]]
+        :param sizes: the size of the intermediate tensor produced in each step of ``path``
+        :type sizes: Sequence[int]
+        :param flops: the number of multiply-adds in each step of ``path``
+        :type flops: Sequence[int]
+        :param sliced: the sliced indices, defaults to None (no slicing)
+        :type sliced: Optional[Sequence[int]], optional
+        :param nslices: the number of slices, defaults to 1
+        :type nslices: int, optional
+        """
+        self.path = [tuple(int(i) for i in ab) for ab in path]
+        self.sizes = [int(s) for s in sizes]
+        self.step_flops = [int(f) for f in flops]
+        self.sliced = list(sliced or [])
+        self.nslices = nslices
+        self.flops = sum(self.step_flops) * nslices
+        self.peak_size = max(self.sizes, default=0)
+        self.write = sum(self.sizes) * nslices
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The report as a json serializable dict.
+        """
+        return {
+            "flops": self.flops,
+            "peak_size": self.peak_size,
+            "write": self.write,
+            "path": [list(ab) for ab in self.path],
+            "sizes": self.sizes,
+            "sliced": self.sliced,
+            "nslices": self.nslices,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            "ContractionReport(log10[FLOPs]=%.3f, log2[SIZE]=%.0f, log2[WRITE]=%.3f, steps=%s, slices=%s)"
+            % (
+                np.log10(max(self.flops, 1)),
+                np.log2(max(self.peak_size, 1)),
+                np.log2(max(self.write, 1)),
+                len(self.path),
+                self.nslices,
+            )
+        )
+
+
+def _path_report(
+    input_lists: List[List[int]],
+    output_list: List[int],
+    path: Sequence[Sequence[int]],
+    size_dict: Dict[int, int],
+    max_size: Optional[int] = None,
+) -> ContractionReport:
+    sliced: List[int] = []
+    nslices = 1
+    if max_size is not None:
+        sliced = get_slices(input_lists, output_list, path, size_dict, max_size)
+        nslices = reduce(mul, [size_dict[i] for i in sliced], 1)
+        size_dict = {i: 1 if i in sliced else d for i, d in size_dict.items()}
+    lists = [list(l) for l in input_lists]
+    sizes, flops = [], []
+    for ab in path:
+        if len(ab) < 2:
+            continue
+        a, b = ab
+        la, lb = lists[a], lists[b]
+        l = [i for i in la if i not in lb] + [i for i in lb if i not in la]
+        lists = _multi_remove(lists, [a, b])
+        lists.append(l)
+        sizes.append(reduce(mul, [size_dict[i] for i in l], 1))
+        flops.append(reduce(mul, [size_dict[i] for i in set(la) | set(lb)], 1))
+    return ContractionReport(path, sizes, flops, sliced, nslices)
+
+
+def _dry_run_node(
+    nodes: List[tn.Node],
+    path: Sequence[Sequence[int]],
+    output_edge_order: Optional[Sequence[tn.Edge]],
+    max_size: Optional[int] = None,
+) -> tn.Node:
+    # the placeholder result for ``debug_level=2`` with the cost report attached
+    if output_edge_order:
+        shape = [e.dimension for e in output_edge_order]
+    else:
+        shape = []
+    node = tn.Node(backend.zeros(shape))
+    node.contraction_report = _nodes_report(nodes, path, max_size)
+    return node
+
+
+def _nodes_report(
+    nodes: List[tn.Node],
+    path: Sequence[Sequence[int]],
+    max_size: Optional[int] = None,
+) -> ContractionReport:
+    input_lists = [[id(e) for e in node.edges] for node in nodes]
+    output_list = [id(e) for e in tn.get_subgraph_dangling(nodes)]
+    size_dict = {id(e): e.dimension for e in tn.get_all_edges(nodes)}
+    return _path_report(input_lists, output_list, path, size_dict, max_size)
+
+
+def contraction_report(
+    nodes: List[tn.Node],
+    output_edge_order: Optional[Sequence[tn.Edge]] = None,
+    contractor: Optional[Callable[..., Any]] = None,
+) -> ContractionReport:
+    """
+    Run only the path finding of the contractor on the tensor network
+    and report the contraction cost (flops, peak intermediate size, total write, the path and per-step sizes).
+    The given nodes are not consumed.
+
+    :Example:
+
+    >>> c = tc.Circuit(3)
+    >>> c.h(0)
+    >>> c.cnot(0, 1)
+    >>> c.cnot(1, 2)
+    >>> nodes, edges = c._copy()
+    >>> tc.cons.contraction_report(nodes, edges).peak_size
+    8
+
+    :param nodes: the tensor network
+    :type nodes: List[tn.Node]
+    :param output_edge_order: the dangling edges in the order of the output,
+        defaults to None (the network has at most one dangling edge)
+    :type output_edge_order: Optional[Sequence[tn.Edge]], optional
+    :param contractor: the contractor from :py:func:`get_contractor`,
+        defaults to None (the current global contractor).
+        Only contractors based on ``opt_einsum`` path finders,
+        i.e. except "plain" and "tng", are supported.
+    :type contractor: Optional[Callable[..., Any]], optional
+    :raises ValueError: the contractor doesn't support the dry run
+    :return: the cost report
+    :rtype: ContractionReport
+    """
+    if contractor is None:
+        contractor = getattr(thismodule, "contractor")
+    ndict, edict = tn.copy(nodes)
+    newnodes = []
+    for n in nodes:
+        newn = ndict[n]
+        newn.flag = getattr(n, "flag", "")
+        newn.id = getattr(n, "id", id(n))
+        newnodes.append(newn)
+    if output_edge_order is not None:
+        output_edge_order = [edict[e] for e in output_edge_order]
+    try:
+        r = contractor(  # type: ignore
+            newnodes, output_edge_order=output_edge_order, debug_level=2
+        )
+    except TypeError:
+        r = None
+    if getattr(r, "contraction_report", None) is None:
+        raise ValueError("the contractor doesn't support the dry run of path finding")
+    return r.contraction_report  # type: ignore
+
+
+def get_slices(
+    input_lists: List[List[int]],
+    output_list: List[int],
+    path: Sequence[Sequence[int]],
+    size_dict: Dict[int, int],
+    max_size: int,
+) -> List[int]:
+    """
+    Greedily choose the indices to be sliced so that every tensor
+    (input and intermediate) along the fixed contraction ``path`` has at most ``max_size`` elements.
+    In each round, the inner index shared by the most oversized tensors
+    (ties broken by the dimension) is sliced.
+
+    :param input_lists: the indices of each input tensor
+    :type input_lists: List[List[int]]
+    :param output_list: the indices of the output tensor, which are never sliced
+    :type output_list: List[int]
+    :param path: the contraction path in the ``opt_einsum`` linear format
+    :type path: Sequence[Sequence[int]]
+    :param size_dict: the dimension for each index
+    :type size_dict: Dict[int, int]
+    :param max_size: the maximal number of elements for all tensors in the contraction
+    :type max_size: int
+    :return: the sliced indices
+    :rtype: List[int]
+    """
+    size_dict = dict(size_dict)
+    sliced: List[int] = []
+    while True:
+        counts: Dict[int, int] = {}
+        for s, l in _path_sizes(input_lists, path, size_dict):
+            if s > max_size:
+                for i in l:
+                    if i not in output_list and size_dict[i] > 1:
+                        counts[i] = counts.get(i, 0) + 1
+        if not counts:
+            # either all tensors fit or the remaining oversized tensors
+            # only carry output indices which cannot be sliced
+            return sliced
+        i = max(counts, key=lambda j: (counts[j], size_dict[j]))
+        sliced.append(i)
+        size_dict[i] = 1
+
+
+def _contract_by_path(
+    tensors: List[Any],
+    input_lists: List[List[int]],
+    path: Sequence[Sequence[int]],
+    output_list: List[int],
+) -> Any:
+    tensors = list(tensors)
+    lists = [list(l) for l in input_lists]
+    for ab in path:
+        if len(ab) < 2:
+            continue
+        a, b = ab
+        la, lb = lists[a], lists[b]
+        shared = [i for i in la if i in lb]
+        if shared:
+            t = backend.tensordot(
+                tensors[a],
+                tensors[b],
+                [[la.index(i) for i in shared], [lb.index(i) for i in shared]],
+            )
+        else:
+            t = backend.outer_product(tensors[a], tensors[b])
+        l = [i for i in la if i not in shared] + [i for i in lb if i not in shared]
+        tensors = _multi_remove(tensors, [a, b])
+        lists = _multi_remove(lists, [a, b])
+        tensors.append(t)
+        lists.append(l)
+    if len(tensors) > 1:
+        t, l = tensors[0], lists[0]
+        for t1, l1 in zip(tensors[1:], lists[1:]):
+            t = backend.outer_product(t, t1)
+            l = l + l1
+        tensors, lists = [t], [l]
+    perm = [lists[0].index(i) for i in output_list]
+    if perm != list(range(len(perm))):
+        return backend.transpose(tensors[0], perm)
+    return tensors[0]
+
+
+def _slice_tensor(
+    t: Any, l: List[int], sliced: List[int], values: Any, size_dict: Dict[int, int]
+) -> Any:
+    # fix the sliced indices of t to ``values`` (possibly traced) by one-hot projections,
+    # from the last axis so that the positions of the remaining axes are unchanged
+    for p in reversed(range(len(l))):
+        if l[p] in sliced:
+            m = sliced.index(l[p])
+            oh = backend.onehot(values[m], size_dict[l[p]])
+            oh = backend.cast(oh, backend.dtype(t))
+            t = backend.tensordot(t, oh, [[p], [0]])
+    return t
+
+
+_slice_worker_state: Dict[str, Any] = {}
+
+
+def _slice_worker_init(spec: Dict[str, Any]) -> None:
+    from multiprocessing import shared_memory
+
+    setattr(thismodule, "backend", get_backend("numpy"))
+    shms = [shared_memory.SharedMemory(name=name) for name, _, _ in spec["tensors"]]
+    arrays: List[Any] = [
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        for shm, (_, shape, dtype) in zip(shms, spec["tensors"])
+    ]
+    _slice_worker_state.clear()
+    _slice_worker_state.update(spec, shms=shms, arrays=arrays)
+
+
+def _slice_worker_run(start: int, stop: int) -> Any:
+    st = _slice_worker_state
+    dims = [st["size_dict"][i] for i in st["sliced"]]
+    r = None
+    for k in range(start, stop):
+        asg = dict(zip(st["sliced"], np.unravel_index(k, dims)))
+        ts = [
+            t[tuple([asg.get(i, slice(None)) for i in l])]
+            for t, l in zip(st["arrays"], st["input_lists"])
+        ]
+        rk = _contract_by_path(ts, st["sliced_lists"], st["path"], st["output_list"])
+        r = rk if r is None else r + rk
+    return r
+
+
+def _parallel_slices(
+    tensors: List[Any],
+    spec: Dict[str, Any],
+    nslices: int,
+    workers: int,
+) -> Any:
+    """
+    Contract the slices in a process pool (numpy backend),
+    the static tensors are put in shared memory and the path is shipped once per worker.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    shms = []
+    try:
+        descs = []
+        for t in tensors:
+            t = np.ascontiguousarray(t)
+            shm = shared_memory.SharedMemory(create=True, size=max(t.nbytes, 1))
+            shms.append(shm)
+            np.ndarray(t.shape, dtype=t.dtype, buffer=shm.buf)[...] = t
+            descs.append((shm.name, t.shape, t.dtype.str))
+        spec = dict(spec, tensors=descs)
+        bounds = np.linspace(0, nslices, min(nslices, 4 * workers) + 1).astype(int)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_slice_worker_init, initargs=(spec,)
+        ) as pool:
+            futures = [
+                pool.submit(_slice_worker_run, int(a), int(b))
+                for a, b in zip(bounds[:-1], bounds[1:])
+                if b > a
+            ]
+            return reduce(lambda x, y: x + y, [fu.result() for fu in futures])
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+
+def _sliced_base(
+    nodes: List[tn.Node],
+    path: Sequence[Sequence[int]],
+    output_edge_order: Sequence[tn.Edge],
+    max_size: int,
+    slice_chunk: Optional[int] = None,
+    slice_workers: Optional[int] = None,
+) -> tn.Node:
+    """
+    Contract ``nodes`` along ``path`` with the sliced contraction,
+    where the same path is reused for all slices.
+
+    :param nodes: the nodes to be contracted, in the order consistent with ``path``
+    :type nodes: List[tn.Node]
+    :param path: the contraction path in the ``opt_einsum`` linear format
+    :type path: Sequence[Sequence[int]]
+    :param output_edge_order: the dangling edges in the order of the output
+    :type output_edge_order: Sequence[tn.Edge]
+    :param max_size: the maximal number of elements for intermediate tensors
+    :type max_size: int
+    :param slice_chunk: the number of slices contracted together via ``backend.vmap``,
+        defaults to None (slices are contracted sequentially).
+        On jax backend, the (chunked) slices are looped by ``lax.scan``
+        to keep the compiled program compact.
+    :type slice_chunk: Optional[int], optional
+    :param slice_workers: the number of processes to contract the slices in parallel,
+        only supported on numpy backend, defaults to None (in the current process)
+    :type slice_workers: Optional[int], optional
+    :return: the node for the contraction result with ``output_edge_order`` as edges
+    :rtype: tn.Node
+    """
+    input_lists = [[id(e) for e in node.edges] for node in nodes]
+    output_list = [id(e) for e in output_edge_order]
+    size_dict = {id(e): e.dimension for e in tn.get_all_edges(nodes)}
+    sliced = get_slices(input_lists, output_list, path, size_dict, max_size)
+    tensors = [node.tensor for node in nodes]
+    dims = [size_dict[i] for i in sliced]
+    nslices = reduce(mul, dims, 1)
+    # the k-th slice fixes the sliced indices to the digits of k in the mixed radix ``dims``
+    strides = [reduce(mul, dims[m + 1 :], 1) for m in range(len(dims))]
+    logger.info(
+        "sliced contraction with %s indices and %s slices" % (len(sliced), nslices)
+    )
+    sliced_lists = [[i for i in l if i not in sliced] for l in input_lists]
+
+    def f(k: Any) -> Any:
+        values = [(k // strides[m]) % dims[m] for m in range(len(dims))]
+        ts = [
+            _slice_tensor(t, l, sliced, values, size_dict)
+            for t, l in zip(tensors, input_lists)
+        ]
+        return _contract_by_path(ts, sliced_lists, path, output_list)
+
+    if slice_workers and slice_workers > 1 and nslices > 1:
+        if backend.name == "numpy":
+            spec = {
+                "input_lists": input_lists,
+                "sliced_lists": sliced_lists,
+                "output_list": output_list,
+                "size_dict": size_dict,
+                "sliced": sliced,
+                "path": [tuple(ab) for ab in path],
+            }
+            r = _parallel_slices(tensors, spec, nslices, slice_workers)
+            return _sliced_result_node(r, nodes, output_edge_order)
+        logger.warning(
+            "`slice_workers` is only supported on numpy backend, "
+            "slices are contracted in the current process instead"
+        )
+
+    def krange(start: int, stop: int) -> Any:
+        return backend.convert_to_tensor(np.arange(start, stop, dtype=np.int32))
+
+    if slice_chunk:
+        chunk = min(slice_chunk, nslices)
+        vf = backend.vmap(f, vectorized_argnums=0)
+
+        def fc(ks: Any) -> Any:
+            return backend.sum(vf(ks), axis=0)
+
+    else:
+        chunk = 1
+
+        def fc(ks: Any) -> Any:
+            return f(ks[0])
+
+    nfull = nslices // chunk * chunk
+    r = fc(krange(0, chunk))
+    if backend.name == "jax" and nfull > chunk:
+        offsets = krange(chunk, nfull)[::chunk]
+        r = backend.scan(lambda carry, x: carry + fc(x + krange(0, chunk)), offsets, r)
+        start = nfull
+    else:
+        start = chunk
+    for k in range(start, nslices, chunk):
+        r = r + fc(krange(k, min(k + chunk, nslices)))
+    return _sliced_result_node(r, nodes, output_edge_order)
+
+
+def _sliced_result_node(
+    r: Any, nodes: List[tn.Node], output_edge_order: Sequence[tn.Edge]
+) -> tn.Node:
+    # move the dangling edges onto the result node as ``tn.contract_between`` does
+    final_node = tn.Node(r, backend=nodes[0].backend)
+    for i, e in enumerate(output_edge_order):
+        old_node, old_axis = e.node1, e.axis1
+        e.update_axis(
+            old_axis=old_axis, old_node=old_node, new_axis=i, new_node=final_node
+        )
+        final_node.add_edge(e, i, override=True)
+        old_node.add_edge(tn.Edge(old_node, old_axis), old_axis, override=True)
     return final_node
 
 
@@ -641,12 +1557,21 @@ def custom(
     if len(nodes) < 5:
         alg = opt_einsum.paths.optimal
         # not good at minimize WRITE actually...
-        return _base(nodes, alg, output_edge_order, ignore_edge_order)
+        return _base(
+            nodes,
+            alg,
+            output_edge_order,
+            ignore_edge_order,
+            debug_level=kws.get("debug_level", 0),
+        )
 
     total_size = None
+    # also in the dry run, so that the report describes the network really contracted
     if kws.get("preprocessing", None):
         # nodes = _full_light_cone_cancel(nodes)
         nodes, total_size = _merge_single_gates(nodes)
+    if kws.get("fusion", None):
+        nodes, total_size = _fuse_nodes(nodes, kws["fusion"], total_size)
     if not isinstance(optimizer, list):
         alg = partial(optimizer, memory_limit=memory_limit)
     else:
@@ -659,6 +1584,9 @@ def custom(
         ignore_edge_order,
         total_size,
         debug_level=debug_level,
+        max_size=kws.get("max_size", None),
+        slice_chunk=kws.get("slice_chunk", None),
+        slice_workers=kws.get("slice_workers", None),
     )
 
 
@@ -675,16 +1603,31 @@ def custom_stateful(
         alg = opt_einsum.paths.optimal
         # dynamic_programming has a potential bug for outer product
         # not good at minimize WRITE actually...
-        return _base(nodes, alg, output_edge_order, ignore_edge_order)
+        return _base(
+            nodes,
+            alg,
+            output_edge_order,
+            ignore_edge_order,
+            debug_level=kws.get("debug_level", 0),
+        )
 
     total_size = None
+    # also in the dry run, so that the report describes the network really contracted
     if kws.get("preprocessing", None):
         nodes, total_size = _merge_single_gates(nodes)
+    if kws.get("fusion", None):
+        nodes, total_size = _fuse_nodes(nodes, kws["fusion"], total_size)
     if opt_conf is None:
         opt_conf = {}
     opt = optimizer(**opt_conf)  # reinitiate the optimizer each time
     if kws.get("contraction_info", None):
         opt = contraction_info_decorator(opt)
+    if kws.get("path_cache", None) is not None:
+        opt = path_cache_decorator(
+            opt,
+            kws["path_cache"],
+            tag=getattr(optimizer, "__name__", "custom_stateful") + str(opt_conf),
+        )
     alg = partial(opt, memory_limit=memory_limit)
     debug_level = kws.get("debug_level", 0)
 
@@ -695,6 +1638,9 @@ def custom_stateful(
         ignore_edge_order,
         total_size,
         debug_level=debug_level,
+        max_size=kws.get("max_size", None),
+        slice_chunk=kws.get("slice_chunk", None),
+        slice_workers=kws.get("slice_workers", None),
     )
 
 
@@ -736,6 +1682,11 @@ def set_contractor(
     set_global: bool = True,
     contraction_info: bool = False,
     debug_level: int = 0,
+    path_cache: Union[None, bool, PathCache] = None,
+    max_size: Optional[int] = None,
+    slice_chunk: Optional[int] = None,
+    slice_workers: Optional[int] = None,
+    fusion: Optional[int] = None,
     **kws: Any,
 ) -> Callable[..., Any]:
     """
@@ -749,6 +1700,34 @@ def set_contractor(
     :param memory_limit: It is not very useful, as ``memory_limit`` leads to ``branch`` contraction
         instead of ``greedy`` which is rather slow, defaults to None
     :type memory_limit: Optional[int], optional
+    :param path_cache: reuse contraction paths for tensor networks with the same structure,
+        True for a new in-memory :py:class:`PathCache`, or a given (possibly persistent)
+        ``PathCache``, defaults to None (no path cache).
+        Paths are keyed by the method (or custom optimizer) name, so configure
+        different custom optimizers with different ``PathCache`` objects.
+    :type path_cache: Union[None, bool, PathCache], optional
+    :param max_size: bound the peak memory of the contraction: indices are sliced
+        so that no intermediate tensor has more than ``max_size`` elements,
+        and the sliced subnetworks are contracted with the same path and summed,
+        defaults to None (no slicing). Only valid for "custom", "custom_stateful"
+        and opt_einsum methods.
+    :type max_size: Optional[int], optional
+    :param slice_chunk: the number of slices contracted together via ``backend.vmap``
+        when ``max_size`` is set, trading memory for speed,
+        defaults to None (slices are contracted one by one)
+    :type slice_chunk: Optional[int], optional
+    :param slice_workers: the number of processes in a pool to contract the slices
+        in parallel when ``max_size`` is set, the tensors are shared with the workers
+        via shared memory and the partial results are summed.
+        Only supported on numpy backend, defaults to None (no process pool)
+    :type slice_workers: Optional[int], optional
+    :param fusion: fuse neighbouring gates before the path finding:
+        connected nodes are greedily contracted as long as the merged node acts on at most
+        ``fusion`` qubits (``2 * fusion`` edges), so that there are fewer and denser nodes,
+        defaults to None (no fusion). Only valid for "custom", "custom_stateful"
+        and opt_einsum methods. See also :py:func:`tensorcircuit.compiler.simple_compiler.fuse`
+        for the gate fusion on the circuit level.
+    :type fusion: Optional[int], optional
     :raises Exception: Tensornetwork version is too low to support some of the contractors.
     :raises ValueError: Unknown method options.
     :return: The new tensornetwork with its contractor set.
@@ -784,6 +1763,11 @@ def set_contractor(
                 progbar=True,
             )
 
+    if path_cache is True:
+        path_cache = PathCache()
+    elif path_cache is False:
+        path_cache = None
+
     if method == "plain":
         cf = plain_contractor
     elif method == "plain-experimental":
@@ -803,6 +1787,11 @@ def set_contractor(
             opt_conf=opt_conf,
             contraction_info=contraction_info,
             debug_level=debug_level,
+            path_cache=path_cache,
+            max_size=max_size,
+            slice_chunk=slice_chunk,
+            slice_workers=slice_workers,
+            fusion=fusion,
             **kws,
         )
 
@@ -813,13 +1802,22 @@ def set_contractor(
 
         if method != "custom":
             optimizer = getattr(opt_einsum.paths, method)
+            tag = method
+        else:
+            tag = getattr(optimizer, "__name__", type(optimizer).__name__)
         if contraction_info is True:
             optimizer = contraction_info_decorator(optimizer)  # type: ignore
+        if path_cache is not None and not isinstance(optimizer, list):
+            optimizer = path_cache_decorator(optimizer, path_cache, tag=tag)  # type: ignore
         cf = partial(
             custom,
             optimizer=optimizer,
             memory_limit=memory_limit,
             debug_level=debug_level,
+            max_size=max_size,
+            slice_chunk=slice_chunk,
+            slice_workers=slice_workers,
+            fusion=fusion,
             **kws,
         )
     if set_global:
@@ -14,7 +14,7 @@ from . import gates
 from . import channels
 from .channels import kraus_to_super_gate
 from .circuit import Circuit
-from .cons import backend, contractor, dtypestr
+from .cons import backend, contractor, dtypestr, tag_contraction
 from .basecircuit import BaseCircuit
 from .quantum import QuOperator
 
@@ -213,6 +213,7 @@ class DMCircuit(BaseCircuit):
 
         return apply
 
+    @tag_contraction("densitymatrix")
     def densitymatrix(self, check: bool = False, reuse: bool = True) -> Tensor:
         """
         Return the output density matrix of the circuit.
@@ -265,6 +266,7 @@ class DMCircuit(BaseCircuit):
         _, edges = self._copy()
         return QuOperator(edges[: self._nqubits], edges[self._nqubits :])
 
+    @tag_contraction("expectation")
     def expectation(
         self,
         *ops: Tuple[tn.Node, List[int]],
@@ -9,6 +9,7 @@ import numpy as np
 
 from .cons import backend, dtypestr, contractor, rdtypestr
 from .gates import Gate
+from .quantum import PauliSumOperator
 
 Tensor = Any
 Circuit = Any
@@ -505,6 +506,7 @@ def evol_global(
     :param c: _description_
     :type c: Circuit
     :param h_fun: h_fun should return a **SPARSE** Hamiltonian matrix
+        or a matrix-free :py:class:`tensorcircuit.quantum.PauliSumOperator`
         with input arguments time and *args
     :type h_fun: Callable[..., Tensor]
     :param t: _description_
@@ -519,6 +521,8 @@ def evol_global(
 
     def f(y: Tensor, t: Tensor, *args: Any) -> Tensor:
         h = -1.0j * h_fun(t, *args)
+        if isinstance(h, PauliSumOperator):
+            return h.matvec(y)
         return backend.sparse_dense_matmul(h, y)
 
     ts = backend.stack([0.0, t])
@@ -423,6 +423,45 @@ def matrix_for_gate(gate: Gate, tol: float = 1e-6) -> Tensor:
     return t
 
 
+def apply_gate_tensor(state: Tensor, gate: Tensor, index: Sequence[int]) -> Tensor:
+    """
+    Apply the gate on the given axes of the state tensor,
+    other axes (including possible extra axes beyond the qubits) are kept in order.
+    This is the dense kernel shared by :py:class:`tensorcircuit.statecircuit.StateCircuit`
+    and the compiler.
+
+    :Example:
+
+    >>> s = np.zeros([2, 2], dtype=np.complex64)
+    >>> s[0, 0] = 1.0
+    >>> tc.gates.apply_gate_tensor(s, tc.gates._x_matrix, [1])
+    array([[0.+0.j, 1.+0.j],
+           [0.+0.j, 0.+0.j]])
+
+    :param state: the state tensor of shape ``[2, 2, ..., 2, ...]``
+    :type state: Tensor
+    :param gate: the gate tensor or matrix acting on ``len(index)`` qubits
+    :type gate: Tensor
+    :param index: the axes the gate acts on
+    :type index: Sequence[int]
+    :return: the new state tensor
+    :rtype: Tensor
+    """
+    noe = len(index)
+    rank = len(state.shape)
+    gate = backend.reshape(gate, [2 for _ in range(2 * noe)])
+    t = backend.tensordot(gate, state, [list(range(noe, 2 * noe)), list(index)])
+    rest = [j for j in range(rank) if j not in index]
+    perm = [0 for _ in range(rank)]
+    for i, j in enumerate(index):
+        perm[j] = i
+    for i, j in enumerate(rest):
+        perm[j] = noe + i
+    if perm == list(range(rank)):
+        return t
+    return backend.transpose(t, perm)
+
+
 def bmatrix(a: Array) -> str:
     r"""
     Returns a :math:`\LaTeX` bmatrix.
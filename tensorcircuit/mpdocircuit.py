@@ -0,0 +1,674 @@
+"""
+Quantum circuit: matrix product density operator simulator for noisy circuits
+"""
+# pylint: disable=invalid-name
+
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import tensornetwork as tn
+
+from . import gates
+from . import channels
+from .abstractcircuit import AbstractCircuit
+from .cons import backend, contractor, dtypestr, npdtype, rdtypestr
+from .mpscircuit import MPSCircuit, split_tensor
+from .quantum import QuOperator, sample2all
+from .utils import arg_alias
+
+Gate = gates.Gate
+Tensor = Any
+
+# the exact representation can be much more compact than the full SVD rank,
+# as the Kraus legs keep enlarging the bond dimensions otherwise
+default_split = {"max_truncation_error": 1e-6, "relative": True}
+
+
+class MPDOCircuit(AbstractCircuit):
+    """
+    ``MPDOCircuit`` class, the noisy circuit simulator based on the locally purified
+    matrix product density operator
+
+    .. math::
+
+        \\rho = \\sum_{\\kappa} \\vert\\psi_\\kappa\\rangle\\langle\\psi_\\kappa\\vert,\\quad
+        \\vert\\psi_\\kappa\\rangle = \\sum_{s} A^{s_1\\kappa_1}_1 A^{s_2\\kappa_2}_2
+        \\cdots A^{s_n\\kappa_n}_n \\vert s_1 s_2\\cdots s_n\\rangle,
+
+    where each site tensor carries a Kraus leg :math:`\\kappa_i` besides the physical leg and the bonds.
+    Gates are applied on the physical legs as in :py:class:`MPSCircuit`,
+    and Kraus channels enlarge the Kraus legs, which are compressed by SVD at the canonical center.
+    Both the bond and the Kraus dimensions are truncated according to the split rules.
+    Gates on more than 2 qubits are applied as MPOs, while channels are limited to at most 2 qubits.
+
+    :Example:
+
+    >>> c = tc.MPDOCircuit(3, split={"max_singular_values": 8})
+    >>> c.h(0)
+    >>> c.cnot(0, 1)
+    >>> c.depolarizing(1, px=0.1, py=0.1, pz=0.1)
+    >>> c.expectation_ps(z=[0, 1])
+    array(0.6+0.j, dtype=complex64)
+    """
+
+    is_mps = True
+    is_dm = True
+
+    def __init__(
+        self,
+        nqubits: int,
+        tensors: Optional[Sequence[Tensor]] = None,
+        center_position: Optional[int] = None,
+        split: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        MPDOCircuit object based on the locally purified density operator.
+
+        :param nqubits: The number of qubits in the circuit.
+        :type nqubits: int
+        :param tensors: If not None, the initial density matrix is given by the site tensors
+            of shape ``[left bond, 2, kraus, right bond]`` instead of :math:`\\vert 0\\rangle^n`,
+            defaults to None. The tensors are canonicalized if ``center_position`` is None.
+        :type tensors: Optional[Sequence[Tensor]], optional
+        :param center_position: The canonical center of the given ``tensors``, defaults to None
+        :type center_position: Optional[int], optional
+        :param split: Split rules for the truncation of bond and Kraus dimensions, see
+            :py:func:`tensorcircuit.cons.split_rules`, defaults to None, i.e.
+            ``default_split``, which only drops the numerically vanishing singular values.
+            Use a fixed ``max_singular_values`` for jittable simulations.
+        :type split: Optional[Dict[str, Any]], optional
+        """
+        self.circuit_param = {
+            "nqubits": nqubits,
+            "tensors": tensors,
+            "center_position": center_position,
+            "split": split,
+        }
+        if split is None:
+            split = dict(default_split)
+        self.split = split
+        self._nqubits = nqubits
+        if tensors is None:
+            self._tensors = [
+                backend.convert_to_tensor(
+                    np.array([1.0, 0.0], dtype=npdtype)[None, :, None, None]
+                )
+                for _ in range(nqubits)
+            ]
+            self._center = 0
+        else:
+            assert len(tensors) == nqubits
+            self._tensors = [
+                backend.cast(backend.convert_to_tensor(t), dtypestr) for t in tensors
+            ]
+            if center_position is None:
+                self._center = nqubits - 1
+                self.position(0)
+            else:
+                self._center = center_position
+        self._qir: List[Dict[str, Any]] = []
+        self._extra_qir: List[Dict[str, Any]] = []
+
+    @classmethod
+    def _meta_apply_channels(cls) -> None:
+        for k in channels.channels:
+            setattr(
+                cls,
+                k,
+                cls.apply_general_kraus_delayed(getattr(channels, k + "channel")),
+            )
+            doc = """
+            Apply %s quantum channel on the circuit.
+            See :py:meth:`tensorcircuit.channels.%schannel`
+
+            :param index: Qubit number that the gate applies on.
+            :type index: int.
+            :param vars: Parameters for the channel.
+            :type vars: float.
+            """ % (
+                k,
+                k,
+            )
+            getattr(cls, k).__doc__ = doc
+
+    def get_tensors(self) -> List[Tensor]:
+        """
+        Get the site tensors of shape ``[left bond, 2, kraus, right bond]``
+
+        :return: site tensors
+        :rtype: List[Tensor]
+        """
+        return self._tensors
+
+    def get_bond_dimensions(self) -> List[int]:
+        """
+        Get the bond dimensions between the sites
+
+        :return: bond dimensions
+        :rtype: List[int]
+        """
+        return [t.shape[-1] for t in self._tensors[:-1]]
+
+    def get_kraus_dimensions(self) -> List[int]:
+        """
+        Get the dimensions of the Kraus legs on the sites
+
+        :return: Kraus dimensions
+        :rtype: List[int]
+        """
+        return [t.shape[2] for t in self._tensors]
+
+    def get_center_position(self) -> int:
+        """
+        Get the canonical center
+
+        :return: center position
+        :rtype: int
+        """
+        return self._center
+
+    def set_split_rules(self, split: Dict[str, Any]) -> None:
+        """
+        Set truncation split when two qubit gates and channels are applied.
+        If nothing is specified, only the numerically vanishing singular values are dropped.
+
+        :param split: Truncation split
+        :type split: Any
+        """
+        self.split = split
+
+    def position(self, site: int) -> None:
+        """
+        Move the canonical center to ``site`` by QR decompositions,
+        where the tensors on the left (right) are isometries from the left (right).
+
+        :param site: The canonical center
+        :type site: int
+        """
+        ts = self._tensors
+        for i in range(self._center, site):
+            l, s, k, r = ts[i].shape
+            q, rr = backend.qr(backend.reshape(ts[i], [l * s * k, r]))
+            ts[i] = backend.reshape(q, [l, s, k, -1])
+            ts[i + 1] = backend.einsum("ab,bskr->askr", rr, ts[i + 1])
+        for i in range(self._center, site, -1):
+            l, s, k, r = ts[i].shape
+            rr, q = backend.rq(backend.reshape(ts[i], [l, s * k * r]))
+            ts[i] = backend.reshape(q, [-1, s, k, r])
+            ts[i - 1] = backend.einsum("lska,ab->lskb", ts[i - 1], rr)
+        self._center = site
+
+    def _compress_kraus(self, site: int, split: Dict[str, Any]) -> None:
+        # SVD on the Kraus leg of the canonical center, the right singular vectors
+        # are dropped as the density operator is invariant under unitaries on the Kraus leg
+        assert site == self._center
+        t = self._tensors[site]
+        l, s, k, r = t.shape
+        if k == 1:
+            return
+        m = backend.reshape(backend.transpose(t, [0, 1, 3, 2]), [l * s * r, k])
+        u, sv, _, _ = backend.svd(m, **split)
+        m = u * backend.cast(sv, dtypestr)[None, :]
+        self._tensors[site] = backend.transpose(
+            backend.reshape(m, [l, s, r, -1]), [0, 1, 3, 2]
+        )
+
+    def _apply_single(
+        self, ops: Sequence[Tensor], index: int, split: Dict[str, Any]
+    ) -> None:
+        if len(ops) == 1:
+            # a unitary keeps the canonical form
+            self._tensors[index] = backend.einsum(
+                "ab,lbkr->lakr", ops[0], self._tensors[index]
+            )
+            return
+        self.position(index)
+        t = backend.stack(
+            [backend.einsum("ab,lbkr->lakr", op, self._tensors[index]) for op in ops],
+            axis=2,
+        )
+        l, s, j, k, r = t.shape
+        self._tensors[index] = backend.reshape(t, [l, s, j * k, r])
+        self._compress_kraus(index, split)
+
+    def _apply_adjacent(
+        self,
+        ops: Sequence[Tensor],
+        index: int,
+        split: Dict[str, Any],
+        center_left: bool = True,
+    ) -> None:
+        # apply two qubit operators on the sites ``index`` and ``index + 1``,
+        # the Kraus leg from ``ops`` goes to the left site
+        if abs(index - self._center) <= abs(index + 1 - self._center):
+            self.position(index)
+        else:
+            self.position(index + 1)
+        theta = backend.einsum(
+            "lakr,rbms->lakbms", self._tensors[index], self._tensors[index + 1]
+        )
+        theta = backend.stack(
+            [backend.einsum("ABab,lakbms->lAkBms", op, theta) for op in ops], axis=2
+        )
+        l, a, j, k1, b, k2, r = theta.shape
+        if len(ops) > 1:
+            center_left = True
+        theta = backend.reshape(theta, [l * a * j * k1, b * k2 * r])
+        left, right = split_tensor(theta, center_left=center_left, split=split)
+        self._tensors[index] = backend.reshape(left, [l, a, j * k1, -1])
+        self._tensors[index + 1] = backend.reshape(right, [-1, b, k2, r])
+        self._center = index if center_left else index + 1
+        if len(ops) > 1:
+            self._compress_kraus(index, split)
+
+    def _swap(self, index_from: int, index_to: int, split: Dict[str, Any]) -> None:
+        swap = backend.reshape(gates.swap().tensor, [2, 2, 2, 2])  # type: ignore
+        if index_from < index_to:
+            for i in range(index_from, index_to):
+                self._apply_adjacent([swap], i, split, center_left=False)
+        else:
+            for i in range(index_from, index_to, -1):
+                self._apply_adjacent([swap], i - 1, split, center_left=True)
+
+    def _apply_double(
+        self, ops: Sequence[Tensor], index1: int, index2: int, split: Dict[str, Any]
+    ) -> None:
+        if index1 > index2:
+            ops = [backend.transpose(op, [1, 0, 3, 2]) for op in ops]
+            index1, index2 = index2, index1
+        # move ``index1`` next to ``index2`` by swaps and move it back after
+        self._swap(index1, index2 - 1, split)
+        self._apply_adjacent(ops, index2 - 1, split)
+        self._swap(index2 - 1, index1, split)
+
+    def _apply_ops(
+        self,
+        ops: Sequence[Tensor],
+        index: Sequence[int],
+        split: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if split is None:
+            split = self.split
+        index = [i if i >= 0 else self._nqubits + i for i in index]
+        noe = len(index)
+        ops = [
+            backend.reshape(
+                backend.cast(backend.convert_to_tensor(op), dtypestr),
+                [2 for _ in range(2 * noe)],
+            )
+            for op in ops
+        ]
+        if noe == 1:
+            self._apply_single(ops, index[0], split)
+        elif noe == 2:
+            self._apply_double(ops, index[0], index[1], split)
+        elif len(ops) == 1:
+            self._apply_nqubit_gate(ops[0], index, split)
+        else:
+            raise NotImplementedError(
+                "MPDOCircuit does not support channels on more than 2 qubits"
+            )
+
+    def _apply_nqubit_gate(
+        self, u: Tensor, index: Sequence[int], split: Dict[str, Any]
+    ) -> None:
+        # the gate is applied as a MPO spanning the sites from min(index) to max(index),
+        # see :py:meth:`MPSCircuit.apply_nqubit_gate`
+        noe = len(index)
+        order = np.argsort(index).tolist()
+        u = backend.transpose(u, order + [i + noe for i in order])
+        mpo, index_left = MPSCircuit.gate_to_MPO(u, *sorted(index))
+        index_right = index_left + len(mpo) - 1
+        # start the MPO from the side that the current center is closer to
+        center_left = abs(index_left - self._center) < abs(index_right - self._center)
+        if center_left:
+            self.position(index_left)
+        else:
+            self.position(index_right)
+        for i, o in enumerate(mpo):
+            t = self._tensors[index_left + i]
+            ni, _, _, nj = o.shape
+            l, _, k, r = t.shape
+            t = backend.einsum("iabj,lbkr->ilakjr", o, t)
+            self._tensors[index_left + i] = backend.reshape(t, [ni * l, 2, k, nj * r])
+        # canonicalize towards the other end and truncate the bonds on the way back
+        eye = backend.reshape(backend.eye(4, dtype=dtypestr), [2, 2, 2, 2])
+        if center_left:
+            self.position(index_right)
+            for i in range(index_right - 1, index_left - 1, -1):
+                self._apply_adjacent([eye], i, split, center_left=True)
+        else:
+            self.position(index_left)
+            for i in range(index_left, index_right):
+                self._apply_adjacent([eye], i, split, center_left=False)
+
+    def apply_general_gate(
+        self,
+        gate: Union[Gate, QuOperator],
+        *index: int,
+        name: Optional[str] = None,
+        split: Optional[Dict[str, Any]] = None,
+        mpo: bool = False,
+        ir_dict: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Apply a general qubit gate on the MPDO, gates on more than 2 qubits are applied
+        as MPOs spanning the sites in between (with the bonds truncated by ``split``).
+
+        :param gate: The Gate to be applied
+        :type gate: Gate
+        :param index: Qubit indices of the gate
+        :type index: int
+        """
+        if name is None:
+            name = ""
+        gate_dict = {
+            "gate": gate,
+            "index": index,
+            "name": name,
+            "split": split,
+            "mpo": mpo,
+        }
+        if ir_dict is not None:
+            ir_dict.update(gate_dict)
+        else:
+            ir_dict = gate_dict
+        self._qir.append(ir_dict)
+        assert len(index) == len(set(index))
+        if mpo:
+            u = gate.eval_matrix()  # type: ignore
+        else:
+            u = gate.tensor  # type: ignore
+        self._apply_ops([u], index, split)
+
+    apply = apply_general_gate
+
+    def apply_general_kraus(
+        self,
+        kraus: Sequence[Gate],
+        *index: int,
+        name: Optional[str] = None,
+        ir_dict: Optional[Dict[str, Any]] = None,
+        **kws: Any,
+    ) -> None:
+        """
+        Apply the channel :math:`\\sum_k K_k\\rho K_k^\\dagger` (on at most 2 qubits) on the MPDO.
+        The channel is recorded in the qir with the ``kraus`` operators, so that it is kept by
+        :py:meth:`copy` and replayed by the qir based methods, while it has no openqasm expression.
+
+        :param kraus: The Kraus operators
+        :type kraus: Sequence[Gate]
+        :param index: Qubit indices of the channel
+        :type index: int
+        :param name: The name of the channel in the qir, defaults to None, i.e. "kraus"
+        :type name: Optional[str], optional
+        :raises NotImplementedError: the channel acts on more than 2 qubits
+        """
+        kraus = [k.tensor if isinstance(k, tn.Node) else k for k in kraus]
+        if not isinstance(
+            index[0], int
+        ):  # try best to be compatible with DMCircuit interface
+            index = index[0][0]
+        if name is None:
+            name = "kraus"
+        kraus_dict = {
+            "gatef": gates.GateVF(lambda: kraus, name),  # type: ignore
+            "index": tuple(index),
+            "name": name,
+            "kraus": kraus,
+            "split": None,
+            "mpo": False,
+        }
+        if ir_dict is not None:
+            ir_dict.update(kraus_dict)
+        else:
+            ir_dict = kraus_dict
+        self._qir.append(ir_dict)
+        self._apply_ops(kraus, index)
+
+    general_kraus = apply_general_kraus
+
+    @staticmethod
+    def apply_general_kraus_delayed(
+        krausf: Callable[..., Sequence[Gate]]
+    ) -> Callable[..., None]:
+        def apply(self: "MPDOCircuit", *index: int, **vars: float) -> None:
+            for key in ["status", "name"]:
+                if key in vars:
+                    del vars[key]
+            kraus = krausf(**vars)
+            name = krausf.__name__
+            if name.endswith("channel"):
+                name = name[: -len("channel")]
+            self.apply_general_kraus(
+                kraus, *index, name=name, ir_dict={"parameters": vars}
+            )
+
+        return apply
+
+    def copy(self) -> "MPDOCircuit":
+        """
+        Copy the circuit, the tensors are shared as they are never modified in place.
+
+        :return: The copied circuit
+        :rtype: MPDOCircuit
+        """
+        c = type(self)(
+            self._nqubits, list(self._tensors), self._center, dict(self.split)
+        )
+        c._qir = list(self._qir)
+        c._extra_qir = list(self._extra_qir)
+        return c
+
+    def get_trace(self) -> Tensor:
+        """
+        The trace of the density operator, which deviates from 1 with truncations
+
+        :return: the trace
+        :rtype: Tensor
+        """
+        t = self._tensors[self._center]
+        return backend.real(backend.sum(t * backend.conj(t)))
+
+    def _range_nodes(
+        self,
+        begin: int,
+        end: int,
+        ops: Sequence[Tuple[Tensor, Sequence[int]]] = (),
+        open_sites: Sequence[int] = (),
+    ) -> Tuple[List[tn.Node], List[tn.Edge]]:
+        # the network for Tr(O rho) on sites [begin, end], with the physical legs on
+        # ``open_sites`` left open (ket ones first), the center has to be in the range
+        assert begin <= self._center <= end
+        kets = [tn.Node(self._tensors[i]) for i in range(begin, end + 1)]
+        bras = [tn.Node(backend.conj(self._tensors[i])) for i in range(begin, end + 1)]
+        for i in range(end - begin):
+            kets[i][3] ^ kets[i + 1][0]
+            bras[i][3] ^ bras[i + 1][0]
+        kets[0][0] ^ bras[0][0]
+        kets[-1][3] ^ bras[-1][3]
+        for ket, bra in zip(kets, bras):
+            ket[2] ^ bra[2]
+        nodes = kets + bras
+        occupied = set()
+        for op, index in ops:
+            noe = len(index)
+            op = tn.Node(
+                backend.reshape(backend.cast(op, dtypestr), [2 for _ in range(2 * noe)])
+            )
+            for j, i in enumerate(index):
+                if i in occupied:
+                    raise ValueError("Cannot measure two operators in one index")
+                occupied.add(i)
+                op[j] ^ bras[i - begin][1]
+                op[j + noe] ^ kets[i - begin][1]
+            nodes.append(op)
+        for i in range(begin, end + 1):
+            if i not in occupied and i not in open_sites:
+                kets[i - begin][1] ^ bras[i - begin][1]
+        output = [kets[i - begin][1] for i in open_sites] + [
+            bras[i - begin][1] for i in open_sites
+        ]
+        return nodes, output
+
+    def expectation(
+        self,
+        *ops: Tuple[Gate, List[int]],
+        reuse: bool = True,
+        normalize: bool = True,
+        **kws: Any,
+    ) -> Tensor:
+        """
+        Compute the expectation :math:`\\mathrm{Tr}(O\\rho)` of corresponding operators,
+        only the sites between the operators are contracted.
+
+        :param ops: Operator and its position on the circuit,
+            eg. ``(gates.Z(), [1]), (gates.X(), [2])`` is for operator :math:`Z_1X_2`
+        :type ops: Tuple[tn.Node, List[int]]
+        :param reuse: kept for API compatibility, no effect
+        :type reuse: bool, optional
+        :param normalize: Whether to divide the result by the trace of the density operator,
+            defaults to True
+        :type normalize: bool, optional
+        :raises ValueError: "Cannot measure two operators in one index"
+        :return: The expectation of corresponding operators
+        :rtype: Tensor
+        """
+        nops = []
+        for op, index in ops:
+            if isinstance(op, tn.Node):
+                op = op.tensor
+            if isinstance(index, int):
+                index = [index]
+            index = [i if i >= 0 else self._nqubits + i for i in index]
+            nops.append((op, index))
+        if not nops:
+            sites = [self._center]
+        else:
+            sites = [i for _, index in nops for i in index]
+        begin, end = min(sites), max(sites)
+        self.position(min(max(self._center, begin), end))
+        nodes, _ = self._range_nodes(begin, end, nops)
+        value = contractor(nodes).tensor
+        if normalize:
+            value /= backend.cast(self.get_trace(), dtypestr)
+        return value
+
+    def densitymatrix(
+        self, index: Optional[Sequence[int]] = None, normalize: bool = True
+    ) -> Tensor:
+        """
+        The (reduced) density matrix on the qubits ``index``, which should be a small subsystem.
+
+        :Example:
+
+        >>> c = tc.MPDOCircuit(3)
+        >>> c.h(0)
+        >>> c.cnot(0, 2)
+        >>> c.densitymatrix([0, 2]).shape
+        (4, 4)
+
+        :param index: the qubits kept, in the order of the output,
+            defaults to None (all qubits)
+        :type index: Optional[Sequence[int]], optional
+        :param normalize: Whether to normalize the trace, defaults to True
+        :type normalize: bool, optional
+        :return: the density matrix in 2D shape
+        :rtype: Tensor
+        """
+        if index is None:
+            index = list(range(self._nqubits))
+        index = [i if i >= 0 else self._nqubits + i for i in index]
+        begin, end = min(index), max(index)
+        self.position(min(max(self._center, begin), end))
+        nodes, output = self._range_nodes(begin, end, open_sites=index)
+        t = contractor(nodes, output_edge_order=output).tensor
+        dm = backend.reshape(t, [2 ** len(index), 2 ** len(index)])
+        if normalize:
+            dm /= backend.cast(self.get_trace(), dtypestr)
+        return dm
+
+    state = densitymatrix
+
+    @partial(arg_alias, alias_dict={"format": ["format_"]})
+    def sample(
+        self,
+        batch: Optional[int] = None,
+        format: Optional[str] = None,
+        random_generator: Optional[Any] = None,
+        status: Optional[Tensor] = None,
+    ) -> Any:
+        """
+        Batched sampling of bitstrings from the MPDO.
+        The canonical center is moved to the first site so that the right environments are identities,
+        then all shots are sampled together site by site from left to right.
+
+        :param batch: number of samples, defaults to None
+        :type batch: Optional[int], optional
+        :param format: sample format, defaults to None as consistent with ``MPSCircuit.sample``
+            check the doc in :py:meth:`tensorcircuit.quantum.measurement_results`
+        :type format: Optional[str]
+        :param random_generator: random generator,  defaults to None
+        :type random_generator: Optional[Any], optional
+        :param status: external randomness given by tensor uniformly from [0, 1]
+            with shape [batch, nqubits], if set, can overwrite random_generator
+        :type status: Optional[Tensor]
+        :return: List (if batch) of tuple (binary configuration tensor and corresponding probability)
+            if the format is None, and consistent with format when given
+        :rtype: Any
+        """
+        nbatch = 1 if batch is None else batch
+        if status is None:
+            if random_generator is None:
+                random_generator = backend.get_random_state()
+            status = backend.stateful_randu(
+                random_generator, shape=[nbatch, self._nqubits]
+            )
+        status = backend.real(backend.cast(status, dtypestr))
+        self.position(0)
+        # the left environments of the ket and the bra for each shot
+        left = backend.ones([nbatch, 1, 1], dtype=dtypestr)
+        p = backend.ones([nbatch], dtype=rdtypestr)
+        sample = []
+        for site, tensor in enumerate(self._tensors):
+            x, _, k, r = tensor.shape
+            y = left.shape[2]
+            lt = backend.matmul(
+                backend.reshape(backend.transpose(left, [0, 2, 1]), [-1, x]),
+                backend.reshape(tensor, [x, -1]),
+            )
+            lt = backend.reshape(lt, [nbatch, y, 2, k * r])
+            ct = backend.reshape(backend.conj(tensor), [1, y, 2, k * r])
+            ps = backend.real(backend.sum(backend.sum(lt * ct, axis=3), axis=1))
+            pu = ps[:, 0] / (ps[:, 0] + ps[:, 1])
+            eps = 0.31415926 * 1e-12
+            sign = backend.sign(status[:, site] - pu + eps) / 2 + 0.5
+            sign = backend.cast(sign, dtype=rdtypestr)
+            sample.append(sign)
+            p = p * (pu * (1 - 2 * sign) + sign)
+            norm = ps[:, 0] * (1 - sign) + ps[:, 1] * sign
+            sign_complex = backend.cast(sign, dtypestr)[:, None, None]
+            ket = lt[:, :, 0] * (1 - sign_complex) + lt[:, :, 1] * sign_complex
+            bra = ct[:, :, 0] * (1 - sign_complex) + ct[:, :, 1] * sign_complex
+            left = backend.matmul(
+                backend.transpose(backend.reshape(ket, [nbatch, y * k, r]), [0, 2, 1]),
+                backend.reshape(bra, [nbatch, y * k, r]),
+            )
+            left = left / backend.cast(norm, dtypestr)[:, None, None]
+        sample = backend.stack(sample, axis=1)
+
+        if format is None:
+            if batch is None:
+                return sample[0], p[0]
+            return [(sample[i], p[i]) for i in range(batch)]
+        return sample2all(
+            sample=backend.cast(sample, "int32"),
+            n=self._nqubits,
+            format=format,
+            jittable=True,
+        )
+
+
+MPDOCircuit._meta_apply()
+MPDOCircuit._meta_apply_channels()
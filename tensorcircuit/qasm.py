@@ -0,0 +1,715 @@
+"""
+Native OpenQASM 2.0 parser and emitter without qiskit dependency
+"""
+
+import math
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import gates
+from .cons import backend
+
+Tensor = Any
+
+_token_re = re.compile(
+    r"""\s*(?:
+    (?P<comment>//[^\n]*)
+    |(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+    |(?P<id>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<string>"[^"]*")
+    |(?P<op>->|==|[;,()\[\]{}+\-*/^])
+    )""",
+    re.X,
+)
+
+_functions: Dict[str, Callable[[float], float]] = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "exp": math.exp,
+    "ln": math.log,
+    "sqrt": math.sqrt,
+}
+
+# qasm gate name -> tc gate name, for gates without parameters
+_fixed_gates = {
+    "id": "i",
+    "x": "x",
+    "y": "y",
+    "z": "z",
+    "h": "h",
+    "s": "s",
+    "sdg": "sd",
+    "t": "t",
+    "tdg": "td",
+    "CX": "cnot",
+    "cx": "cnot",
+    "cy": "cy",
+    "cz": "cz",
+    "swap": "swap",
+    "ccx": "toffoli",
+    "cswap": "fredkin",
+}
+
+_fixed_names = {v: k for k, v in _fixed_gates.items() if k != "CX"}
+
+# qasm gate name -> tc gate name, for gates with a single ``theta`` parameter
+_theta_gates = {
+    "rx": "rx",
+    "ry": "ry",
+    "rz": "rz",
+    "crx": "crx",
+    "cry": "cry",
+    "crz": "crz",
+    "rxx": "rxx",
+    "ryy": "ryy",
+    "rzz": "rzz",
+    "p": "phase",
+    "u1": "phase",
+    "cp": "cphase",
+    "cu1": "cphase",
+}
+
+# qasm gate name -> tc gate name, for gates with ``theta, phi, lbd`` parameters
+_u_gates = {"U": "u", "u": "u", "u3": "u", "cu3": "cu"}
+
+_sx_matrix = np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]]) / 2
+
+# gates in the qiskit flavor of qelib1.inc which are neither native nor fixed unitaries in tc
+_qelib1_defs = """
+gate rccx a,b,c
+{
+  u2(0,pi) c; u1(pi/4) c; cx b, c; u1(-pi/4) c; cx a, c;
+  u1(pi/4) c; cx b, c; u1(-pi/4) c; u2(0,pi) c;
+}
+gate rc3x a,b,c,d
+{
+  u2(0,pi) d; u1(pi/4) d; cx c,d; u1(-pi/4) d; u2(0,pi) d;
+  cx a,d; u1(pi/4) d; cx b,d; u1(-pi/4) d; cx a,d;
+  u1(pi/4) d; cx b,d; u1(-pi/4) d; u2(0,pi) d; u1(pi/4) d;
+  cx c,d; u1(-pi/4) d; u2(0,pi) d;
+}
+gate c3sqrtx a,b,c,d
+{
+  h d; cu1(pi/8) a,d; h d; cx a,b;
+  h d; cu1(-pi/8) b,d; h d; cx a,b;
+  h d; cu1(pi/8) b,d; h d; cx b,c;
+  h d; cu1(-pi/8) c,d; h d; cx a,c;
+  h d; cu1(pi/8) c,d; h d; cx b,c;
+  h d; cu1(-pi/8) c,d; h d; cx a,c;
+  h d; cu1(pi/8) c,d; h d;
+}
+"""
+
+
+# ``ryy`` is not in qelib1.inc, the definition is the same as that exported by qiskit
+_ryy_def = (
+    "gate ryy(param0) q0,q1 { rx(pi/2) q0; rx(pi/2) q1; cx q0,q1; "
+    "rz(param0) q1; cx q0,q1; rx(-pi/2) q0; rx(-pi/2) q1; }"
+)
+
+
+_comment_re = re.compile(r"//[^\n]*")
+_space_re = re.compile(r"\s*")
+_gate_re = re.compile(r"gate\s")
+_arg = r"\s*([A-Za-z_][A-Za-z0-9_]*)\s*\[\s*(\d+)\s*\]"
+# gate application like ``u3(0.1,0.2,0.3) q[0];`` or ``cx q[0],q[1];`` with at most three qubits
+_fast_re = re.compile(
+    r"\s*([A-Za-z_][A-Za-z0-9_]*)\s*(?:\(([-+.\deE,\s]*)\))?\s%s(?:\s*,%s)?(?:\s*,%s)?\s*;"
+    % (_arg, _arg, _arg)
+)
+_keywords = ["OPENQASM", "include", "qreg", "creg", "gate", "opaque"]
+_keywords += ["measure", "reset", "barrier", "if"]
+
+
+def _tokenize(s: str) -> Iterator[Tuple[str, str]]:
+    pos = 0
+    while True:
+        m = _token_re.match(s, pos)
+        if m is None:
+            if s[pos:].strip():
+                raise ValueError("Invalid openqasm near: %s" % s[pos : pos + 20])
+            return
+        pos = m.end()
+        kind = m.lastgroup
+        if kind != "comment":
+            yield kind, m.group(kind)  # type: ignore
+
+
+def _eval(e: Tuple[Any, ...], env: Dict[str, float]) -> float:
+    kind = e[0]
+    if kind == "num":
+        return e[1]  # type: ignore
+    if kind == "id":
+        if e[1] == "pi":
+            return math.pi
+        return env[e[1]]
+    if kind == "neg":
+        return -_eval(e[1], env)
+    if kind == "call":
+        return _functions[e[1]](_eval(e[2], env))
+    a, b = _eval(e[2], env), _eval(e[3], env)
+    op = e[1]
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        return a / b
+    return a**b  # type: ignore
+
+
+def _item(
+    name: str, index: Sequence[int], parameters: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    d = {
+        "gatef": getattr(gates, name),
+        "index": tuple(index),
+        "name": name,
+        "split": None,
+        "mpo": name in ["multicontrol", "mpo"],
+    }
+    if parameters is not None:
+        d["parameters"] = parameters
+    return d
+
+
+def _instruction(name: str, index: Sequence[int]) -> Dict[str, Any]:
+    return {"index": list(index), "name": name, "gatef": name, "instruction": True}
+
+
+class _QasmParser:
+    def __init__(self) -> None:
+        self.qregs: Dict[str, Tuple[int, int]] = {}
+        self.cregs: Dict[str, Tuple[int, int]] = {}
+        self.nqubits = 0
+        self.nclbits = 0
+        # name -> (parameter names, qubit names, body statements)
+        self.defs: Dict[str, Tuple[List[str], List[str], List[Any]]] = {}
+        self.opaque: List[str] = []
+        self.qir: List[Dict[str, Any]] = []
+        self.tokens: List[Tuple[str, str]] = []
+        self.pos = 0
+        self.parse(_qelib1_defs)
+
+    def parse(self, s: str) -> None:
+        # statements are consumed one by one, where the most common gate applications
+        # with numeric parameters are matched by a single regex,
+        # the others are tokenized and parsed in general
+        s = _comment_re.sub("", s)
+        saved = self.tokens, self.pos  # reentrant for ``include``
+        i, end = 0, len(s)
+        while True:
+            m = _fast_re.match(s, i)
+            if m is not None and m.group(1) not in _keywords:
+                self.fast_apply(m)
+                i = m.end()
+                continue
+            i = _space_re.match(s, i).end()  # type: ignore
+            if i >= end:
+                break
+            j = s.find("}" if _gate_re.match(s, i) else ";", i)
+            if j < 0:
+                raise ValueError("Unexpected end of openqasm")
+            self.tokens, self.pos = list(_tokenize(s[i : j + 1])), 0
+            while self.pos < len(self.tokens):
+                self.statement()
+            i = j + 1
+        self.tokens, self.pos = saved
+
+    def fast_apply(self, m: Any) -> None:
+        name, ps = m.group(1), m.group(2)
+        params = [float(p) for p in ps.split(",")] if ps and ps.strip() else []
+        qubits = []
+        for k in range(3, 9, 2):
+            reg = m.group(k)
+            if reg is None:
+                break
+            if reg not in self.qregs:
+                raise ValueError("Undefined register '%s' in openqasm" % reg)
+            offset, size = self.qregs[reg]
+            i = int(m.group(k + 1))
+            if i >= size:
+                raise ValueError("Index out of range for register '%s'" % reg)
+            qubits.append(offset + i)
+        self.apply(name, params, qubits)
+
+    # token helpers
+
+    def peek(self) -> str:
+        if self.pos >= len(self.tokens):
+            return ""
+        return self.tokens[self.pos][1]
+
+    def next(self) -> str:
+        if self.pos >= len(self.tokens):
+            raise ValueError("Unexpected end of openqasm")
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def expect(self, v: str) -> None:
+        t = self.next()
+        if t != v:
+            raise ValueError("Expected '%s' in openqasm but got '%s'" % (v, t))
+
+    def ident(self) -> str:
+        if self.pos >= len(self.tokens) or self.tokens[self.pos][0] != "id":
+            raise ValueError("Expected identifier in openqasm near '%s'" % self.peek())
+        return self.next()
+
+    def integer(self) -> int:
+        return int(self.next())
+
+    def idlist(self) -> List[str]:
+        r = [self.ident()]
+        while self.peek() == ",":
+            self.next()
+            r.append(self.ident())
+        return r
+
+    # expressions
+
+    def expr(self) -> Tuple[Any, ...]:
+        e = self.term()
+        while self.peek() in ["+", "-"]:
+            e = ("bin", self.next(), e, self.term())
+        return e
+
+    def term(self) -> Tuple[Any, ...]:
+        e = self.factor()
+        while self.peek() in ["*", "/"]:
+            e = ("bin", self.next(), e, self.factor())
+        return e
+
+    def factor(self) -> Tuple[Any, ...]:
+        if self.peek() == "-":
+            self.next()
+            return ("neg", self.factor())
+        if self.peek() == "+":
+            self.next()
+            return self.factor()
+        e = self.atom()
+        if self.peek() == "^":
+            self.next()
+            e = ("bin", "^", e, self.factor())
+        return e
+
+    def atom(self) -> Tuple[Any, ...]:
+        kind, t = self.tokens[self.pos]
+        self.pos += 1
+        if kind == "number":
+            return ("num", float(t))
+        if t == "(":
+            e = self.expr()
+            self.expect(")")
+            return e
+        if kind == "id":
+            if t in _functions:
+                self.expect("(")
+                e = self.expr()
+                self.expect(")")
+                return ("call", t, e)
+            return ("id", t)
+        raise ValueError("Invalid expression in openqasm near '%s'" % t)
+
+    def exprlist(self) -> List[Tuple[Any, ...]]:
+        if self.peek() != "(":
+            return []
+        self.next()
+        r = []
+        if self.peek() != ")":
+            r.append(self.expr())
+            while self.peek() == ",":
+                self.next()
+                r.append(self.expr())
+        self.expect(")")
+        return r
+
+    # registers
+
+    def arg(self, regs: Dict[str, Tuple[int, int]]) -> List[int]:
+        # the global indices of ``reg`` or ``reg[i]``
+        name = self.ident()
+        if name not in regs:
+            raise ValueError("Undefined register '%s' in openqasm" % name)
+        offset, size = regs[name]
+        if self.peek() == "[":
+            self.next()
+            i = self.integer()
+            self.expect("]")
+            if i >= size:
+                raise ValueError("Index out of range for register '%s'" % name)
+            return [offset + i]
+        return list(range(offset, offset + size))
+
+    def args(self) -> List[List[int]]:
+        r = [self.arg(self.qregs)]
+        while self.peek() == ",":
+            self.next()
+            r.append(self.arg(self.qregs))
+        return r
+
+    @staticmethod
+    def broadcast(args: List[List[int]]) -> List[List[int]]:
+        # ``h q;`` or ``cx q, r[0];`` applies the gate for each index of the registers
+        size = max([len(a) for a in args])
+        for a in args:
+            if len(a) not in [1, size]:
+                raise ValueError("Register sizes mismatch in openqasm")
+        return [[a[0] if len(a) == 1 else a[i] for a in args] for i in range(size)]
+
+    # statements
+
+    def statement(self) -> None:
+        t = self.next()
+        if t == "OPENQASM":
+            self.next()
+            self.expect(";")
+        elif t == "include":
+            file = self.next().strip('"')
+            self.expect(";")
+            if file != "qelib1.inc":
+                with open(file) as f:
+                    self.parse(f.read())
+        elif t in ["qreg", "creg"]:
+            name = self.ident()
+            self.expect("[")
+            size = self.integer()
+            self.expect("]")
+            self.expect(";")
+            if t == "qreg":
+                self.qregs[name] = (self.nqubits, size)
+                self.nqubits += size
+            else:
+                self.cregs[name] = (self.nclbits, size)
+                self.nclbits += size
+        elif t == "gate":
+            self.gate_def()
+        elif t == "opaque":
+            self.opaque.append(self.ident())
+            while self.next() != ";":
+                pass
+        elif t == "measure":
+            qs = self.arg(self.qregs)
+            self.expect("->")
+            cs = self.arg(self.cregs)
+            self.expect(";")
+            if len(qs) != len(cs):
+                raise ValueError("Register sizes mismatch in openqasm measure")
+            for q in qs:
+                self.qir.append(_instruction("measure", [q]))
+        elif t == "reset":
+            qs = self.arg(self.qregs)
+            self.expect(";")
+            for q in qs:
+                self.qir.append(_instruction("reset", [q]))
+        elif t == "barrier":
+            qs = sum(self.args(), [])
+            self.expect(";")
+            self.qir.append(_instruction("barrier", qs))
+        elif t == "if":
+            raise NotImplementedError(
+                "Classically controlled operation is not supported in tensorcircuit"
+            )
+        else:
+            self.pos -= 1
+            name = self.ident()
+            params = [_eval(e, {}) for e in self.exprlist()]
+            args = self.args()
+            self.expect(";")
+            for qs in self.broadcast(args):
+                self.apply(name, params, qs)
+
+    def gate_def(self) -> None:
+        name = self.ident()
+        pnames = []
+        if self.peek() == "(":
+            self.next()
+            if self.peek() != ")":
+                pnames = self.idlist()
+            self.expect(")")
+        qnames = self.idlist()
+        self.expect("{")
+        body: List[Any] = []
+        while self.peek() != "}":
+            t = self.ident()
+            if t == "barrier":
+                qs = self.idlist()
+                body.append(("barrier", [], qs))
+            else:
+                body.append((t, self.exprlist(), self.idlist()))
+            self.expect(";")
+        self.expect("}")
+        self.defs[name] = (pnames, qnames, body)
+
+    def apply(self, name: str, params: List[float], qubits: List[int]) -> None:
+        if name in _fixed_gates:
+            self.qir.append(_item(_fixed_gates[name], qubits))
+        elif name in _theta_gates:
+            self.qir.append(_item(_theta_gates[name], qubits, {"theta": params[0]}))
+        elif name in _u_gates:
+            theta, phi, lbd = params
+            self.qir.append(
+                _item(_u_gates[name], qubits, {"theta": theta, "phi": phi, "lbd": lbd})
+            )
+        elif name == "u2":
+            phi, lbd = params
+            self.qir.append(
+                _item("u", qubits, {"theta": math.pi / 2, "phi": phi, "lbd": lbd})
+            )
+        elif name == "u0":
+            self.qir.append(_item("i", qubits))
+        elif name == "cu":
+            theta, phi, lbd, gamma = params
+            self.qir.append(_item("phase", qubits[:1], {"theta": gamma}))
+            self.qir.append(
+                _item("cu", qubits, {"theta": theta, "phi": phi, "lbd": lbd})
+            )
+        elif name in ["sx", "sxdg", "csx", "ch"]:
+            m = {"sx": _sx_matrix, "sxdg": _sx_matrix.conj().T, "csx": _sx_matrix}
+            m["ch"] = gates._h_matrix
+            unitary: Tensor = m[name]
+            if name.startswith("c"):
+                unitary = np.kron(np.diag([1.0, 0.0]), np.eye(2)) + np.kron(
+                    np.diag([0.0, 1.0]), unitary
+                )
+            self.qir.append(_item("any", qubits, {"unitary": unitary}))
+        elif name in ["c3x", "c4x"]:
+            self.qir.append(
+                _item(
+                    "multicontrol",
+                    qubits,
+                    {"ctrl": [1 for _ in qubits[:-1]], "unitary": gates._x_matrix},
+                )
+            )
+        elif name == "rzx":
+            theta = params[0]
+            unitary = math.cos(theta / 2) * np.eye(4) - 1.0j * math.sin(
+                theta / 2
+            ) * np.kron(gates._z_matrix, gates._x_matrix)
+            self.qir.append(_item("any", qubits, {"unitary": unitary}))
+        elif name in self.defs:
+            pnames, qnames, body = self.defs[name]
+            if len(pnames) != len(params) or len(qnames) != len(qubits):
+                raise ValueError("Wrong number of arguments for gate '%s'" % name)
+            env = dict(zip(pnames, params))
+            qmap = dict(zip(qnames, qubits))
+            for n, exprs, qs in body:
+                if n == "barrier":
+                    self.qir.append(_instruction("barrier", [qmap[q] for q in qs]))
+                else:
+                    self.apply(n, [_eval(e, env) for e in exprs], [qmap[q] for q in qs])
+        elif name in self.opaque:
+            raise ValueError("Opaque gate '%s' can not be simulated" % name)
+        else:
+            raise ValueError("Gate '%s' is not defined in openqasm" % name)
+
+
+def qasm2qir(qasmstr: str) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Parse the OpenQASM 2.0 string into the quantum intermediate representation of tensorcircuit,
+    without going through qiskit. Gates in ``qelib1.inc`` are mapped to the corresponding tc gates,
+    custom gates defined via ``gate`` are expanded inline, and multiple quantum registers are
+    concatenated in the order of declaration. The measure, reset and barrier instructions are kept
+    in the qir in order as items with ``"instruction": True``.
+
+    :Example:
+
+    >>> qir, n = tc.qasm.qasm2qir('OPENQASM 2.0; include "qelib1.inc"; qreg q[2]; h q[0]; cx q[0],q[1];')
+    >>> [d["name"] for d in qir], n
+    (['h', 'cnot'], 2)
+
+    :param qasmstr: the openqasm 2.0 string
+    :type qasmstr: str
+    :return: the qir (without gate tensors) and the number of qubits
+    :rtype: Tuple[List[Dict[str, Any]], int]
+    """
+    p = _QasmParser()
+    p.parse(qasmstr)
+    return p.qir, p.nqubits
+
+
+def qasm2tc(
+    qasmstr: str,
+    circuit_constructor: Any = None,
+    circuit_params: Optional[Dict[str, Any]] = None,
+    keep_measure_order: bool = False,
+) -> Any:
+    """
+    Generate the tensorcircuit circuit from the OpenQASM 2.0 string with the native parser,
+    see :py:func:`qasm2qir`.
+
+    :param qasmstr: the openqasm 2.0 string
+    :type qasmstr: str
+    :param circuit_constructor: ``Circuit``, ``DMCircuit`` or ``MPSCircuit``, defaults to ``Circuit``
+    :type circuit_constructor: Any
+    :param circuit_params: kwargs given in Circuit.__init__ construction function, default to None.
+    :type circuit_params: Optional[Dict[str, Any]]
+    :param keep_measure_order: whether to keep the order of measure instructions as in ``qasmstr``,
+        defaults to False, where each run of consecutive measure instructions is sorted by the qubit
+        (as ``qiskit.QuantumCircuit.from_qasm_str`` does)
+    :type keep_measure_order: bool
+    :return: A quantum circuit in tensorcircuit
+    :rtype: Any
+    """
+    from .circuit import Circuit
+
+    if circuit_constructor is None:
+        circuit_constructor = Circuit
+    qir, n = qasm2qir(qasmstr)
+    if not keep_measure_order:
+        qir = _sort_measures(qir)
+    circuit_params = dict(circuit_params or {})
+    circuit_params.setdefault("nqubits", n)
+    c = circuit_constructor(**circuit_params)
+    block: List[Dict[str, Any]] = []
+    for d in qir:
+        if d.get("instruction", False):
+            c._apply_qir(c, block)
+            block = []
+            getattr(c, d["name"] + "_instruction")(*d["index"])
+        else:
+            block.append(d)
+    c._apply_qir(c, block)
+    return c
+
+
+def _sort_measures(qir: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # measures on different qubits commute, only the order of the results changes
+    r: List[Dict[str, Any]] = []
+    run: List[Dict[str, Any]] = []
+    for d in qir + [{}]:
+        if d.get("instruction", False) and d["name"] == "measure":
+            run.append(d)
+            continue
+        r.extend(sorted(run, key=lambda e: int(e["index"][0])))
+        run = []
+        if d:
+            r.append(d)
+    return r
+
+
+def _fmt(x: float) -> str:
+    return repr(float(x))
+
+
+def _get_float(parameters: Dict[str, Any], key: str, default: float = 0) -> float:
+    x = np.real(backend.numpy(gates.array_to_tensor(parameters.get(key, default))))
+    if x.dtype == np.float32:
+        # the shortest repr in single precision, i.e. 0.2 instead of 0.20000000298023224
+        return float(str(np.float32(x)))
+    return x.item()  # type: ignore
+
+
+def _gate2qasm(d: Dict[str, Any]) -> List[str]:
+    if "kraus" in d:
+        raise ValueError("Quantum channel %s has no openqasm expression" % d["name"])
+    name = d["gatef"] if isinstance(d["gatef"], str) else d["gatef"].n
+    index = list(d["index"])
+    qs = ",".join(["q[%s]" % i for i in index])
+    parameters = d.get("parameters", {})
+    if name in _fixed_names:
+        return ["%s %s;" % (_fixed_names[name], qs)]
+    if name in ["rx", "ry", "rz", "crx", "cry", "crz", "rxx", "ryy", "rzz"]:
+        return ["%s(%s) %s;" % (name, _fmt(_get_float(parameters, "theta")), qs)]
+    if name in ["phase", "cphase"]:
+        pn = {"phase": "p", "cphase": "cp"}[name]
+        return ["%s(%s) %s;" % (pn, _fmt(_get_float(parameters, "theta")), qs)]
+    if name in ["u", "cu"]:
+        ps = [_fmt(_get_float(parameters, k)) for k in ["theta", "phi", "lbd"]]
+        return ["%s(%s) %s;" % (name + "3", ",".join(ps), qs)]
+    if name in ["ox", "oy", "oz", "orx", "ory", "orz"]:
+        flip = "x q[%s];" % index[0]
+        cname = {"ox": "cnot"}.get(name, "c" + name[1:])
+        return [flip] + _gate2qasm(_item(cname, index, parameters)) + [flip]
+    if name == "wroot":
+        return [
+            "u3(%s,%s,%s) %s;"
+            % (_fmt(np.pi / 2), _fmt(-np.pi / 4), _fmt(np.pi / 4), qs)
+        ]
+    if name == "iswap":
+        theta = _fmt(-np.pi * _get_float(parameters, "theta", 1) / 2)
+        return ["rxx(%s) %s;" % (theta, qs), "ryy(%s) %s;" % (theta, qs)]
+    if name == "measure":
+        return ["measure q[%s] -> c[%s];" % (index[0], index[0])]
+    if name == "reset":
+        return ["reset q[%s];" % index[0]]
+    if name == "barrier":
+        return ["barrier %s;" % qs]
+    if name == "multicontrol":
+        u = np.reshape(
+            backend.numpy(gates.array_to_tensor(parameters["unitary"])), [-1]
+        )
+        ctrl = [int(i) for i in parameters["ctrl"]]
+        target = None
+        for n, m in [
+            ("x", gates._x_matrix),
+            ("y", gates._y_matrix),
+            ("z", gates._z_matrix),
+        ]:
+            if u.shape[0] == 4 and np.allclose(u, np.reshape(m, [-1])):
+                target = n
+        if target is not None and (len(ctrl) == 1 or (target == "x" and len(ctrl) < 5)):
+            gn = {1: "c", 2: "cc", 3: "c3", 4: "c4"}[len(ctrl)] + target
+            flips = ["x q[%s];" % i for i, c in zip(index, ctrl) if c == 0]
+            return flips + ["%s %s;" % (gn, qs)] + flips
+    elif len(index) == 1 and name not in ["mpo"]:
+        # single qubit gates upto a global phase
+        m = backend.numpy(backend.reshapem(d["gatef"](**parameters).tensor))
+        ps = [_fmt(np.real(p)) for p in gates.get_u_parameter(m)]
+        return ["u3(%s) %s;" % (",".join(ps), qs)]
+    raise NotImplementedError("No native openqasm 2.0 expression for gate %s" % name)
+
+
+def qir2qasm(
+    qir: List[Dict[str, Any]], n: int, extra_qir: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """
+    Generate the OpenQASM 2.0 string from the quantum intermediate representation
+    without going through qiskit.
+
+    :Example:
+
+    >>> c = tc.Circuit(2)
+    >>> c.h(0)
+    >>> c.cnot(0, 1)
+    >>> print(tc.qasm.qir2qasm(c.to_qir(), 2))
+    OPENQASM 2.0;
+    include "qelib1.inc";
+    qreg q[2];
+    h q[0];
+    cx q[0],q[1];
+
+    :param qir: The quantum intermediate representation of a circuit.
+    :type qir: List[Dict[str, Any]]
+    :param n: # of qubits
+    :type n: int
+    :param extra_qir: The extra quantum IR of tc circuit including measure and reset on hardware,
+        defaults to None
+    :type extra_qir: Optional[List[Dict[str, Any]]]
+    :raises NotImplementedError: if there are multi-qubit gates given by general unitaries
+    :raises ValueError: if there are quantum channels
+    :return: the openqasm 2.0 string
+    :rtype: str
+    """
+    lines = ["qreg q[%s];" % n]
+    extras: Dict[int, List[Dict[str, Any]]] = {}
+    if extra_qir:
+        lines.append("creg c[%s];" % n)
+        for d in extra_qir:
+            extras.setdefault(d["pos"], []).append(d)
+    for i, d in enumerate(qir):
+        for e in extras.pop(i, []):
+            lines.extend(_gate2qasm(e))
+        lines.extend(_gate2qasm(d))
+    for i in sorted(extras):
+        for e in extras[i]:
+            lines.extend(_gate2qasm(e))
+    header = ["OPENQASM 2.0;", 'include "qelib1.inc";']
+    if any([l.startswith("ryy(") for l in lines]):
+        header.append(_ryy_def)
+    return "\n".join(header + lines) + "\n"
@@ -31,11 +31,6 @@ from tensornetwork.network_components import CopyNode
 from tensornetwork.network_operations import get_all_nodes, copy, reachable
 from tensornetwork.network_operations import get_subgraph_dangling, remove_node
 
-try:
-    import tensorflow as tf
-except ImportError:
-    pass
-
 from .cons import backend, contractor, dtypestr, npdtype, rdtypestr
 from .backends import get_backend
 from .utils import is_m1mac, arg_alias
@@ -1067,6 +1062,39 @@ def xyz2ps(xyz: Dict[str, List[int]], n: Optional[int] = None) -> List[int]:
     return ps
 
 
+def qwc_groups(ls: Sequence[Sequence[int]]) -> List[List[int]]:
+    """
+    Greedily partition Pauli strings into qubit-wise commuting groups,
+    i.e. on each qubit, the strings in one group are either identity or the same Pauli.
+    Strings with more non-identity Paulis are placed first.
+
+    :Example:
+
+    >>> tc.quantum.qwc_groups([[1, 0], [0, 1], [3, 3], [1, 1], [0, 3]])
+    [[2, 4], [3, 0, 1]]
+
+    :param ls: 2D list, each row is for a Pauli string,
+        e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`
+    :type ls: Sequence[Sequence[int]]
+    :return: the list of groups, each group is a list of the row indices of ``ls``
+    :rtype: List[List[int]]
+    """
+    lsa = np.array(ls, dtype=np.int32)
+    order = np.argsort(-np.sum(lsa != 0, axis=-1), kind="stable")
+    bases = np.zeros([0, lsa.shape[1]], dtype=np.int32)
+    groups: List[List[int]] = []
+    for i in order:
+        compatible = np.all((bases == 0) | (bases == lsa[i]) | (lsa[i] == 0), axis=-1)
+        if np.any(compatible):
+            j = int(np.argmax(compatible))
+            groups[j].append(int(i))
+            bases[j] = np.maximum(bases[j], lsa[i])
+        else:
+            groups.append([int(i)])
+            bases = np.concatenate([bases, lsa[i][None, :]])
+    return groups
+
+
 def generate_local_hamiltonian(
     *hlist: Sequence[Tensor], matrix_form: bool = True
 ) -> Union[QuOperator, Tensor]:
@@ -1159,222 +1187,384 @@ def quimb2qop(qb_mpo: Any) -> QuOperator:
     return qop
 
 
-try:
+def _parity(x: Tensor) -> Tensor:
+    """
+    Bitwise parity (popcount mod 2) of a non-negative int64 numpy array.
+    """
+    for shift in [32, 16, 8, 4, 2, 1]:
+        x = x ^ (x >> shift)
+    return x & 1
 
-    def _id(x: Any) -> Any:
-        return x
 
-    if is_m1mac():
-        compiled_jit = _id
+def ps2masks(ls: Sequence[Sequence[int]]) -> Tuple[Tensor, Tensor, Tensor]:
+    """
+    Convert a batch of Pauli strings into the X, Y and Z bit masks of each term,
+    the most significant bit corresponds to qubit 0.
+
+    :Example:
+
+    >>> tc.quantum.ps2masks([[1, 0, 3], [2, 2, 0]])
+    (array([4, 0]), array([0, 6]), array([1, 0]))
+
+    :param ls: 2D array, each row is for a Pauli string,
+        e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`
+    :type ls: Sequence[Sequence[int]]
+    :return: the int64 numpy masks for X, Y and Z of each Pauli string
+    :rtype: Tuple[Tensor, Tensor, Tensor]
+    """
+    lsa = np.array(ls, dtype=np.int64).reshape([len(ls), -1])
+    n = lsa.shape[1]
+    if n > 62:
+        raise ValueError("Pauli string with %s qubits is too long for int64 masks" % n)
+    bits = np.left_shift(np.int64(1), np.arange(n - 1, -1, -1, dtype=np.int64))
+    return tuple(  # type: ignore
+        np.sum((lsa == p) * bits[None, :], axis=1, dtype=np.int64) for p in [1, 2, 3]
+    )
+
+
+def PauliStringSum2CSR_numpy(
+    ls: Sequence[Sequence[int]],
+    weight: Optional[Sequence[float]] = None,
+) -> Tensor:
+    """
+    Generate scipy csr sparse matrix from Pauli string sum.
+    Each term maps row ``r`` to column ``r ^ (x | y)`` with phase
+    :math:`(-1)^{|r \\& (y|z)|}(-i)^{|y|}`. Terms are grouped by their flip mask ``x | y``:
+    the signs of all terms in a group are computed in one batched parity and weighted-summed,
+    so each group gives one csr entry per row. Rows are processed in chunks and
+    vanishing entries are dropped on the fly, so the memory is bounded by the nonzeros.
+    Only numpy and scipy are required.
+
+    :Example:
+
+    >>> tc.quantum.PauliStringSum2CSR_numpy([[1, 0], [0, 3]], [0.5, 1.0]).toarray()
+    array([[ 1. +0.j,  0. +0.j,  0.5+0.j,  0. +0.j],
+           [ 0. +0.j, -1. +0.j,  0. +0.j,  0.5+0.j],
+           [ 0.5+0.j,  0. +0.j,  1. +0.j,  0. +0.j],
+           [ 0. +0.j,  0.5+0.j,  0. +0.j, -1. +0.j]], dtype=complex64)
+
+    :param ls: 2D Tensor, each row is for a Pauli string,
+        e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`
+    :type ls: Sequence[Sequence[int]]
+    :param weight: 1D Tensor, each element corresponds the weight for each Pauli string
+        defaults to None (all Pauli strings weight 1.0)
+    :type weight: Optional[Sequence[float]], optional
+    :return: the scipy csr sparse matrix
+    :rtype: Tensor
+    """
+    from scipy.sparse import csr_matrix
+
+    lsa = np.array(ls, dtype=np.int64).reshape([len(ls), -1])
+    nterms, n = lsa.shape
+    s = 0b1 << n
+    idx_x, idx_y, idx_z = ps2masks(ls)
+    if weight is None:
+        w = np.ones([nterms], dtype=npdtype)
     else:
-        compiled_jit = partial(get_backend("tensorflow").jit, jit_compile=True)
+        w = np.array(weight).astype(npdtype).reshape([nterms])
+    # (-i)^ny for ny mod 4 in [0, 1, 2, 3]
+    ny = np.sum(lsa == 2, axis=1) % 4
+    w = w * np.array([1.0, -1.0j, -1.0, 1.0j], dtype=npdtype)[ny]
+    flips, inverse = np.unique(idx_x ^ idx_y, return_inverse=True)
+    nflips = len(flips)
+    yz = idx_y | idx_z
+    groups = [np.where(inverse == f)[0] for f in range(nflips)]
+    chunk = max(1, 2**22 // max(nflips, max([len(g) for g in groups])))
+    data, indices, nnzs = [], [], [np.zeros([1], dtype=np.int64)]
+    for start in range(0, s, chunk):
+        rows = np.arange(start, min(start + chunk, s), dtype=np.int64)
+        vals = np.empty([len(rows), nflips], dtype=npdtype)
+        for f, g in enumerate(groups):
+            signs = 1 - 2 * _parity(rows[:, None] & yz[None, g])
+            vals[:, f] = signs @ w[g]
+        nonzero = vals != 0
+        data.append(vals[nonzero])
+        indices.append((rows[:, None] ^ flips[None, :])[nonzero])
+        nnzs.append(np.sum(nonzero, axis=1))
+    indptr = np.cumsum(np.concatenate(nnzs))
+    m = csr_matrix(
+        (np.concatenate(data), np.concatenate(indices), indptr), shape=(s, s)
+    )
+    m.sort_indices()
+    return m
 
-    def heisenberg_hamiltonian(
-        g: Graph,
-        hzz: float = 1.0,
-        hxx: float = 1.0,
-        hyy: float = 1.0,
-        hz: float = 0.0,
-        hx: float = 0.0,
-        hy: float = 0.0,
-        sparse: bool = True,
-        numpy: bool = False,
-    ) -> Tensor:
-        """
-        Generate Heisenberg Hamiltonian with possible external fields.
-        Currently requires tensorflow installed
 
-        :Example:
+def PauliStringSum2COO(
+    ls: Sequence[Sequence[int]],
+    weight: Optional[Sequence[float]] = None,
+    numpy: bool = False,
+) -> Tensor:
+    """
+    Generate sparse tensor from Pauli string sum.
+    The matrix is assembled with :py:func:`PauliStringSum2CSR_numpy`,
+    so no tensorflow installation is required.
+
+    :param ls: 2D Tensor, each row is for a Pauli string,
+        e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`
+    :type ls: Sequence[Sequence[int]]
+    :param weight: 1D Tensor, each element corresponds the weight for each Pauli string
+        defaults to None (all Pauli strings weight 1.0)
+    :type weight: Optional[Sequence[float]], optional
+    :param numpy: default False. If True, return numpy coo
+        else return backend compatible sparse tensor
+    :type numpy: bool
+    :return: the scipy coo sparse matrix
+    :rtype: Tensor
+    """
+    rsparse = PauliStringSum2CSR_numpy(ls, weight).tocoo()
+    if numpy:
+        return rsparse
+    return backend.coo_sparse_matrix_from_numpy(rsparse)
 
-        >>> g = tc.templates.graphs.Line1D(6)
-        >>> h = qu.heisenberg_hamiltonian(g, sparse=False)
-        >>> tc.backend.eigh(h)[0][:10]
-        array([-11.2111025,  -8.4721365,  -8.472136 ,  -8.472136 ,  -6.       ,
-                -5.123106 ,  -5.123106 ,  -5.1231055,  -5.1231055,  -5.1231055],
-            dtype=float32)
-
-        :param g: input circuit graph
-        :type g: Graph
-        :param hzz: zz coupling, default is 1.0
-        :type hzz: float
-        :param hxx: xx coupling, default is 1.0
-        :type hxx: float
-        :param hyy: yy coupling, default is 1.0
-        :type hyy: float
-        :param hz: External field on z direction, default is 0.0
-        :type hz: float
-        :param hx: External field on y direction, default is 0.0
-        :type hx: float
-        :param hy: External field on x direction, default is 0.0
-        :type hy: float
-        :param sparse: Whether to return sparse Hamiltonian operator, default is True.
-        :type sparse: bool, defalts True
-        :param numpy: whether return the matrix in numpy or tensorflow form
-        :type numpy: bool, defaults False,
-
-        :return: Hamiltonian measurements
-        :rtype: Tensor
-        """
-        n = len(g.nodes)
-        ls = []
-        weight = []
-        for e in g.edges:
-            if hzz != 0:
-                r = [0 for _ in range(n)]
-                r[e[0]] = 3
-                r[e[1]] = 3
-                ls.append(r)
-                weight.append(hzz)
-            if hxx != 0:
-                r = [0 for _ in range(n)]
-                r[e[0]] = 1
-                r[e[1]] = 1
-                ls.append(r)
-                weight.append(hxx)
-            if hyy != 0:
-                r = [0 for _ in range(n)]
-                r[e[0]] = 2
-                r[e[1]] = 2
-                ls.append(r)
-                weight.append(hyy)
-        for node in g.nodes:
-            if hz != 0:
-                r = [0 for _ in range(n)]
-                r[node] = 3
-                ls.append(r)
-                weight.append(hz)
-            if hx != 0:
-                r = [0 for _ in range(n)]
-                r[node] = 1
-                ls.append(r)
-                weight.append(hx)
-            if hy != 0:
-                r = [0 for _ in range(n)]
-                r[node] = 2
-                ls.append(r)
-                weight.append(hy)
-        ls = tf.constant(ls)
-        weight = tf.constant(weight)
-        ls = get_backend("tensorflow").cast(ls, dtypestr)
-        weight = get_backend("tensorflow").cast(weight, dtypestr)
-        if sparse:
-            r = PauliStringSum2COO_numpy(ls, weight)
-            if numpy:
-                return r
-            return backend.coo_sparse_matrix_from_numpy(r)
-        return PauliStringSum2Dense(ls, weight, numpy=numpy)
-
-    def PauliStringSum2Dense(
+
+PauliStringSum2COO_numpy = partial(PauliStringSum2COO, numpy=True)
+
+
+def PauliStringSum2Dense(
+    ls: Sequence[Sequence[int]],
+    weight: Optional[Sequence[float]] = None,
+    numpy: bool = False,
+) -> Tensor:
+    """
+    Generate dense matrix from Pauli string sum.
+
+    :param ls: 2D Tensor, each row is for a Pauli string,
+        e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`
+    :type ls: Sequence[Sequence[int]]
+    :param weight: 1D Tensor, each element corresponds the weight for each Pauli string
+        defaults to None (all Pauli strings weight 1.0)
+    :type weight: Optional[Sequence[float]], optional
+    :param numpy: default False. If True, return numpy coo
+        else return backend compatible sparse tensor
+    :type numpy: bool
+    :return: the backend dense matrix
+    :rtype: Tensor
+    """
+    sparsem = PauliStringSum2CSR_numpy(ls, weight)
+    if numpy:
+        return sparsem.todense()
+    return backend.convert_to_tensor(sparsem.toarray())
+
+
+def _pauli_flip(psi: Tensor, q: int) -> Tensor:
+    shape = backend.shape_tuple(psi)
+    psi = backend.reshape(psi, [2**q, 2, -1])
+    psi = backend.stack([psi[:, 1], psi[:, 0]], axis=1)
+    return backend.reshape(psi, shape)
+
+
+def _pauli_sign(psi: Tensor, q: int) -> Tensor:
+    shape = backend.shape_tuple(psi)
+    psi = backend.reshape(psi, [2**q, 2, -1])
+    psi = backend.stack([psi[:, 0], -psi[:, 1]], axis=1)
+    return backend.reshape(psi, shape)
+
+
+class PauliSumOperator:
+    """
+    Matrix-free linear operator for a weighted sum of Pauli strings.
+    Each Pauli string acts as :math:`i^{n_y} X_F Z_m` on the state, i.e. bit flips on
+    the qubits in ``F`` (X or Y) following a sign on the qubits in ``m`` (Y or Z),
+    so :math:`H\\vert\\psi\\rangle` is evaluated on the state tensor directly without
+    materializing any matrix. Terms sharing the same bit flips are accumulated before
+    the flips are applied. The operator is jittable and vmappable on all backends,
+    and it can be directly fed into scipy eigensolvers as a ``LinearOperator`` like object.
+
+    :Example:
+
+    >>> h = tc.quantum.PauliSumOperator([[3, 3, 0], [0, 1, 1]], [1.0, 0.5])
+    >>> c = tc.Circuit(3)
+    >>> c.h(1)
+    >>> c.h(2)
+    >>> tc.templates.measurements.operator_expectation(c, h)
+    0.4999999
+    >>> scipy.sparse.linalg.eigsh(h, k=1, which="SA")[0]
+    array([-1.1180341], dtype=float32)
+    """
+
+    __array_priority__ = 100.0  # for correct __rmul__ with scalar ndarrays
+
+    def __init__(
+        self,
         ls: Sequence[Sequence[int]],
         weight: Optional[Sequence[float]] = None,
-        numpy: bool = False,
-    ) -> Tensor:
+    ) -> None:
         """
-        Generate dense matrix from Pauli string sum.
-        Currently requires tensorflow installed.
-
-
         :param ls: 2D Tensor, each row is for a Pauli string,
             e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`
         :type ls: Sequence[Sequence[int]]
         :param weight: 1D Tensor, each element corresponds the weight for each Pauli string
             defaults to None (all Pauli strings weight 1.0)
         :type weight: Optional[Sequence[float]], optional
-        :param numpy: default False. If True, return numpy coo
-            else return backend compatible sparse tensor
-        :type numpy: bool
-        :return: the tensorflow dense matrix
-        :rtype: Tensor
         """
-        sparsem = PauliStringSum2COO_numpy(ls, weight)
-        if numpy:
-            return sparsem.todense()
-        sparsem = backend.coo_sparse_matrix_from_numpy(sparsem)
-        densem = backend.to_dense(sparsem)
-        return densem
-
-    # already implemented as backend method
-    #
-    # def _tf2numpy_sparse(a: Tensor) -> Tensor:
-    #     return get_backend("numpy").coo_sparse_matrix(
-    #         indices=a.indices,
-    #         values=a.values,
-    #         shape=a.get_shape(),
-    #     )
-
-    # def _numpy2tf_sparse(a: Tensor) -> Tensor:
-    #     return get_backend("tensorflow").coo_sparse_matrix(
-    #         indices=np.array([a.row, a.col]).T,
-    #         values=a.data,
-    #         shape=a.shape,
-    #     )
-
-    def PauliStringSum2COO(
-        ls: Sequence[Sequence[int]],
-        weight: Optional[Sequence[float]] = None,
-        numpy: bool = False,
-    ) -> Tensor:
+        self.ls = np.array(ls, dtype=np.int64).reshape([len(ls), -1])
+        nterms, n = self.ls.shape
+        self.nqubits = n
+        self.shape = (2**n, 2**n)
+        self.dtype = np.dtype(npdtype)
+        w: Tensor
+        if weight is None:
+            w = np.ones([nterms])
+        elif isinstance(weight, (list, tuple)):
+            w = np.array(weight)
+        else:
+            w = weight
+        self.weight = backend.cast(backend.convert_to_tensor(w), dtypestr)
+        # flip qubits -> [(term index, sign qubits, i^ny)]
+        self.groups: Dict[Tuple[int, ...], List[Tuple[int, List[int], complex]]] = {}
+        for t, l in enumerate(self.ls):
+            flips = tuple(int(q) for q in np.where((l == 1) | (l == 2))[0])
+            signs = [int(q) for q in np.where((l == 2) | (l == 3))[0]]
+            phase = 1.0j ** int(np.sum(l == 2) % 4)
+            self.groups.setdefault(flips, []).append((t, signs, phase))
+
+    def matvec(self, v: Tensor) -> Tensor:
         """
-        Generate sparse tensor from Pauli string sum.
-        Currently requires tensorflow installed
+        Apply the operator on the state ``v``.
 
-        :param ls: 2D Tensor, each row is for a Pauli string,
-            e.g. [1, 0, 0, 3, 2] is for :math:`X_0Z_3Y_4`
-        :type ls: Sequence[Sequence[int]]
-        :param weight: 1D Tensor, each element corresponds the weight for each Pauli string
-            defaults to None (all Pauli strings weight 1.0)
-        :type weight: Optional[Sequence[float]], optional
-        :param numpy: default False. If True, return numpy coo
-            else return backend compatible sparse tensor
-        :type numpy: bool
-        :return: the scipy coo sparse matrix
+        :param v: the state of shape [2**n] or [2**n, ...] with trailing batch dimensions
+        :type v: Tensor
+        :return: :math:`H v` of the same shape as ``v``
         :rtype: Tensor
         """
-        # numpy version is 3* faster!
+        if not backend.is_tensor(v):
+            v = backend.convert_to_tensor(v)
+        v = backend.cast(v, dtypestr)
+        r: Tensor = None
+        for flips, terms in self.groups.items():
+            acc: Tensor = None
+            for t, signs, phase in terms:
+                psi = v
+                for q in signs:
+                    psi = _pauli_sign(psi, q)
+                psi = self.weight[t] * phase * psi
+                acc = psi if acc is None else acc + psi
+            for q in flips:
+                acc = _pauli_flip(acc, q)
+            r = acc if r is None else r + acc
+        return r
+
+    def __matmul__(self, other: Tensor) -> Tensor:
+        return self.matvec(other)
+
+    def __mul__(self, other: Tensor) -> "PauliSumOperator":
+        """
+        Scalar multiplication of the operator, the weights are rescaled.
+        """
+        other = backend.cast(backend.convert_to_tensor(other), dtypestr)
+        return PauliSumOperator(self.ls.tolist(), self.weight * other)
 
-        nterms = len(ls)
-        # n = len(ls[0])
-        # s = 0b1 << n
-        if weight is None:
-            weight = [1.0 for _ in range(nterms)]
-        if not (isinstance(weight, tf.Tensor) or isinstance(weight, tf.Variable)):
-            weight = tf.constant(weight, dtype=getattr(tf, dtypestr))
-        # rsparse = get_backend("numpy").coo_sparse_matrix(
-        #     indices=np.array([[0, 0]], dtype=np.int64),
-        #     values=np.array([0.0], dtype=getattr(np, dtypestr)),
-        #     shape=(s, s),
-        # )
-        rsparses = [
-            get_backend("tensorflow").numpy(PauliString2COO(ls[i], weight[i]))  # type: ignore
-            for i in range(nterms)
-        ]
-        rsparse = _dc_sum(rsparses)
-        # auto transformed into csr format!!
+    def __rmul__(self, other: Tensor) -> "PauliSumOperator":
+        return self.__mul__(other)
+
+    def __neg__(self) -> "PauliSumOperator":
+        return self.__mul__(-1.0)
+
+
+def heisenberg_hamiltonian(
+    g: Graph,
+    hzz: float = 1.0,
+    hxx: float = 1.0,
+    hyy: float = 1.0,
+    hz: float = 0.0,
+    hx: float = 0.0,
+    hy: float = 0.0,
+    sparse: bool = True,
+    numpy: bool = False,
+) -> Tensor:
+    """
+    Generate Heisenberg Hamiltonian with possible external fields.
+
+    :Example:
 
-        # for i in range(nterms):
-        #     rsparse += get_backend("tensorflow").numpy(PauliString2COO(ls[i], weight[i]))  # type: ignore
-        rsparse = rsparse.tocoo()
+    >>> g = tc.templates.graphs.Line1D(6)
+    >>> h = qu.heisenberg_hamiltonian(g, sparse=False)
+    >>> tc.backend.eigh(h)[0][:10]
+    array([-11.2111025,  -8.4721365,  -8.472136 ,  -8.472136 ,  -6.       ,
+            -5.123106 ,  -5.123106 ,  -5.1231055,  -5.1231055,  -5.1231055],
+        dtype=float32)
+
+    :param g: input circuit graph
+    :type g: Graph
+    :param hzz: zz coupling, default is 1.0
+    :type hzz: float
+    :param hxx: xx coupling, default is 1.0
+    :type hxx: float
+    :param hyy: yy coupling, default is 1.0
+    :type hyy: float
+    :param hz: External field on z direction, default is 0.0
+    :type hz: float
+    :param hx: External field on y direction, default is 0.0
+    :type hx: float
+    :param hy: External field on x direction, default is 0.0
+    :type hy: float
+    :param sparse: Whether to return sparse Hamiltonian operator, default is True.
+    :type sparse: bool, defalts True
+    :param numpy: whether return the matrix in numpy or backend form
+    :type numpy: bool, defaults False,
+
+    :return: Hamiltonian measurements
+    :rtype: Tensor
+    """
+    n = len(g.nodes)
+    ls = []
+    weight = []
+    for e in g.edges:
+        if hzz != 0:
+            r = [0 for _ in range(n)]
+            r[e[0]] = 3
+            r[e[1]] = 3
+            ls.append(r)
+            weight.append(hzz)
+        if hxx != 0:
+            r = [0 for _ in range(n)]
+            r[e[0]] = 1
+            r[e[1]] = 1
+            ls.append(r)
+            weight.append(hxx)
+        if hyy != 0:
+            r = [0 for _ in range(n)]
+            r[e[0]] = 2
+            r[e[1]] = 2
+            ls.append(r)
+            weight.append(hyy)
+    for node in g.nodes:
+        if hz != 0:
+            r = [0 for _ in range(n)]
+            r[node] = 3
+            ls.append(r)
+            weight.append(hz)
+        if hx != 0:
+            r = [0 for _ in range(n)]
+            r[node] = 1
+            ls.append(r)
+            weight.append(hx)
+        if hy != 0:
+            r = [0 for _ in range(n)]
+            r[node] = 2
+            ls.append(r)
+            weight.append(hy)
+    if sparse:
+        r = PauliStringSum2COO_numpy(ls, weight)
         if numpy:
-            return rsparse
-        return backend.coo_sparse_matrix_from_numpy(rsparse)
+            return r
+        return backend.coo_sparse_matrix_from_numpy(r)
+    return PauliStringSum2Dense(ls, weight, numpy=numpy)
 
-    def _dc_sum(l: List[Any]) -> Any:
-        """
-        For the sparse sum, the speed is determined by the non zero terms,
-        so the DC way to do the sum can indeed bring some speed advantage (several times)
 
-        :param l: _description_
-        :type l: List[Any]
-        :return: _description_
-        :rtype: Any
-        """
-        n = len(l)
-        if n > 2:
-            return _dc_sum(l[: n // 2]) + _dc_sum(l[n // 2 :])
-        else:
-            return sum(l)
+def _id(x: Any) -> Any:
+    return x
 
-    PauliStringSum2COO_numpy = partial(PauliStringSum2COO, numpy=True)
+
+def _tf_sparse_utils() -> Dict[str, Any]:
+    # tensorflow sparse Pauli string utilities are built at the first access,
+    # so that tensorflow is not imported with tensorcircuit
+    import tensorflow as tf
+
+    if is_m1mac():
+        compiled_jit = _id
+    else:
+        compiled_jit = partial(get_backend("tensorflow").jit, jit_compile=True)
 
     def PauliStringSum2COO_tf(
         ls: Sequence[Sequence[int]], weight: Optional[Sequence[float]] = None
@@ -1467,10 +1657,31 @@ try:
         )
         return tf.SparseTensor(indices=indices, values=values, dense_shape=(s, s))  # type: ignore
 
-except (NameError, ImportError):
-    logger.info(
-        "tensorflow is not installed, and sparse Hamiltonian generation utilities are disabled"
-    )
+    fs = {
+        "compiled_jit": compiled_jit,
+        "PauliStringSum2COO_tf": PauliStringSum2COO_tf,
+        "PauliString2COO": PauliString2COO,
+        "ps2coo_core": ps2coo_core,
+    }
+    globals().update(fs)
+    return fs
+
+
+def __getattr__(name: str) -> Any:
+    if name in [
+        "compiled_jit",
+        "PauliStringSum2COO_tf",
+        "PauliString2COO",
+        "ps2coo_core",
+    ]:
+        try:
+            return _tf_sparse_utils()[name]
+        except ImportError:
+            raise AttributeError(
+                "tensorflow is not installed, and tensorflow sparse Pauli string utilities are disabled"
+            )
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 
 # some quantum quatities below
 
@@ -2037,15 +2248,11 @@ def count_vector2dict(count: Tensor, n: int, key: str = "bin") -> Dict[Any, int]
     from .interfaces import which_backend
 
     b = which_backend(count)
-    d = {i: b.numpy(count[i]).item() for i in range(2**n)}
+    d = dict(enumerate(b.numpy(count).tolist()))
     if key == "int":
         return d
     else:
-        dn = {}
-        for k, v in d.items():
-            kn = str(bin(k))[2:].zfill(n)
-            dn[kn] = v
-        return dn
+        return {format(k, "0%sb" % n): v for k, v in d.items()}
 
 
 def count_tuple2dict(
@@ -2063,19 +2270,13 @@ def count_tuple2dict(
     :return: count_dict
     :rtype: _type_
     """
-    d = {
-        backend.numpy(i).item(): backend.numpy(j).item()
-        for i, j in zip(count[0], count[1])
-        if i >= 0
-    }
+    keys, values = backend.numpy(count[0]), backend.numpy(count[1])
+    mask = keys >= 0
+    d = dict(zip(keys[mask].tolist(), values[mask].tolist()))
     if key == "int":
         return d
     else:
-        dn = {}
-        for k, v in d.items():
-            kn = str(bin(k))[2:].zfill(n)
-            dn[kn] = v
-        return dn
+        return {format(k, "0%sb" % n): v for k, v in d.items()}
 
 
 @partial(arg_alias, alias_dict={"counts": ["shots"], "format": ["format_"]})
@@ -2208,6 +2409,9 @@ def sample2all(
         sample_int = sample
         sample_bin = sample_int2bin(sample, n)
     elif len(backend.shape_tuple(sample)) == 2:
+        if format == "sample_bin":
+            # skip the int conversion which overflows for large n
+            return sample
         sample_int = sample_bin2int(sample, n)
         sample_bin = sample
     else:
@@ -1,7 +1,7 @@
 """
 dict related functionalities
 """
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -9,7 +9,233 @@ import numpy as np
 Tensor = Any
 ct = Dict[str, int]
 
-# TODO(@refraction-ray): merge_count
+
+def _row_keys(bits: Tensor) -> Tensor:
+    # one sortable key per bitstring, in the lexicographic order of the bitstrings:
+    # the integer value for no more than 64 qubits, and the packed bytes otherwise
+    m, n = bits.shape
+    if n <= 64:
+        packed = np.packbits(bits[:, ::-1], axis=1, bitorder="little")
+        padded = np.zeros([m, 8], dtype=np.uint8)
+        padded[:, : packed.shape[1]] = packed
+        return padded.view("<u8").ravel()
+    packed = np.ascontiguousarray(np.packbits(bits, axis=1))
+    return packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+
+
+def _int2bits(keys: Tensor, n: int) -> Tensor:
+    keys = np.asarray(keys, dtype=np.uint64)
+    shifts = np.arange(n - 1, -1, -1, dtype=np.uint64)
+    return ((keys[:, None] >> shifts[None, :]) & np.uint64(1)).astype(np.uint8)
+
+
+def _unique_rows(bits: Tensor, counts: Tensor) -> Tuple[Tensor, Tensor]:
+    if bits.shape[0] == 0:
+        return bits, counts
+    _, index, inverse = np.unique(
+        _row_keys(bits), return_index=True, return_inverse=True
+    )
+    ncounts = np.bincount(inverse.ravel(), weights=counts, minlength=len(index))
+    return bits[index], ncounts.astype(counts.dtype)
+
+
+class Counts:
+    """
+    Compact bitstring histogram backed by a ``uint8`` array of the distinct bitstrings
+    in shape [m, n] and the corresponding counts in shape [m],
+    all the post-processings are vectorized on the arrays.
+    The bitstring ``"01"`` means qubit 0 in state 0 and qubit 1 in state 1,
+    consistent with the count dict ``ct``.
+
+    :Example:
+
+    >>> c = tc.results.counts.Counts.from_dict({"000": 2, "101": 3, "100": 4})
+    >>> c.marginal([2, 0]).to_dict()
+    {'00': 2, '01': 4, '11': 3}
+    >>> c.expectation(z=[0, 1])
+    -0.5555555555555556
+    """
+
+    def __init__(self, bits: Tensor, counts: Tensor):
+        """
+        :param bits: the distinct bitstrings in shape [m, n]
+        :type bits: Tensor
+        :param counts: the counts (or quasi-probabilities) in shape [m]
+        :type counts: Tensor
+        """
+        self.bits = np.asarray(bits, dtype=np.uint8)
+        self.counts = np.asarray(counts)
+        assert self.bits.ndim == 2 and self.bits.shape[0] == self.counts.shape[0]
+
+    @classmethod
+    def from_dict(cls, count: ct) -> "Counts":
+        """
+        :param count: count dict, eg. ``{"00": 2, "11": 3}``
+        :type count: ct
+        :return: the Counts object
+        :rtype: Counts
+        """
+        if not count:
+            return cls(np.zeros([0, 0], dtype=np.uint8), np.zeros([0], dtype=int))
+        n = len(next(iter(count)))
+        bits = np.frombuffer("".join(count.keys()).encode(), dtype=np.uint8) - 48
+        return cls(bits.reshape([-1, n]), np.array(list(count.values())))
+
+    @classmethod
+    def from_samples(cls, samples: Tensor) -> "Counts":
+        """
+        :param samples: measurement results of each shot in shape [shots, n],
+            eg. in ``sample_bin`` format
+        :type samples: Tensor
+        :return: the Counts object
+        :rtype: Counts
+        """
+        samples = np.asarray(samples).astype(np.uint8)
+        return cls(*_unique_rows(samples, np.ones([samples.shape[0]], dtype=int)))
+
+    @classmethod
+    def from_tuple(cls, count: Tuple[Tensor, Tensor], n: int) -> "Counts":
+        """
+        :param count: ``count_tuple`` format as in :py:func:`tensorcircuit.quantum.sample2count`,
+            the entries with negative indices are ignored
+        :type count: Tuple[Tensor, Tensor]
+        :param n: number of qubits
+        :type n: int
+        :return: the Counts object
+        :rtype: Counts
+        """
+        keys, counts = np.asarray(count[0]), np.asarray(count[1])
+        mask = keys >= 0
+        return cls(*_unique_rows(_int2bits(keys[mask], n), counts[mask]))
+
+    @classmethod
+    def from_vector(cls, vec: Tensor, eps: float = 1e-8) -> "Counts":
+        """
+        :param vec: the dense count (or probability) vector in shape [2**n]
+        :type vec: Tensor
+        :param eps: the entries with absolute values no larger than ``eps`` are pruned,
+            defaults to 1e-8
+        :type eps: float, optional
+        :return: the Counts object
+        :rtype: Counts
+        """
+        vec = np.asarray(vec)
+        n = int(np.log(vec.shape[0]) / np.log(2) + 1e-9)
+        keys = np.nonzero(np.abs(vec) > eps)[0]
+        return cls(_int2bits(keys, n), vec[keys])
+
+    def to_dict(self) -> ct:
+        """
+        :return: count dict with bitstring keys
+        :rtype: ct
+        """
+        if self.n == 0 or len(self) == 0:
+            return {}
+        keys = np.ascontiguousarray(self.bits + 48).view("S%s" % self.n).ravel()
+        return dict(zip(keys.astype("U%s" % self.n).tolist(), self.counts.tolist()))
+
+    def to_tuple(self) -> Tuple[Tensor, Tensor]:
+        """
+        :return: ``count_tuple`` format, i.e. the integer bitstrings and the counts
+        :rtype: Tuple[Tensor, Tensor]
+        """
+        assert self.n <= 63
+        return _row_keys(self.bits).astype(np.int64), self.counts
+
+    def to_vector(self, normalization: bool = True) -> Tensor:
+        """
+        :param normalization: whether to normalize the counts as probabilities,
+            defaults to True
+        :type normalization: bool, optional
+        :return: the dense vector in shape [2**n]
+        :rtype: Tensor
+        """
+        vec = np.zeros([2**self.n], dtype=self.counts.dtype)
+        vec[_row_keys(self.bits).astype(np.int64)] = self.counts
+        if normalization:
+            return vec / self.shots
+        return vec
+
+    @property
+    def n(self) -> int:
+        return self.bits.shape[1]  # type: ignore
+
+    @property
+    def shots(self) -> Any:
+        return np.sum(self.counts)
+
+    def __len__(self) -> int:
+        return self.bits.shape[0]  # type: ignore
+
+    def normalized(self) -> "Counts":
+        return Counts(self.bits, self.counts / self.shots)
+
+    def reverse(self) -> "Counts":
+        return Counts(self.bits[:, ::-1], self.counts)
+
+    def sort(self) -> "Counts":
+        """
+        :return: the Counts sorted by the counts in descending order
+        :rtype: Counts
+        """
+        order = np.argsort(-self.counts, kind="stable")
+        return Counts(self.bits[order], self.counts[order])
+
+    def marginal(self, keep_list: Sequence[int]) -> "Counts":
+        """
+        :param keep_list: the qubits kept, in the order of the new bitstrings
+        :type keep_list: Sequence[int]
+        :return: the marginal Counts
+        :rtype: Counts
+        """
+        return Counts(*_unique_rows(self.bits[:, list(keep_list)], self.counts))
+
+    def merge(self, *others: "Counts") -> "Counts":
+        """
+        :return: the Counts with the counts of the same bitstrings summed
+        :rtype: Counts
+        """
+        # the empty Counts (of unknown width) are skipped
+        cs = [c for c in (self,) + others if len(c) > 0]
+        if not cs:
+            return self
+        bits = np.concatenate([c.bits for c in cs])
+        counts = np.concatenate([c.counts for c in cs])
+        return Counts(*_unique_rows(bits, counts))
+
+    __add__ = merge
+
+    def expectation(
+        self, z: Optional[Sequence[int]] = None, diagonal_op: Optional[Tensor] = None
+    ) -> float:
+        """
+        See :py:func:`expectation`
+        """
+        if z is None and diagonal_op is None:
+            raise ValueError("One of `z` and `diagonal_op` must be set")
+        if z is not None:
+            # a repeated index is still a single Z on the qubit
+            z = sorted(set(z))
+            values = 1 - 2 * (np.sum(self.bits[:, z], axis=1, dtype=int) % 2)
+        else:
+            d = np.asarray(diagonal_op)
+            values = np.prod(d[np.arange(self.n)[None, :], self.bits], axis=1)
+        return float(np.sum(values * self.counts) / self.shots)
+
+    def kl_divergence(self, other: "Counts", eps: float = 1e-4) -> float:
+        """
+        See :py:func:`kl_divergence`
+        """
+        p = self.counts / self.shots
+        _, inverse = np.unique(
+            np.concatenate([_row_keys(self.bits), _row_keys(other.bits)]),
+            return_inverse=True,
+        )
+        inverse = inverse.ravel()
+        q = np.full([inverse.max() + 1], eps)
+        q[inverse[len(self) :]] = other.counts / other.shots
+        q = q[inverse[: len(self)]]
+        return float(np.sum(p * (np.log(p) - np.log(q))))
 
 
 def reverse_count(count: ct) -> ct:
@@ -29,22 +255,18 @@ def normalized_count(count: ct) -> Dict[str, float]:
 
 
 def marginal_count(count: ct, keep_list: Sequence[int]) -> ct:
-    import qiskit
+    return Counts.from_dict(count).marginal(keep_list).to_dict()
 
-    count = reverse_count(count)
-    ncount = qiskit.result.utils.marginal_distribution(count, keep_list)
-    return reverse_count(ncount)
+
+def merge_count(*counts: ct) -> ct:
+    if not counts:
+        return {}
+    cs = [Counts.from_dict(c) for c in counts]
+    return cs[0].merge(*cs[1:]).to_dict()
 
 
 def count2vec(count: ct, normalization: bool = True) -> Tensor:
-    nqubit = len(list(count.keys())[0])
-    probability = [0] * 2**nqubit
-    shots = sum([v for k, v in count.items()])
-    for k, v in count.items():
-        if normalization is True:
-            v /= shots  # type: ignore
-        probability[int(k, 2)] = v
-    return np.array(probability)
+    return Counts.from_dict(count).to_vector(normalization)
 
 
 def vec2count(vec: Tensor, prune: bool = False) -> ct:
@@ -65,12 +287,7 @@ def vec2count(vec: Tensor, prune: bool = False) -> ct:
 
 def kl_divergence(c1: ct, c2: ct) -> float:
     eps = 1e-4  # typical value for inverse of the total shots
-    c1 = normalized_count(c1)  # type: ignore
-    c2 = normalized_count(c2)  # type: ignore
-    kl = 0
-    for k, v in c1.items():
-        kl += v * (np.log(v) - np.log(c2.get(k, eps)))
-    return kl
+    return Counts.from_dict(c1).kl_divergence(Counts.from_dict(c2), eps)
 
 
 def expectation(
@@ -92,18 +309,7 @@ def expectation(
     """
     if z is None and diagonal_op is None:
         raise ValueError("One of `z` and `diagonal_op` must be set")
-    n = len(list(count.keys())[0])
-    if z is not None:
-        diagonal_op = [[1, -1] if i in z else [1, 1] for i in range(n)]
-    r = 0
-    shots = 0
-    for k, v in count.items():
-        cr = 1.0
-        for i in range(n):
-            cr *= diagonal_op[i][int(k[i])]  # type: ignore
-        r += cr * v  # type: ignore
-        shots += v
-    return r / shots
+    return Counts.from_dict(count).expectation(z, diagonal_op)
 
 
 def plot_histogram(data: Any, **kws: Any) -> Any:
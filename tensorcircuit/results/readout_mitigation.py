@@ -4,20 +4,21 @@ readout error mitigation functionalities
 # Part of the code in this file is from mthree: https://github.com/Qiskit-Partners/mthree (Apache2)
 # https://journals.aps.org/prxquantum/pdf/10.1103/PRXQuantum.2.040326
 
-from typing import Any, Callable, List, Sequence, Optional, Union, Dict
+from typing import Any, Callable, List, Sequence, Optional, Union, Dict, Iterator, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 from time import perf_counter
 
 import numpy as np
 import scipy.linalg as la
+import scipy.sparse as sp
 import scipy.sparse.linalg as spla
 from scipy.optimize import minimize
 
 try:
-    from mthree.matrix import _reduced_cal_matrix
-    from mthree.utils import counts_to_vector, vector_to_quasiprobs
+    from mthree.utils import vector_to_quasiprobs
     from mthree.norms import ainv_onenorm_est_lu, ainv_onenorm_est_iter
-    from mthree.matvec import M3MatVec
     from mthree.exceptions import M3Error
     from mthree.classes import QuasiCollection
 
@@ -25,7 +26,15 @@ try:
 except ImportError:
     mthree_installed = False
 
-from .counts import count2vec, vec2count, ct, marginal_count, expectation, sort_count
+from .counts import (
+    Counts,
+    count2vec,
+    vec2count,
+    ct,
+    marginal_count,
+    expectation,
+    sort_count,
+)
 from ..circuit import Circuit
 from ..utils import is_sequence
 
@@ -33,8 +42,242 @@ from ..utils import is_sequence
 Tensor = Any
 
 
+def _modewise_matvec(mats: Sequence[Tensor], p: Tensor) -> Tensor:
+    # (mats[0] kron mats[1] kron ...) @ p by contracting each 2*2 matrix on its own axis
+    n = len(mats)
+    for i, m in enumerate(mats):
+        p = np.matmul(m, p.reshape([2**i, 2, 2 ** (n - i - 1)]))
+    return p.reshape([-1])
+
+
+def _pack_bits(bits: Tensor) -> Tensor:
+    # bitstrings in shape [m, n] packed as rows of uint64 words
+    m, n = bits.shape
+    packed = np.zeros([m, (n + 63) // 64 * 8], dtype=np.uint8)
+    packed[:, : (n + 7) // 8] = np.packbits(bits, axis=1)
+    return packed.view(np.uint64)
+
+
+def _popcount(x: Tensor) -> Tensor:
+    # number of set bits in each uint64 element
+    bitwise_count = getattr(np, "bitwise_count", None)  # numpy>=2.0
+    if bitwise_count is not None:
+        return bitwise_count(x)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + (
+        (x >> np.uint64(2)) & np.uint64(0x3333333333333333)
+    )
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+def _hamming_distance(a: Tensor, b: Tensor) -> Tensor:
+    # pairwise Hamming distances between the packed bitstrings ``a`` and ``b``
+    d = _popcount(a[:, 0][:, None] ^ b[None, :, 0])
+    for i in range(1, a.shape[1]):
+        d += _popcount(a[:, i][:, None] ^ b[None, :, i])
+    return d
+
+
+def _kron_tables(mats: Sequence[Tensor], group: int = 8) -> List[Tensor]:
+    # every ``group`` qubits are merged into one kron table,
+    # which only depends on the calibration matrices
+    tables = []
+    for start in range(0, len(mats), group):
+        table = mats[start]
+        for m in mats[start + 1 : start + group]:
+            table = np.kron(table, m)
+        tables.append(table)
+    return tables
+
+
+def _subspace_blocks(
+    mats: Sequence[Tensor],
+    bits: Tensor,
+    distance: Optional[int] = None,
+    nthreads: Optional[int] = None,
+    block_size: int = 2**22,
+    group: int = 8,
+    tables: Optional[Sequence[Tensor]] = None,
+) -> Iterator[Tuple[int, Tensor]]:
+    # row blocks of (mats[0] kron mats[1] kron ...) restricted to the rows and columns of ``bits``,
+    # the kron tables of every ``group`` qubits (see ``_kron_tables``) are looked up once each,
+    # the elements between bitstrings with Hamming distance larger than ``distance`` are set to zero
+    kron = _kron_tables(mats, group) if tables is None else tables
+    codes = []
+    for start in range(0, len(mats), group):
+        k = min(group, len(mats) - start)
+        codes.append(bits[:, start : start + k] @ 2 ** np.arange(k - 1, -1, -1))
+    packed = None
+    if distance is not None and distance < bits.shape[1]:
+        packed = _pack_bits(bits)
+    m = bits.shape[0]
+    nrows = max(1, block_size // max(m, 1))
+
+    def block(start: int) -> Tuple[int, Tensor]:
+        stop = min(start + nrows, m)
+        w = np.ones([stop - start, m], dtype=np.result_type(*mats))
+        for table, code in zip(kron, codes):
+            w *= table[code[start:stop][:, None], code[None, :]]
+        if packed is not None:
+            w *= _hamming_distance(packed[start:stop], packed) <= distance
+        return start, w
+
+    starts = list(range(0, m, nrows))
+    if nthreads is None or nthreads <= 1:
+        yield from map(block, starts)
+        return
+    # numpy releases the GIL in the elementwise kernels,
+    # at most ``nthreads`` blocks are alive at the same time
+    with ThreadPoolExecutor(nthreads) as executor:
+        for i in range(0, len(starts), nthreads):
+            yield from executor.map(block, starts[i : i + nthreads])
+
+
+def _subspace_matvec(mats: Sequence[Tensor], bits: Tensor, x: Tensor) -> Tensor:
+    y = np.zeros([bits.shape[0]], dtype=np.result_type(x, *mats))
+    for start, w in _subspace_blocks(mats, bits):
+        y[start : start + w.shape[0]] = w @ x
+    return y
+
+
+def _subspace_matrix(mats: Sequence[Tensor], bits: Tensor) -> Tensor:
+    return np.concatenate([w for _, w in _subspace_blocks(mats, bits)])
+
+
+def _project_simplex(v: Tensor) -> Tensor:
+    # Euclidean projection onto the probability simplex
+    u = np.sort(v)[::-1]
+    css = np.cumsum(u) - 1
+    ind = np.arange(1, v.shape[0] + 1)
+    cond = u - css / ind > 0
+    theta = css[cond][-1] / ind[cond][-1]
+    return np.maximum(v - theta, 0)
+
+
+def _simplex_least_square(
+    grad: Callable[[Tensor], Tensor],
+    x0: Tensor,
+    lipschitz: float,
+    max_iter: int = 500,
+    tol: float = 1e-8,
+) -> Tensor:
+    # accelerated projected gradient descent (FISTA) on the probability simplex
+    x = _project_simplex(x0)
+    y = x
+    t = 1.0
+    for _ in range(max_iter):
+        xn = _project_simplex(y - grad(y) / lipschitz)
+        tn = (1 + np.sqrt(1 + 4 * t**2)) / 2
+        y = xn + (t - 1) / tn * (xn - x)
+        converged = np.linalg.norm(xn - x) < tol
+        x, t = xn, tn
+        if converged:
+            break
+    return x
+
+
+class _ReducedCalMatrix:
+    """
+    The reduced calibration matrix of M3 on the observed bitstrings truncated by the Hamming distance
+    and normalized by the column sums, the interface is consistent with ``mthree.matvec.M3MatVec``.
+    With truncation, the nonzero elements are evaluated blockwise once and kept as a sparse matrix;
+    otherwise, they are evaluated blockwise on the fly for each matvec.
+    """
+
+    def __init__(
+        self,
+        mats: Sequence[Tensor],
+        bits: Tensor,
+        distance: Optional[int] = None,
+        nthreads: Optional[int] = None,
+        tables: Optional[Sequence[Tensor]] = None,
+    ):
+        self.mats = mats
+        self.bits = bits
+        self.distance = distance
+        self.nthreads = nthreads
+        if tables is None:
+            tables = _kron_tables(mats)
+        self.tables = tables
+        self.num_elems = bits.shape[0]
+        self.sparse = None
+        if distance is not None:
+            rows, cols, values = [], [], []
+            for start, w in self._blocks():
+                r, c = np.nonzero(w)
+                rows.append(r + start)
+                cols.append(c)
+                values.append(w[r, c])
+            self.sparse = sp.csr_matrix(
+                (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                shape=(self.num_elems, self.num_elems),
+            )
+        self.col_norms = self._rmatvec(np.ones([self.num_elems]))
+
+    def _blocks(self) -> Iterator[Tuple[int, Tensor]]:
+        return _subspace_blocks(
+            self.mats, self.bits, self.distance, self.nthreads, tables=self.tables
+        )
+
+    def _matvec(self, x: Tensor) -> Tensor:
+        if self.sparse is not None:
+            return self.sparse @ x
+        y = np.zeros([self.num_elems])
+        for start, w in self._blocks():
+            y[start : start + w.shape[0]] = w @ x
+        return y
+
+    def _rmatvec(self, x: Tensor) -> Tensor:
+        if self.sparse is not None:
+            return self.sparse.T @ x
+        y = np.zeros([self.num_elems])
+        for start, w in self._blocks():
+            y += x[start : start + w.shape[0]] @ w
+        return y
+
+    def matvec(self, x: Tensor) -> Tensor:
+        return self._matvec(x / self.col_norms)
+
+    def rmatvec(self, x: Tensor) -> Tensor:
+        return self._rmatvec(x) / self.col_norms
+
+    def get_diagonal(self) -> Tensor:
+        d = np.ones([self.num_elems])
+        for i, m in enumerate(self.mats):
+            d *= m[self.bits[:, i], self.bits[:, i]]
+        return d / self.col_norms
+
+    def get_col_norms(self) -> Tensor:
+        return self.col_norms
+
+    @property
+    def nbytes(self) -> int:
+        if self.sparse is None:
+            return self.col_norms.nbytes  # type: ignore
+        return (  # type: ignore
+            self.sparse.data.nbytes
+            + self.sparse.indices.nbytes
+            + self.sparse.indptr.nbytes
+            + self.col_norms.nbytes
+        )
+
+    def to_dense(self) -> Tensor:
+        if self.sparse is not None:
+            w = self.sparse.toarray()
+        else:
+            w = np.concatenate([w for _, w in self._blocks()])
+        return w / self.col_norms[None, :]
+
+
 class ReadoutMit:
-    def __init__(self, execute: Callable[..., List[ct]], iter_threshold: int = 4096):
+    def __init__(
+        self,
+        execute: Callable[..., List[ct]],
+        iter_threshold: int = 4096,
+        nthreads: Optional[int] = None,
+        m3_cache_bytes: int = 2**28,
+    ):
         """
         The Class for readout error mitigation
 
@@ -42,6 +285,14 @@ class ReadoutMit:
         :type execute: Callable[..., List[ct]]
         :param iter_threshold: iteration threshold, defaults to 4096
         :type iter_threshold: int, optional
+        :param nthreads: number of threads to evaluate the M3 reduced calibration matrix,
+            defaults to None (single thread)
+        :type nthreads: Optional[int], optional
+        :param m3_cache_bytes: the memory budget in bytes of the cached M3 reduced matrices
+            and their LU factorizations, which are reused by the calls with the same qubits,
+            calibration data, distance and observed bitstrings, defaults to 256MB,
+            0 to disable the cache
+        :type m3_cache_bytes: int, optional
         """
 
         self.cal_qubits = None  #  qubit list for calibration
@@ -52,6 +303,13 @@ class ReadoutMit:
         self.global_cals = None
 
         self.iter_threshold = iter_threshold
+        self.nthreads = nthreads
+        self.m3_cache_bytes = m3_cache_bytes
+        # the kron tables of the calibration matrices, keyed by the qubits and calibration data
+        self._m3_tables: "OrderedDict[Any, List[Tensor]]" = OrderedDict()
+        # M3 reduced matrices and their LU factorizations, keyed by the qubits, calibration data,
+        # distance and observed bitstrings, least recently used entries beyond the budget are dropped
+        self._m3_cache: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
 
         if isinstance(execute, str):
             # execute is a device name str
@@ -151,15 +409,6 @@ class ReadoutMit:
         self.calmatrix = calmatrix  # type: ignore
         return calmatrix
 
-    def _form_cals(self, qubits):  # type: ignore
-        qubits = np.asarray(qubits, dtype=int)
-        cals = np.zeros(4 * qubits.shape[0], dtype=float)
-
-        # Reverse index qubits for easier indexing later
-        for kk, qubit in enumerate(qubits[::-1]):
-            cals[4 * kk : 4 * kk + 4] = self.single_qubit_cals[qubit].ravel()  # type: ignore
-        return cals
-
     def local_miti_readout_circ(self) -> List[Circuit]:
         """
         Generate circuits for local calibration.
@@ -334,11 +583,21 @@ class ReadoutMit:
         else:
             raise ValueError("Unrecognized `miti_method`: %s" % method)
 
+    def _local_cals(self, qubits: Optional[Sequence[Any]] = None) -> List[Tensor]:
+        if qubits is None:
+            if self.use_qubits is not None:
+                qubits = self.use_qubits
+            else:
+                qubits = self.cal_qubits
+        return [self.single_qubit_cals[q] for q in qubits]  # type: ignore
+
     def mitigate_probability(
         self, probability_noise: Tensor, method: str = "inverse"
     ) -> Tensor:
         """
         Get the mitigated probability.
+        For local calibration, the single qubit (inverse) calibration matrices are contracted
+        on each axis of the probability tensor and the full calibration matrix is never formed.
 
         :param probability_noise: probability of raw count
         :type probability_noise: Tensor
@@ -347,6 +606,22 @@ class ReadoutMit:
         :return: mitigated probability
         :rtype: Tensor
         """
+        if self.local is True:
+            mats = self._local_cals()
+            if method == "inverse":
+                return _modewise_matvec(
+                    [np.linalg.inv(m) for m in mats], probability_noise
+                )
+            # method="square"
+            mats_t = [m.T for m in mats]
+            return _simplex_least_square(
+                lambda x: _modewise_matvec(
+                    mats_t, _modewise_matvec(mats, x) - probability_noise
+                ),
+                _modewise_matvec([np.linalg.inv(m) for m in mats], probability_noise),
+                np.prod([np.linalg.norm(m, 2) ** 2 for m in mats]),
+            )
+
         calmatrix = self.get_matrix()
         if method == "inverse":
             X = np.linalg.inv(calmatrix)
@@ -366,7 +641,46 @@ class ReadoutMit:
             probability_cali = res.x
         return probability_cali
 
-    def apply_readout_mitigation(self, raw_count: ct, method: str = "inverse") -> ct:
+    def mitigate_subspace_probability(
+        self, count: Counts, method: str = "inverse"
+    ) -> Tensor:
+        """
+        Get the mitigated probability restricted on the observed bitstrings,
+        only available for local calibration.
+        For "inverse", the result is exact on the observed bitstrings;
+        for "square", the least square problem is constrained on
+        the probability distributions supported by the observed bitstrings.
+        The cost scales as the square of the number of observed bitstrings instead of :math:`2^n`.
+
+        :param count: the raw count
+        :type count: Counts
+        :param method: mitigation methods, defaults to "inverse", it can also be "square"
+        :type method: str, optional
+        :return: mitigated probability on ``count.bits``
+        :rtype: Tensor
+        """
+        mats = self._local_cals()
+        p = count.counts / count.shots
+        x = _subspace_matvec([np.linalg.inv(m) for m in mats], count.bits, p)
+        if method == "inverse":
+            return x
+        # |A x - p|^2 = x^T (A^T A) x - 2 (A^T p)^T x + const, A^T A is also tensored
+        b = _subspace_matvec([m.T for m in mats], count.bits, p)
+        gram = [m.T @ m for m in mats]
+        if len(count) ** 2 <= 2**24:
+            g = _subspace_matrix(gram, count.bits)
+            grad = lambda x: g @ x - b
+        else:
+            grad = lambda x: _subspace_matvec(gram, count.bits, x) - b
+        return _simplex_least_square(
+            grad,
+            x,
+            np.prod([np.linalg.norm(m, 2) ** 2 for m in mats]),
+        )
+
+    def apply_readout_mitigation(
+        self, raw_count: ct, method: str = "inverse", subspace: bool = False
+    ) -> ct:
         """
         Main readout mitigation program for method="inverse" or "square"
 
@@ -374,14 +688,28 @@ class ReadoutMit:
         :type raw_count: ct
         :param method: mitigation method, defaults to "inverse"
         :type method: str, optional
+        :param subspace: whether to restrict the mitigation on the observed bitstrings
+            (only for local calibration), defaults to False. It is much faster when the
+            observed bitstrings are much fewer than :math:`2^n`, while the mitigated counts
+            on the subspace no longer sum to the shots (the weights outside are dropped)
+        :type subspace: bool, optional
         :return: mitigated count
         :rtype: ct
         """
-        probability = count2vec(raw_count)
-        shots = sum([v for k, v in raw_count.items()])
-        probability = self.mitigate_probability(probability, method=method)
-        probability = probability * shots
-        return vec2count(probability, prune=True)
+        if self.local is not True:
+            probability = count2vec(raw_count)
+            shots = sum([v for k, v in raw_count.items()])
+            probability = self.mitigate_probability(probability, method=method)
+            probability = probability * shots
+            return vec2count(probability, prune=True)
+
+        count = Counts.from_dict(raw_count)
+        if subspace:
+            probability = self.mitigate_subspace_probability(count, method=method)
+            mask = np.abs(probability) > 1e-8
+            return Counts(count.bits[mask], probability[mask] * count.shots).to_dict()
+        probability = self.mitigate_probability(count.to_vector(), method=method)
+        return Counts.from_vector(probability * count.shots).to_dict()
 
     def mapping_preprocess(
         self,
@@ -671,6 +999,44 @@ class ReadoutMit:
         else:
             raise M3Error("Invalid method: {}".format(method))
 
+    def _m3_matrix(
+        self, counts: ct, qubits: Sequence[int], distance: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], Counts]:
+        count = Counts.from_dict(dict(counts)).merge()  # sorted bitstrings
+        mats = self._local_cals(qubits)
+        if distance is not None and distance >= len(qubits):
+            distance = None
+        cal_key = (tuple(qubits), np.stack(mats).tobytes())
+        if cal_key not in self._m3_tables:
+            if len(self._m3_tables) >= 16:
+                self._m3_tables.pop(next(iter(self._m3_tables)))
+            self._m3_tables[cal_key] = _kron_tables(mats)
+        self._m3_tables.move_to_end(cal_key)
+        key = cal_key + (distance, count.bits.tobytes())
+        if key in self._m3_cache:
+            self._m3_cache.move_to_end(key)
+            return self._m3_cache[key], count
+        cache = {
+            "M": _ReducedCalMatrix(
+                mats, count.bits, distance, self.nthreads, self._m3_tables[cal_key]
+            )
+        }
+        self._m3_cache[key] = cache
+        self._trim_m3_cache()
+        return cache, count
+
+    def _trim_m3_cache(self) -> None:
+        # drop the least recently used entries until the cache is within ``m3_cache_bytes``
+        def nbytes(cache: Dict[str, Any]) -> int:
+            r = cache["M"].nbytes
+            if "LU" in cache:
+                r += cache["A"].nbytes + cache["LU"][0].nbytes
+            return r  # type: ignore
+
+        total = sum([nbytes(c) for c in self._m3_cache.values()])
+        while self._m3_cache and total > self.m3_cache_bytes:
+            total -= nbytes(self._m3_cache.pop(next(iter(self._m3_cache))))
+
     def reduced_cal_matrix(self, counts, qubits, distance=None):  # type: ignore
         counts = dict(counts)
         # If distance is None, then assume max distance.
@@ -686,26 +1052,24 @@ class ReadoutMit:
                 + " number of qubits ({})".format(num_bits)
             )
 
-        cals = self._form_cals(qubits)
-        A, counts, _ = _reduced_cal_matrix(counts, cals, num_bits, distance)
-        return A, counts
+        cache, count = self._m3_matrix(counts, qubits, distance)
+        return cache["M"].to_dense(), count.to_dict()
 
     def _direct_solver(  # type: ignore
         self, counts, qubits, distance=None, return_mitigation_overhead=False
     ):
-        cals = self._form_cals(qubits)
-        num_bits = len(qubits)
-        A, sorted_counts, col_norms = _reduced_cal_matrix(
-            counts, cals, num_bits, distance
-        )
-        vec = counts_to_vector(sorted_counts)
-        LU = la.lu_factor(A, check_finite=False)
-        x = la.lu_solve(LU, vec, check_finite=False)
+        cache, count = self._m3_matrix(counts, qubits, distance)
+        if "LU" not in cache:
+            cache["A"] = cache["M"].to_dense()
+            cache["LU"] = la.lu_factor(cache["A"], check_finite=False)
+            self._trim_m3_cache()
+        vec = count.counts / count.shots
+        x = la.lu_solve(cache["LU"], vec, check_finite=False)
         gamma = None
         if return_mitigation_overhead:
-            gamma = ainv_onenorm_est_lu(A, LU)
-        out = vector_to_quasiprobs(x, sorted_counts)
-        return out, col_norms, gamma
+            gamma = ainv_onenorm_est_lu(cache["A"], cache["LU"])
+        out = vector_to_quasiprobs(x, count.to_dict())
+        return out, cache["M"].get_col_norms(), gamma
 
     def _matvec_solver(  # type: ignore
         self,
@@ -718,8 +1082,8 @@ class ReadoutMit:
         callback=None,
         return_mitigation_overhead=False,
     ):
-        cals = self._form_cals(qubits)
-        M = M3MatVec(dict(counts), cals, distance)
+        cache, count = self._m3_matrix(counts, qubits, distance)
+        M = cache["M"]
         L = spla.LinearOperator(
             (M.num_elems, M.num_elems), matvec=M.matvec, rmatvec=M.rmatvec
         )
@@ -730,7 +1094,7 @@ class ReadoutMit:
             return out
 
         P = spla.LinearOperator((M.num_elems, M.num_elems), precond_matvec)
-        vec = counts_to_vector(M.sorted_counts)
+        vec = count.counts / count.shots
         out, error = spla.gmres(
             L, vec, tol=tol, atol=tol, maxiter=max_iter, M=P, callback=callback
         )
@@ -741,7 +1105,7 @@ class ReadoutMit:
         if return_mitigation_overhead:
             gamma = ainv_onenorm_est_iter(M, tol=tol, max_iter=max_iter)
 
-        quasi = vector_to_quasiprobs(out, M.sorted_counts)
+        quasi = vector_to_quasiprobs(out, count.to_dict())
         if details:
             return quasi, M.get_col_norms(), gamma
         return quasi, gamma
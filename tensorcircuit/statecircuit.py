@@ -0,0 +1,673 @@
+"""
+Quantum circuit: dense state vector and density matrix simulators without tensor network
+"""
+# pylint: disable=invalid-name
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import tensornetwork as tn
+
+from . import gates
+from .gates import apply_gate_tensor
+from .circuit import Circuit
+from .densitymatrix import DMCircuit2
+from .cons import backend, npdtype, dtypestr
+from .quantum import QuOperator
+
+Gate = gates.Gate
+Tensor = Any
+
+
+class StateCircuit(Circuit):
+    """
+    ``StateCircuit`` class, the state vector simulator sharing the same API as :py:class:`Circuit`,
+    where each gate is applied immediately on the dense state tensor
+    instead of being attached to a tensor network that is contracted afterwards.
+    It avoids the overhead of building, copying and path finding the tensor network
+    for circuits with many gates on a moderate number of qubits.
+
+    :Example:
+
+    >>> c = tc.StateCircuit(3)
+    >>> c.H(1)
+    >>> c.CNOT(0, 1)
+    >>> c.RX(2, theta=tc.num_to_tensor(1.))
+    >>> c.expectation_ps(z=[2])
+    array(0.5403023+0.j, dtype=complex64)
+    """
+
+    def __init__(
+        self,
+        nqubits: int,
+        inputs: Optional[Tensor] = None,
+        mps_inputs: Optional[QuOperator] = None,
+    ) -> None:
+        """
+        State vector simulator based circuit.
+
+        :param nqubits: The number of qubits in the circuit.
+        :type nqubits: int
+        :param inputs: If not None, the initial state of the circuit is taken as ``inputs``
+            instead of :math:`\\vert 0\\rangle^n` qubits, defaults to None.
+        :type inputs: Optional[Tensor], optional
+        :param mps_inputs: QuVector for a MPS like initial wavefunction, which is contracted
+            into the dense state at the beginning.
+        :type mps_inputs: Optional[QuOperator]
+        """
+        self.inputs = inputs
+        self.mps_inputs = mps_inputs
+        self.split = None
+        self._nqubits = nqubits
+
+        self.circuit_param = {
+            "nqubits": nqubits,
+            "inputs": inputs,
+            "mps_inputs": mps_inputs,
+        }
+        if inputs is not None:
+            self._state = self._inputs_state(inputs)
+        elif mps_inputs is not None:
+            self._state = self._inputs_state(mps_inputs.eval())
+        else:
+            inputs = np.zeros([2**nqubits], dtype=npdtype)
+            inputs[0] = 1.0
+            self._state = self._inputs_state(inputs)
+        self._node: Optional[tn.Node] = None
+        self._node_state: Optional[Tensor] = None
+        self._qir: List[Dict[str, Any]] = []
+        self._extra_qir: List[Dict[str, Any]] = []
+        # the gates and projections applied on the state, replayed for new inputs
+        self._ops: List[Tuple[Tensor, Tuple[int, ...]]] = []
+
+    def _inputs_state(self, inputs: Tensor) -> Tensor:
+        inputs = backend.convert_to_tensor(inputs)
+        inputs = backend.cast(inputs, dtype=dtypestr)
+        inputs = backend.reshape(inputs, [-1])
+        assert inputs.shape[0] == 2**self._nqubits
+        return backend.reshape(inputs, [2 for _ in range(self._nqubits)])
+
+    def _state_node(self) -> tn.Node:
+        # the single node tensor network view of the current state
+        if self._node is None or self._node_state is not self._state:
+            self._node = Gate(self._state)
+            self.coloring_nodes([self._node])
+            self._node_state = self._state
+        return self._node
+
+    @property
+    def _nodes(self) -> List[tn.Node]:  # type: ignore
+        return [self._state_node()]
+
+    @property
+    def _front(self) -> List[tn.Edge]:  # type: ignore
+        return list(self._state_node().edges)
+
+    def _copy(
+        self, conj: Optional[bool] = False
+    ) -> Tuple[List[tn.Node], List[tn.Edge]]:
+        state = backend.conj(self._state) if conj else self._state
+        n = Gate(state)
+        self.coloring_nodes([n], is_dagger=bool(conj))
+        return [n], list(n.edges)
+
+    def _copy_state_tensor(
+        self, conj: bool = False, reuse: bool = True
+    ) -> Tuple[List[tn.Node], List[tn.Edge]]:
+        return self._copy(conj)
+
+    def apply_general_gate(
+        self,
+        gate: Union[Gate, QuOperator],
+        *index: int,
+        name: Optional[str] = None,
+        split: Optional[Dict[str, Any]] = None,
+        mpo: bool = False,
+        ir_dict: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if name is None:
+            name = ""
+        gate_dict = {
+            "gate": gate,
+            "index": index,
+            "name": name,
+            "split": split,
+            "mpo": mpo,
+        }
+        if ir_dict is not None:
+            ir_dict.update(gate_dict)
+        else:
+            ir_dict = gate_dict
+        self._qir.append(ir_dict)
+        assert len(index) == len(set(index))
+        index = tuple([i if i >= 0 else self._nqubits + i for i in index])
+        self._apply_op(self._gate_tensor(gate, mpo), index)
+
+    apply = apply_general_gate
+
+    @staticmethod
+    def _gate_tensor(gate: Union[Gate, QuOperator], mpo: bool = False) -> Tensor:
+        if mpo:
+            return gate.eval_matrix()  # type: ignore
+        return gate.tensor  # type: ignore
+
+    def _apply_op(self, u: Tensor, index: Tuple[int, ...]) -> None:
+        self._ops.append((u, index))
+        self._state = apply_gate_tensor(self._state, u, index)
+
+    def _replay(self, state: Tensor) -> Tensor:
+        # apply all the gates (and projections) in the circuit on the given (possibly batched) state
+        for u, index in self._ops:
+            state = apply_gate_tensor(state, u, index)
+        return state
+
+    def replace_inputs(self, inputs: Tensor) -> None:
+        """
+        Replace the input state with the circuit structure unchanged,
+        the gates are reapplied on the new input state.
+
+        :param inputs: Input wavefunction.
+        :type inputs: Tensor
+        """
+        self._state = self._replay(self._inputs_state(inputs))
+
+    def replace_mps_inputs(self, mps_inputs: QuOperator) -> None:
+        """
+        Replace the input state in MPS representation with the circuit structure unchanged,
+        the gates are reapplied on the new input state.
+
+        :param mps_inputs: QuVector for a MPS like initial wavefunction.
+        :type mps_inputs: QuOperator
+        """
+        self.replace_inputs(mps_inputs.eval())
+
+    def mid_measurement(self, index: int, keep: int = 0) -> Tensor:
+        """
+        Middle measurement in z-basis on the circuit, note the wavefunction output is not normalized
+        with ``mid_measurement`` involved, one should normalize the state manually if needed.
+        This is a post-selection method as keep is provided as a prior.
+
+        :param index: The index of qubit that the Z direction postselection applied on.
+        :type index: int
+        :param keep: 0 for spin up, 1 for spin down, defaults to be 0.
+        :type keep: int, optional
+        """
+        if keep < 0.5:
+            gate = np.array([[1.0, 0.0], [0.0, 0.0]], dtype=npdtype)
+        else:
+            gate = np.array([[0.0, 0.0], [0.0, 1.0]], dtype=npdtype)
+        gate = backend.cast(backend.convert_to_tensor(gate), dtypestr)
+        index = index if index >= 0 else self._nqubits + index
+        self._apply_op(gate, (index,))
+        r = backend.convert_to_tensor(keep)
+        r = backend.cast(r, "int32")
+        return r
+
+    mid_measure = mid_measurement
+
+    def wavefunction(self, form: str = "default") -> Tensor:
+        """
+        Return the output wavefunction of the circuit.
+
+        :param form: The str indicating the form of the output wavefunction.
+            "default": [-1], "ket": [-1, 1], "bra": [1, -1]
+        :type form: str, optional
+        :return: Tensor with the corresponding shape.
+        :rtype: Tensor
+        """
+        if form == "default":
+            shape = [-1]
+        elif form == "ket":
+            shape = [-1, 1]
+        elif form == "bra":  # no conj here
+            shape = [1, -1]
+        return backend.reshape(self._state, shape=shape)
+
+    state = wavefunction
+
+    def matrix(self) -> Tensor:
+        """
+        Get the unitary matrix for the circuit irrespective with the circuit input state.
+
+        :return: The circuit unitary matrix
+        :rtype: Tensor
+        """
+        n = self._nqubits
+        u = backend.eye(2**n, dtype=dtypestr)
+        u = self._replay(backend.reshape(u, [2 for _ in range(n)] + [2**n]))
+        return backend.reshape(u, [2**n, 2**n])
+
+    def get_quoperator(self) -> QuOperator:
+        """
+        Get the ``QuOperator`` representation of the circuit unitary, which is dense for ``StateCircuit``.
+
+        :return: ``QuOperator`` object for the circuit unitary (open indices for the input state)
+        :rtype: QuOperator
+        """
+        n = self._nqubits
+        u = backend.reshape(self.matrix(), [2 for _ in range(2 * n)])
+        return QuOperator.from_tensor(u, list(range(n)), list(range(n, 2 * n)))
+
+    quoperator = get_quoperator
+    get_circuit_as_quoperator = get_quoperator
+
+    def expectation(
+        self,
+        *ops: Tuple[tn.Node, List[int]],
+        reuse: bool = True,
+        enable_lightcone: bool = False,
+        noise_conf: Optional[Any] = None,
+        nmc: int = 1000,
+        status: Optional[Tensor] = None,
+        **kws: Any,
+    ) -> Tensor:
+        """
+        Compute the expectation of corresponding operators,
+        the operators are applied on the state tensor directly.
+
+        :Example:
+
+        >>> c = tc.StateCircuit(2)
+        >>> c.H(0)
+        >>> c.expectation((tc.gates.z(), [0]))
+        array(0.+0.j, dtype=complex64)
+
+        :param ops: Operator and its position on the circuit,
+            eg. ``(tc.gates.z(), [1, ]), (tc.gates.x(), [2, ])`` is for operator :math:`Z_1X_2`.
+        :type ops: Tuple[tn.Node, List[int]]
+        :param reuse: kept for API compatibility with :py:meth:`Circuit.expectation`, no effect
+        :type reuse: bool, optional
+        :param enable_lightcone: kept for API compatibility with :py:meth:`Circuit.expectation`, no effect
+        :type enable_lightcone: bool, optional
+        :param noise_conf: Noise Configuration, defaults to None
+        :type noise_conf: Optional[NoiseConf], optional
+        :param nmc: repetition time for Monte Carlo sampling for noisfy calculation, defaults to 1000
+        :type nmc: int, optional
+        :param status: external randomness given by tensor uniformly from [0, 1], defaults to None,
+            used for noisfy circuit sampling
+        :type status: Optional[Tensor], optional
+        :raises ValueError: "Cannot measure two operators in one index"
+        :return: Tensor with one element
+        :rtype: Tensor
+        """
+        if noise_conf is not None:
+            return super().expectation(
+                *ops, noise_conf=noise_conf, nmc=nmc, status=status, **kws
+            )
+        t = self._state
+        occupied = set()
+        for op, index in ops:
+            if isinstance(op, tn.Node):
+                op = op.tensor
+            op = backend.cast(op, dtype=dtypestr)
+            if isinstance(index, int):
+                index = [index]
+            index = tuple([i if i >= 0 else self._nqubits + i for i in index])  # type: ignore
+            for e in index:
+                if e in occupied:
+                    raise ValueError("Cannot measure two operators in one index")
+                occupied.add(e)
+            t = apply_gate_tensor(t, op, index)
+        return backend.sum(backend.conj(self._state) * t)
+
+
+def _apply_kraus(
+    state: Tensor, kraus: Sequence[Tensor], index: Sequence[int], nqubits: int
+) -> Tensor:
+    """
+    Apply the channel :math:`\\sum_k K_k\\rho K_k^\\dagger` on the density matrix tensor,
+    where the first ``nqubits`` axes are for the ket and the last ``nqubits`` axes for the bra.
+    """
+    bra_index = [i + nqubits for i in index]
+    r = None
+    for k in kraus:
+        t = apply_gate_tensor(state, k, index)
+        t = apply_gate_tensor(t, backend.conj(k), bra_index)
+        r = t if r is None else r + t
+    return r
+
+
+def _blocks(state: Tensor, index: int, nqubits: int) -> Tuple[Tensor, ...]:
+    # the four blocks rho_00, rho_01, rho_10, rho_11 on the qubit ``index``
+    t = backend.reshape(
+        state,
+        [2**index, 2, 2 ** (nqubits - 1), 2, 2 ** (nqubits - 1 - index)],
+    )
+    return t[:, 0, :, 0, :], t[:, 0, :, 1, :], t[:, 1, :, 0, :], t[:, 1, :, 1, :]
+
+
+def _from_blocks(blocks: Sequence[Tensor], nqubits: int) -> Tensor:
+    a, b, c, d = blocks
+    t = backend.stack(
+        [backend.stack([a, b], axis=2), backend.stack([c, d], axis=2)], axis=1
+    )
+    return backend.reshape(t, [2 for _ in range(2 * nqubits)])
+
+
+def _depolarizing_blocks(
+    a: Tensor, b: Tensor, c: Tensor, d: Tensor, px: Tensor, py: Tensor, pz: Tensor
+) -> Tuple[Tensor, ...]:
+    p0 = 1.0 - px - py - pz
+    return (
+        (p0 + pz) * a + (px + py) * d,
+        (p0 - pz) * b + (px - py) * c,
+        (p0 - pz) * c + (px - py) * b,
+        (p0 + pz) * d + (px + py) * a,
+    )
+
+
+def _amplitudedamping_blocks(
+    a: Tensor, b: Tensor, c: Tensor, d: Tensor, gamma: Tensor, p: Tensor
+) -> Tuple[Tensor, ...]:
+    s = backend.sqrt(1.0 - gamma)
+    return (
+        a + p * gamma * d - (1.0 - p) * gamma * a,
+        s * b,
+        s * c,
+        d - p * gamma * d + (1.0 - p) * gamma * a,
+    )
+
+
+def _phasedamping_blocks(
+    a: Tensor, b: Tensor, c: Tensor, d: Tensor, gamma: Tensor
+) -> Tuple[Tensor, ...]:
+    s = backend.sqrt(1.0 - gamma)
+    return a, s * b, s * c, d
+
+
+def _reset_blocks(a: Tensor, b: Tensor, c: Tensor, d: Tensor) -> Tuple[Tensor, ...]:
+    return a + d, 0.0 * b, 0.0 * c, 0.0 * d
+
+
+# single qubit channels in ``tc.channels`` applied as elementwise updates on the blocks
+_channel_blocks: Dict[str, Any] = {
+    "depolarizing": _depolarizing_blocks,
+    "amplitudedamping": _amplitudedamping_blocks,
+    "phasedamping": _phasedamping_blocks,
+    "reset": _reset_blocks,
+}
+
+
+class DMStateCircuit(DMCircuit2):
+    """
+    ``DMStateCircuit`` class, the dense density matrix simulator sharing the same API as
+    :py:class:`DMCircuit`, where gates are applied immediately as :math:`U\\rho U^\\dagger`
+    and channels as :math:`\\sum_k K_k\\rho K_k^\\dagger` on the :math:`2n`-leg density matrix tensor
+    instead of being attached to a tensor network as superoperators.
+    Depolarizing, amplitude damping, phase damping and reset channels are applied
+    as elementwise updates on the :math:`2\\times 2` blocks of the qubit.
+
+    :Example:
+
+    >>> c = tc.DMStateCircuit(2)
+    >>> c.H(0)
+    >>> c.depolarizing(0, px=0.1, py=0.1, pz=0.1)
+    >>> c.expectation_ps(x=[0])
+    array(0.6+0.j, dtype=complex64)
+    """
+
+    def __init__(
+        self,
+        nqubits: int,
+        empty: bool = False,
+        inputs: Optional[Tensor] = None,
+        mps_inputs: Optional[QuOperator] = None,
+        dminputs: Optional[Tensor] = None,
+        mpo_dminputs: Optional[QuOperator] = None,
+        split: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Dense density matrix simulator based circuit.
+
+        :param nqubits: Number of qubits
+        :type nqubits: int
+        :param empty: kept for API compatibility with :py:class:`DMCircuit`, no effect
+        :type empty: bool, optional
+        :param inputs: the state input for the circuit, defaults to None
+        :type inputs: Optional[Tensor], optional
+        :param mps_inputs: QuVector for a MPS like initial pure state.
+        :type mps_inputs: Optional[QuOperator]
+        :param dminputs: the density matrix input for the circuit, defaults to None
+        :type dminputs: Optional[Tensor], optional
+        :param mpo_dminputs: QuOperator for a MPO like initial density matrix.
+        :type mpo_dminputs: Optional[QuOperator]
+        :param split: kept for API compatibility with :py:class:`DMCircuit`, no effect
+        :type split: Optional[Dict[str, Any]]
+        """
+        super().__init__(nqubits, empty=True, split=split)
+        self.inputs = inputs
+        self.dminputs = dminputs
+        self.mps_inputs = mps_inputs
+        self.mpo_dminputs = mpo_dminputs
+        self.circuit_param.update(
+            {
+                "inputs": inputs,
+                "mps_inputs": mps_inputs,
+                "dminputs": dminputs,
+                "mpo_dminputs": mpo_dminputs,
+            }
+        )
+        if inputs is not None:
+            self._state = self._inputs_state(inputs)
+        elif mps_inputs is not None:
+            self._state = self._inputs_state(mps_inputs.eval())
+        elif dminputs is not None:
+            self._state = self._inputs_state(dminputs)
+        elif mpo_dminputs is not None:
+            self._state = self._inputs_state(mpo_dminputs.eval_matrix())
+        else:
+            inputs = np.zeros([2**nqubits], dtype=npdtype)
+            inputs[0] = 1.0
+            self._state = self._inputs_state(inputs)
+        self._node: Optional[tn.Node] = None
+        self._node_state: Optional[Tensor] = None
+        # the operations on the density matrix, replayed for new inputs
+        self._ops: List[Callable[[Tensor], Tensor]] = []
+
+    def _inputs_state(self, inputs: Tensor) -> Tensor:
+        # pure state or density matrix inputs to the 2n-leg density matrix tensor
+        inputs = backend.convert_to_tensor(inputs)
+        inputs = backend.cast(inputs, dtype=dtypestr)
+        inputs = backend.reshape(inputs, [-1])
+        n = self._nqubits
+        if inputs.shape[0] == 2**n:
+            inputs = backend.outer_product(inputs, backend.conj(inputs))
+        assert backend.sizen(inputs) == 4**n
+        return backend.reshape(inputs, [2 for _ in range(2 * n)])
+
+    def _state_node(self) -> tn.Node:
+        if self._node is None or self._node_state is not self._state:
+            self._node = Gate(self._state)
+            self.coloring_nodes([self._node])
+            self._node_state = self._state
+        return self._node
+
+    @property
+    def _nodes(self) -> List[tn.Node]:  # type: ignore
+        return [self._state_node()]
+
+    @property
+    def _front(self) -> List[tn.Edge]:  # type: ignore
+        return list(self._state_node().edges)
+
+    def _copy(
+        self, conj: Optional[bool] = False
+    ) -> Tuple[List[tn.Node], List[tn.Edge]]:
+        state = backend.conj(self._state) if conj else self._state
+        n = Gate(state)
+        self.coloring_nodes([n], is_dagger=bool(conj))
+        return [n], list(n.edges)
+
+    def _copy_state_tensor(
+        self, conj: bool = False, reuse: bool = True
+    ) -> Tuple[List[tn.Node], List[tn.Edge]]:
+        return self._copy(conj)
+
+    _copy_dm_tensor = _copy_state_tensor
+
+    def _contract(self) -> None:
+        pass
+
+    def _apply_op(self, op: Callable[[Tensor], Tensor]) -> None:
+        self._ops.append(op)
+        self._state = op(self._state)
+
+    def apply_general_gate(
+        self,
+        gate: Union[Gate, QuOperator],
+        *index: int,
+        name: Optional[str] = None,
+        split: Optional[Dict[str, Any]] = None,
+        mpo: bool = False,
+        ir_dict: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if name is None:
+            name = ""
+        gate_dict = {
+            "gate": gate,
+            "index": index,
+            "name": name,
+            "split": split,
+            "mpo": mpo,
+        }
+        if ir_dict is not None:
+            ir_dict.update(gate_dict)
+        else:
+            ir_dict = gate_dict
+        self._qir.append(ir_dict)
+        assert len(index) == len(set(index))
+        index = tuple([i if i >= 0 else self._nqubits + i for i in index])
+        u = StateCircuit._gate_tensor(gate, mpo)
+        self._apply_op(lambda s: _apply_kraus(s, [u], index, self._nqubits))
+
+    apply = apply_general_gate
+
+    def apply_general_kraus(
+        self, kraus: Sequence[Gate], *index: int, **kws: Any
+    ) -> None:
+        kraus = [
+            k.tensor
+            if isinstance(k, tn.Node)
+            else backend.cast(backend.convert_to_tensor(k), dtypestr)
+            for k in kraus
+        ]
+        if not isinstance(
+            index[0], int
+        ):  # try best to be compatible with DMCircuit interface
+            index = index[0][0]
+        index = tuple([i if i >= 0 else self._nqubits + i for i in index])
+        self._apply_op(lambda s: _apply_kraus(s, kraus, index, self._nqubits))
+
+    general_kraus = apply_general_kraus
+
+    def _apply_channel_blocks(
+        self, f: Callable[..., Tuple[Tensor, ...]], index: int, **vars: Any
+    ) -> None:
+        n = self._nqubits
+        index = index if index >= 0 else n + index
+        vars = {
+            k: backend.cast(backend.convert_to_tensor(v), dtypestr)
+            for k, v in vars.items()
+        }
+        self._apply_op(
+            lambda s: _from_blocks(f(*_blocks(s, index, n), **vars), n)  # type: ignore
+        )
+
+    @staticmethod
+    def apply_general_kraus_delayed(
+        krausf: Callable[..., Sequence[Gate]]
+    ) -> Callable[..., None]:
+        f = _channel_blocks.get(krausf.__name__[: -len("channel")], None)
+
+        def apply(self: "DMStateCircuit", *index: int, **vars: float) -> None:
+            for key in ["status", "name"]:
+                if key in vars:
+                    del vars[key]
+            if f is not None and len(index) == 1:
+                self._apply_channel_blocks(f, index[0], **vars)
+            else:
+                self.apply_general_kraus(krausf(**vars), *index)
+
+        return apply
+
+    def replace_inputs(self, inputs: Tensor) -> None:
+        """
+        Replace the input state (or density matrix) with the circuit structure unchanged,
+        the gates and channels are reapplied on the new input.
+
+        :param inputs: Input wavefunction or density matrix.
+        :type inputs: Tensor
+        """
+        state = self._inputs_state(inputs)
+        for op in self._ops:
+            state = op(state)
+        self._state = state
+
+    def densitymatrix(self, check: bool = False, reuse: bool = True) -> Tensor:
+        """
+        Return the output density matrix of the circuit.
+
+        :param check: check whether the final return is a legal density matrix, defaults to False
+        :type check: bool, optional
+        :param reuse: kept for API compatibility with :py:class:`DMCircuit`, no effect
+        :type reuse: bool, optional
+        :return: The output densitymatrix in 2D shape tensor form
+        :rtype: Tensor
+        """
+        dm = backend.reshape(self._state, [2**self._nqubits, 2**self._nqubits])
+        if check:
+            self.check_density_matrix(dm)
+        return dm
+
+    state = densitymatrix
+
+    def expectation(
+        self,
+        *ops: Tuple[tn.Node, List[int]],
+        reuse: bool = True,
+        noise_conf: Optional[Any] = None,
+        status: Optional[Tensor] = None,
+        **kws: Any,
+    ) -> Tensor:
+        """
+        Compute the expectation :math:`\\mathrm{Tr}(O\\rho)` of corresponding operators,
+        the operators are applied on the density matrix tensor directly.
+
+        :param ops: Operator and its position on the circuit,
+            eg. ``(tc.gates.z(), [1, ]), (tc.gates.x(), [2, ])`` is for operator :math:`Z_1X_2`.
+        :type ops: Tuple[tn.Node, List[int]]
+        :param reuse: kept for API compatibility with :py:class:`DMCircuit`, no effect
+        :type reuse: bool
+        :param noise_conf: Noise Configuration, defaults to None
+        :type noise_conf: Optional[NoiseConf], optional
+        :param status: external randomness given by tensor uniformly from [0, 1], defaults to None,
+            used for noisfy circuit sampling
+        :type status: Optional[Tensor], optional
+        :raises ValueError: "Cannot measure two operators in one index"
+        :return: Tensor with one element
+        :rtype: Tensor
+        """
+        if noise_conf is not None:
+            return super().expectation(
+                *ops, noise_conf=noise_conf, status=status, **kws
+            )
+        t = self._state
+        occupied = set()
+        for op, index in ops:
+            if isinstance(op, tn.Node):
+                op = op.tensor
+            op = backend.cast(op, dtype=dtypestr)
+            if isinstance(index, int):
+                index = [index]
+            index = tuple([i if i >= 0 else self._nqubits + i for i in index])  # type: ignore
+            for e in index:
+                if e in occupied:
+                    raise ValueError("Cannot measure two operators in one index")
+                occupied.add(e)
+            t = apply_gate_tensor(t, op, index)
+        return backend.trace(
+            backend.reshape(t, [2**self._nqubits, 2**self._nqubits])
+        )
+
+
+DMStateCircuit._meta_apply_channels()
@@ -7,7 +7,7 @@ from typing import Any
 
 from ..circuit import Circuit
 from ..cons import backend, dtypestr
-from ..quantum import QuOperator
+from ..quantum import QuOperator, PauliSumOperator
 from .. import gates as G
 
 Tensor = Any
@@ -154,7 +154,8 @@ parameterized_local_measurements = any_local_measurements
 
 def operator_expectation(c: Circuit, hamiltonian: Any) -> Tensor:
     """
-    Evaluate Hamiltonian expectation where ``hamiltonian`` can be dense matrix, sparse matrix or MPO.
+    Evaluate Hamiltonian expectation where ``hamiltonian`` can be dense matrix, sparse matrix, MPO
+    or matrix-free :py:class:`tensorcircuit.quantum.PauliSumOperator`.
 
     :param c: The circuit whose output state is used to evaluate the expectation
     :type c: Circuit
@@ -165,6 +166,10 @@ def operator_expectation(c: Circuit, hamiltonian: Any) -> Tensor:
     """
     if isinstance(hamiltonian, QuOperator):
         return mpo_expectation(c, hamiltonian)
+    elif isinstance(hamiltonian, PauliSumOperator):
+        w = c.state()
+        e = backend.sum(backend.conj(w) * hamiltonian.matvec(w))
+        return backend.real(e)
     elif backend.is_sparse(hamiltonian):
         return sparse_expectation(c, hamiltonian)
     else:
@@ -4,6 +4,7 @@ Circuit object translation in different packages
 
 from typing import Any, Dict, List, Optional, Tuple, Union, Sequence
 from copy import deepcopy
+import json
 import logging
 import numpy as np
 
@@ -611,7 +612,6 @@ def qir2json(
     logger.warning(
         "experimental feature subject to fast protocol and implementation change, try on your own risk"
     )
-    qir = deepcopy(qir)
     tcqasm = []
     for r in qir:
         if r["mpo"] is True:
@@ -623,9 +623,7 @@ def qir2json(
             uparams = list(gates.get_u_parameter(backend.numpy(nm)))
         else:
             uparams = []
-        params = r.get("parameters", {})
-        for k, v in params.items():
-            params[k] = tensor_to_json(v)
+        params = {k: tensor_to_json(v) for k, v in r.get("parameters", {}).items()}
 
         ditem = {
             "name": r["gatef"].n,
@@ -683,6 +681,174 @@ def json2qir(tcqasm: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return qir
 
 
+# numpy dtype kind of the parameters -> int code in ``qir2array``
+_array_kinds = {"b": 0, "i": 0, "u": 1, "f": 2, "c": 3}
+
+
+def qir2array(
+    qir: List[Dict[str, Any]], nqubits: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    transform qir to the compact struct-of-arrays form, where each gate is an opcode
+    (index into the gate name table), its qubits and parameters are stored as slices of
+    flat arrays delimited by offset arrays (CSR-like), so that the circuit can be saved
+    and loaded as a single binary ``.npz`` file without per gate text parsing.
+    Custom gate names and split rules are kept (sparsely), so that the round trip
+    matches ``from_qir(to_qir())``.
+
+    :Example:
+
+    >>> c = tc.Circuit(2)
+    >>> c.h(0)
+    >>> c.rx(1, theta=0.2)
+    >>> arrays = tc.translation.qir2array(c.to_qir())
+    >>> arrays["names"], arrays["opcodes"], arrays["qubits"]
+    (array(['h', 'rx'], dtype='<U2'), array([0, 1], dtype=int32), array([0, 1], dtype=int32))
+
+    :param qir: the quantum intermediate representation of the circuit
+    :type qir: List[Dict[str, Any]]
+    :param nqubits: the number of qubits recorded in the arrays,
+        defaults to None, inferred from the qir
+    :type nqubits: Optional[int], optional
+    :raises ValueError: if a gate has no gate function in ``tc.gates`` (e.g. a bare ``apply_general_gate``)
+        or its split rule is not json serializable
+    :return: dict of numpy arrays, see :py:func:`array2qir` for the inverse
+    :rtype: Dict[str, Any]
+    """
+    names: Dict[str, int] = {}
+    keys: Dict[str, int] = {}
+    opcodes, flags, qubits, qubit_ptr = [], [], [], [0]
+    param_ptr, param_keys, param_kinds = [0], [], []
+    shapes, shape_ptr, values, value_ptr = [], [0], [], [0]
+    # custom gate names and split rules are rare, stored sparsely by gate position
+    label_gates, labels, split_gates, splits = [], [], [], []
+    for i, d in enumerate(qir):
+        gatef = d.get("gatef", None)
+        if gatef is None or not hasattr(gates, getattr(gatef, "n", "")):
+            raise ValueError(
+                "gate %s at position %s has no gate function in `tc.gates`, "
+                "which cannot be represented in the array form" % (d.get("name"), i)
+            )
+        opcodes.append(names.setdefault(gatef.n, len(names)))
+        if d.get("name", gatef.n) != gatef.n:
+            label_gates.append(i)
+            labels.append(d["name"])
+        if d.get("split", None) is not None:
+            split_gates.append(i)
+            try:
+                splits.append(json.dumps(d["split"]))
+            except TypeError as e:
+                raise ValueError(
+                    "split rule of gate %s at position %s is not json serializable"
+                    % (d.get("name"), i)
+                ) from e
+        qubits.extend(d["index"])
+        qubit_ptr.append(len(qubits))
+        params = d.get("parameters", None)
+        flags.append(int(d["mpo"]) + 2 * int(params is not None))
+        for k, v in (params or {}).items():
+            if not isinstance(v, (int, float, complex, list, tuple)):
+                v = tensor_to_numpy(v)
+            v = np.asarray(v)
+            param_keys.append(keys.setdefault(k, len(keys)))
+            param_kinds.append(_array_kinds[v.dtype.kind])
+            shapes.extend(v.shape)
+            shape_ptr.append(len(shapes))
+            values.append(v.reshape([-1]))
+            value_ptr.append(value_ptr[-1] + v.size)
+        param_ptr.append(len(param_keys))
+    if nqubits is None:
+        nqubits = max(qubits) + 1 if qubits else 0
+    return {
+        "nqubits": np.array(nqubits, dtype=np.int64),
+        "names": np.array(list(names), dtype=str),
+        "opcodes": np.array(opcodes, dtype=np.int32),
+        "flags": np.array(flags, dtype=np.int8),
+        "qubits": np.array(qubits, dtype=np.int32),
+        "qubit_ptr": np.array(qubit_ptr, dtype=np.int64),
+        "param_names": np.array(list(keys), dtype=str),
+        "param_ptr": np.array(param_ptr, dtype=np.int64),
+        "param_keys": np.array(param_keys, dtype=np.int32),
+        "param_kinds": np.array(param_kinds, dtype=np.int8),
+        "shapes": np.array(shapes, dtype=np.int64),
+        "shape_ptr": np.array(shape_ptr, dtype=np.int64),
+        "values": (
+            np.concatenate(values).astype(np.complex128)
+            if values
+            else np.zeros([0], dtype=np.complex128)
+        ),
+        "value_ptr": np.array(value_ptr, dtype=np.int64),
+        "label_gates": np.array(label_gates, dtype=np.int64),
+        "labels": np.array(labels, dtype=str),
+        "split_gates": np.array(split_gates, dtype=np.int64),
+        "splits": np.array(splits, dtype=str),
+    }
+
+
+def array2qir(arrays: Dict[str, Any], with_gates: bool = True) -> List[Dict[str, Any]]:
+    """
+    transform the compact struct-of-arrays form from :py:func:`qir2array` back to qir
+
+    :param arrays: dict of numpy arrays (or a loaded ``.npz`` file)
+    :type arrays: Dict[str, Any]
+    :param with_gates: whether to build the gate tensors (the ``"gate"`` entries), defaults to True,
+        False for the qir only replayed by ``gatef`` and ``parameters`` such as in ``from_qir``
+    :type with_gates: bool, optional
+    :return: the quantum intermediate representation of the circuit
+    :rtype: List[Dict[str, Any]]
+    """
+    # one bulk conversion of each array to python objects instead of per gate numpy indexing
+    names = [getattr(gates, n) for n in arrays["names"].tolist()]
+    keys = arrays["param_names"].tolist()
+    opcodes = arrays["opcodes"].tolist()
+    flags = arrays["flags"].tolist()
+    qubits = arrays["qubits"].tolist()
+    qubit_ptr = arrays["qubit_ptr"].tolist()
+    param_ptr = arrays["param_ptr"].tolist()
+    param_keys = arrays["param_keys"].tolist()
+    param_kinds = arrays["param_kinds"].tolist()
+    shapes = arrays["shapes"].tolist()
+    shape_ptr = arrays["shape_ptr"].tolist()
+    values = arrays["values"]
+    value_ptr = arrays["value_ptr"].tolist()
+    dtypes = [np.int64, np.int64, np.float64, np.complex128]
+    fixed: Dict[int, Any] = {}
+    qir = []
+    for i, op in enumerate(opcodes):
+        gatef = names[op]
+        d = {
+            "gatef": gatef,
+            "index": tuple(qubits[qubit_ptr[i] : qubit_ptr[i + 1]]),
+            "name": gatef.n,
+            "split": None,
+            "mpo": bool(flags[i] & 1),
+        }
+        if flags[i] & 2:
+            params = {}
+            for j in range(param_ptr[i], param_ptr[i + 1]):
+                v = values[value_ptr[j] : value_ptr[j + 1]]
+                if param_kinds[j] < 3:
+                    v = np.real(v)
+                params[keys[param_keys[j]]] = v.astype(dtypes[param_kinds[j]]).reshape(
+                    shapes[shape_ptr[j] : shape_ptr[j + 1]]
+                )
+            d["parameters"] = params
+            if with_gates:
+                d["gate"] = gatef(**params)
+        elif with_gates:
+            # fixed gates share the same tensor
+            if op not in fixed:
+                fixed[op] = gatef().tensor
+            d["gate"] = gates.Gate(fixed[op], name=gatef.n)
+        qir.append(d)
+    if "label_gates" in arrays:  # absent in the arrays from earlier versions
+        for i, label in zip(arrays["label_gates"].tolist(), arrays["labels"].tolist()):
+            qir[i]["name"] = label
+        for i, split in zip(arrays["split_gates"].tolist(), arrays["splits"].tolist()):
+            qir[i]["split"] = json.loads(split)
+    return qir
+
+
 def eqasm2tc(
     eqasm: str, nqubits: Optional[int] = None, headers: Tuple[int, int] = (6, 1)
 ) -> Circuit:
@@ -21,6 +21,23 @@ def gpu_memory_share(flag: bool = True) -> None:
         os.environ["XLA_PYTHON_CLIENT_PREALLOCATE"] = "true"
 
 
+def get_cache_dir() -> str:
+    """
+    Get (and create if necessary) the directory for tensorcircuit on-disk caches,
+    which can be customized by the environment variable ``TENSORCIRCUIT_CACHE_DIR``,
+    defaults to ``~/.cache/tensorcircuit``
+
+    :return: the cache directory
+    :rtype: str
+    """
+    cache_dir = os.environ.get(
+        "TENSORCIRCUIT_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "tensorcircuit"),
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
 def return_partial(
     f: Callable[..., Any], return_argnums: Union[int, Sequence[int]] = 0
 ) -> Callable[..., Any]:
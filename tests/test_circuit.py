@@ -2,9 +2,11 @@
 
 import sys
 import os
+import threading
 from functools import partial
 import numpy as np
 import opt_einsum as oem
+import tensornetwork as tn
 import pytest
 from pytest_lazyfixture import lazy_fixture as lf
 
@@ -769,6 +771,278 @@ def test_debug_contract():
     np.testing.assert_allclose(small_tn(), np.zeros([2**n]), atol=1e-5)
 
 
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_contraction_path_cache(backend, tmp_path):
+    ncalls = [0]
+
+    def counted_greedy(inputs, output, size, **kws):
+        ncalls[0] += 1
+        return oem.paths.greedy(inputs, output, size, **kws)
+
+    def energy(theta):
+        c = tc.Circuit(5)
+        for i in range(5):
+            c.rx(i, theta=theta)
+        for i in range(4):
+            c.cnot(i, i + 1)
+        for i in range(5):
+            c.ry(i, theta=theta)
+        return c.expectation_ps(z=[0, 1])
+
+    filename = str(tmp_path / "paths.sqlite")
+    cache = tc.cons.PathCache(maxsize=8, persist=filename)
+    with tc.runtime_contractor("custom", optimizer=counted_greedy, path_cache=cache):
+        e1 = energy(0.2)
+        e2 = energy(0.2)
+        e3 = energy(0.5)
+    assert ncalls[0] == 1
+    assert cache.hits == 2 and cache.misses == 1
+    np.testing.assert_allclose(e1, e2, atol=1e-5)
+    np.testing.assert_allclose(e3, energy(0.5), atol=1e-5)
+
+    # a new cache (i.e. a new process) loads the path from disk
+    cache2 = tc.cons.PathCache(persist=filename)
+    with tc.runtime_contractor("custom", optimizer=counted_greedy, path_cache=cache2):
+        energy(0.7)
+    assert ncalls[0] == 1
+    assert len(cache2) == 1
+
+
+def test_network_fingerprint():
+    c1 = tc.Circuit(3)
+    c1.rx(0, theta=0.2)
+    c1.cnot(0, 1)
+    c2 = tc.Circuit(3)
+    c2.rx(0, theta=0.7)
+    c2.cnot(0, 1)
+    c3 = tc.Circuit(3)
+    c3.rx(0, theta=0.2)
+    c3.cnot(1, 2)
+    f1 = tc.cons.network_fingerprint(c1._nodes)
+    assert f1 == tc.cons.network_fingerprint(c2._nodes)
+    assert f1 != tc.cons.network_fingerprint(c3._nodes)
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_sliced_contraction(backend):
+    n = 6
+
+    def f(param):
+        c = tc.Circuit(n)
+        for j in range(3):
+            for i in range(n):
+                c.rx(i, theta=param[j, i])
+            for i in range(n):
+                c.cz(i, (i + 1) % n)
+        return c
+
+    param = tc.backend.convert_to_tensor(np.random.normal(size=[3, n]))
+    param = tc.backend.cast(param, "float32")
+    s0 = f(param).state()
+    e0 = f(param).expectation_ps(z=[0, 3])
+    a0 = f(param).amplitude("011010")
+    for chunk in [None, 4]:
+        with tc.runtime_contractor("greedy", max_size=2**7, slice_chunk=chunk):
+            np.testing.assert_allclose(f(param).state(), s0, atol=1e-5)
+            np.testing.assert_allclose(f(param).expectation_ps(z=[0, 3]), e0, atol=1e-5)
+            np.testing.assert_allclose(f(param).amplitude("011010"), a0, atol=1e-5)
+
+    if tc.backend.name != "numpy":
+
+        def g(param):
+            return tc.backend.real(f(param).expectation_ps(z=[0, 3]))
+
+        g0 = tc.backend.grad(g)(param)
+        with tc.runtime_contractor("greedy", max_size=2**7, slice_chunk=4):
+            g1 = tc.backend.jit(tc.backend.grad(g))(param)
+        np.testing.assert_allclose(g0, g1, atol=1e-4)
+
+
+def test_sliced_contraction_process_pool(npb):
+    c = tc.Circuit(6)
+    for j in range(3):
+        for i in range(6):
+            c.rx(i, theta=0.3 * i + j)
+        for i in range(j % 2, 5, 2):
+            c.rzz(i, i + 1, theta=0.2 * j + 0.1)
+    e0 = c.expectation_ps(z=[0, 3])
+    s0 = c.state()
+    with tc.runtime_contractor("greedy", max_size=2**4, slice_workers=2):
+        np.testing.assert_allclose(c.expectation_ps(z=[0, 3]), e0, atol=1e-5)
+    with tc.runtime_contractor("greedy", max_size=2**6, slice_workers=2):
+        np.testing.assert_allclose(c.state(), s0, atol=1e-5)
+
+
+def test_get_slices():
+    c = tc.Circuit(6)
+    for i in range(6):
+        c.h(i)
+    for i in range(5):
+        c.cnot(i, i + 1)
+    nodes = c.expectation_before([tc.gates.z(), [0]], reuse=False)
+    nodes = list(nodes)
+    input_lists = [[id(e) for e in node.edges] for node in nodes]
+    size_dict = {id(e): e.dimension for e in tn.get_all_edges(nodes)}
+    inputs = [set(l) for l in input_lists]
+    path = oem.paths.greedy(inputs, set(), size_dict)
+    sliced = tc.cons.get_slices(input_lists, [], path, size_dict, 2**3)
+    assert len(sliced) > 0
+    size_dict.update({i: 1 for i in sliced})
+    assert max([s for s, _ in tc.cons._path_sizes(input_lists, path, size_dict)]) <= 8
+
+
+def test_contraction_report():
+    c = tc.Circuit(8)
+    for i in range(8):
+        c.h(i)
+    for i in range(7):
+        c.cnot(i, i + 1)
+    r = c.contraction_report()
+    assert r.peak_size == 2**8
+    assert len(r.sizes) == len(r.path)
+    assert r.write == sum(r.sizes)
+    assert r.flops >= r.write
+    r = c.contraction_report("expectation", ops=[(tc.gates.z(), [2])])
+    assert r.peak_size < 2**8
+    assert c.contraction_report("amplitude", l="01" * 4).to_dict()["nslices"] == 1
+    with tc.runtime_contractor("greedy", max_size=2**3):
+        rs = c.contraction_report("expectation", ops=[(tc.gates.z(), [2])])
+    assert rs.peak_size <= 2**3
+    assert rs.nslices == 2 ** len(rs.sliced)
+    with tc.runtime_contractor("plain"):
+        with pytest.raises(ValueError):
+            c.contraction_report()
+    with pytest.raises(ValueError):
+        c.contraction_report("unknown")
+    # the report describes the preprocessed network really contracted
+    with tc.runtime_contractor("greedy", preprocessing=True):
+        rp = c.contraction_report()
+    with tc.runtime_contractor("greedy", preprocessing=False):
+        rn = c.contraction_report()
+    assert len(rp.path) < len(rn.path)
+    # dry run leaves the circuit intact
+    np.testing.assert_allclose(
+        tc.backend.numpy(c.amplitude("0" * 8)), 2 ** (-4), atol=1e-5
+    )
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("jaxb")])
+def test_contraction_hook(backend):
+    events = []
+    hook = tc.cons.add_contraction_hook(events.append)
+    try:
+        c = tc.Circuit(6)
+        for i in range(6):
+            c.h(i)
+        for i in range(5):
+            c.cnot(i, i + 1)
+        c.rx(2, theta=0.3)
+        c.state()
+        c.expectation_ps(z=[2])
+        c.amplitude("0" * 6)
+        c.sample(batch=4, allow_state=True)
+        with tc.cons.contraction_caller("custom"):
+            c.state()
+        r = c.contraction_report()
+        # the state is contracted first for expectation with reuse
+        assert list(dict.fromkeys([e["caller"] for e in events])) == [
+            "state",
+            "expectation",
+            "amplitude",
+            "sample",
+            "custom",
+        ]
+        e = events[0]
+        assert e["peak_size"] == r.peak_size == 2**6
+        assert e["flops"] >= e["peak_size"]
+        assert e["peak_bytes"] == 2**6 * 8
+        assert e["bytes"] >= e["peak_bytes"]
+        assert e["path_time"] >= 0 and e["contraction_time"] >= 0
+        assert e["backend"] == tc.backend.name
+        with tc.runtime_contractor("greedy", max_size=2**3):
+            c.expectation_ps(z=[2], reuse=False)
+        assert events[-1]["nslices"] > 1
+        assert events[-1]["peak_size"] <= 2**3
+        dmc = tc.DMCircuit(2)
+        dmc.h(0)
+        dmc.state()
+        assert events[-1]["caller"] == "densitymatrix"
+        # the caller tags of another thread do not leak into this one
+        with tc.cons.contraction_caller("other"):
+            t = threading.Thread(target=c.amplitude, args=("0" * 6,))
+            t.start()
+            t.join()
+        assert events[-1]["caller"] == "amplitude"
+    finally:
+        tc.cons.remove_contraction_hook(hook)
+    n = len(events)
+    c.state()
+    assert len(events) == n
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_fusion_contractor(backend):
+    n = 6
+    c = tc.Circuit(n)
+    for i in range(n):
+        c.h(i)
+    for j in range(4):
+        for i in range(j % 2, n - 1, 2):
+            c.rzz(i, i + 1, theta=0.1 * (i + j + 1))
+            c.ry(i + 1, theta=0.3)
+            c.cnot(i, i + 1)
+    s0 = c.state()
+    e0 = c.expectation_ps(x=[1], z=[3])
+    for w in [2, 3]:
+        with tc.runtime_contractor("greedy", fusion=w, preprocessing=True):
+            np.testing.assert_allclose(c.state(), s0, atol=1e-5)
+            np.testing.assert_allclose(c.expectation_ps(x=[1], z=[3]), e0, atol=1e-5)
+    nodes, _ = c._copy()
+    fused, _ = tc.cons._fuse_nodes(nodes, 2)
+    assert len(fused) < len(nodes)
+    assert max([len(node.edges) for node in fused]) <= 4
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb"), lf("torchb")])
+def test_incremental_state(backend):
+    n = 5
+    c1 = tc.Circuit(n, incremental=True)
+    c2 = tc.Circuit(n)
+    for c in [c1, c2]:
+        for i in range(n):
+            c.h(i)
+    for j in range(n - 1):
+        for c in [c1, c2]:
+            c.rzz(j, j + 1, theta=0.3 * j + 0.1)
+            c.exp1(0, 2, theta=0.2, unitary=tc.gates._xx_matrix)
+            c.rx(j, theta=0.2)
+        np.testing.assert_allclose(
+            c1.expectation_ps(z=[j]), c2.expectation_ps(z=[j]), atol=1e-5
+        )
+        np.testing.assert_allclose(c1.state(), c2.state(), atol=1e-5)
+    assert c1.state_tensor is not None
+    np.testing.assert_allclose(c1.matrix(), c2.matrix(), atol=1e-5)
+    for c in [c1, c2]:
+        c.mid_measurement(1, keep=1)
+    np.testing.assert_allclose(c1.state(), c2.state(), atol=1e-5)
+
+    def f(theta, incremental=True):
+        c = tc.Circuit(3, incremental=incremental)
+        c.h(0)
+        c.rx(1, theta=theta)
+        e = c.expectation_ps(z=[1])
+        c.cnot(1, 2)
+        c.ry(2, theta=theta)
+        return tc.backend.real(e + c.expectation_ps(z=[2]))
+
+    if tc.backend.name != "numpy":
+        theta = tc.backend.convert_to_tensor(0.3)
+        v1, g1 = tc.backend.jit(tc.backend.value_and_grad(f))(theta)
+        v2, g2 = tc.backend.value_and_grad(partial(f, incremental=False))(theta)
+        np.testing.assert_allclose(v1, v2, atol=1e-5)
+        np.testing.assert_allclose(g1, g2, atol=1e-5)
+
+
 @pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
 def test_teleportation(backend):
     key = tc.backend.get_random_state(42)
@@ -1258,6 +1532,52 @@ def test_batch_sample(backend):
     )
 
 
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_batch_perfect_sampling(backend):
+    c = tc.Circuit(4)
+    c.h(0)
+    c.cnot(0, 1)
+    c.rx(2, theta=0.6)
+    c.cnot(2, 3)
+    c.ry(3, theta=1.1)
+    probs = np.abs(tc.backend.numpy(c.state())) ** 2
+    key = tc.backend.get_random_state(42)
+    s, p = c.batch_perfect_sampling(2048, random_generator=key)
+    s = tc.backend.numpy(s).astype(np.int32)
+    ints = s @ np.array([8, 4, 2, 1])
+    np.testing.assert_allclose(tc.backend.numpy(p), probs[ints], atol=1e-5)
+    np.testing.assert_allclose(np.bincount(ints, minlength=16) / 2048, probs, atol=0.05)
+
+    # the jitted marginal is reused by circuits with the same structure
+    c2 = tc.Circuit(4)
+    c2.h(0)
+    c2.cnot(0, 1)
+    c2.rx(2, theta=0.2)
+    c2.cnot(2, 3)
+    c2.ry(3, theta=0.3)
+    nfuncs = len(tc.basecircuit._marginal_functions)
+    s, p = c2.batch_perfect_sampling(64, random_generator=key)
+    assert len(tc.basecircuit._marginal_functions) == nfuncs
+    ints = tc.backend.numpy(s).astype(np.int32) @ np.array([8, 4, 2, 1])
+    probs2 = np.abs(tc.backend.numpy(c2.state())) ** 2
+    np.testing.assert_allclose(tc.backend.numpy(p), probs2[ints], atol=1e-5)
+
+    status = np.random.uniform(size=[5, 2])
+    s1, p1 = c.batch_perfect_sampling(5, index=[2, 0], status=status)
+    for i in range(5):
+        s2, p2 = c.measure(2, 0, with_prob=True, status=status[i])
+        np.testing.assert_allclose(s1[i], s2, atol=1e-5)
+        np.testing.assert_allclose(p1[i], p2, atol=1e-5)
+
+    dmc = tc.DMCircuit(2)
+    dmc.h(0)
+    dmc.depolarizing(0, px=0.1, py=0.1, pz=0.1)
+    dmc.cnot(0, 1)
+    r = dmc.sample(batch=16, format="sample_bin", random_generator=key)
+    r = tc.backend.numpy(r)
+    np.testing.assert_allclose(r[:, 0], r[:, 1])
+
+
 def test_expectation_y_bug():
     c = tc.Circuit(1, inputs=1 / np.sqrt(2) * np.array([-1, 1.0j]))
     m = c.expectation_ps(y=[0])
@@ -1363,6 +1683,49 @@ def test_minus_index():
     np.testing.assert_allclose(tc.backend.real(c.expectation_ps(z=[-2])), 0, atol=1e-5)
 
 
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_expectation_ps_sum(backend):
+    n = 4
+    ls = [[1, 1, 0, 0], [3, 3, 0, 0], [2, 2, 0, 0], [0, 3, 1, 2], [3, 0, 0, 0]]
+    ls += [[0, 0, 0, 0], [1, 0, 1, 0], [0, 1, 0, 3]]
+    weight = [0.5, -1.0, 0.3, 1.2, 0.7, 2.0, -0.4, 0.9]
+    assert len(tc.quantum.qwc_groups(ls)) < len(ls)
+
+    def f(param, shots=None, key=None, is_dm=False):
+        c = tc.DMCircuit(n) if is_dm else tc.Circuit(n)
+        for i in range(n):
+            c.ry(i, theta=param[i])
+        for i in range(n - 1):
+            c.cnot(i, i + 1)
+        for i in range(n):
+            c.rx(i, theta=param[n + i])
+        return c, c.expectation_ps_sum(ls, weight, shots=shots, random_generator=key)
+
+    param = tc.backend.convert_to_tensor(np.linspace(0.1, 0.8, 2 * n))
+    c, (total, values) = f(param)
+    ref = []
+    for l in ls:
+        if any(l):
+            ref.append(tc.backend.real(c.expectation_ps(**tc.quantum.ps2xyz(l))))
+        else:
+            ref.append(1.0)
+    np.testing.assert_allclose(values, np.array(ref), atol=1e-5)
+    np.testing.assert_allclose(total, np.dot(weight, ref), atol=1e-5)
+
+    _, (total_dm, _) = f(param, is_dm=True)
+    np.testing.assert_allclose(total_dm, total, atol=1e-5)
+
+    key = tc.backend.get_random_state(42)
+    _, (_, values_sample) = f(param, shots=8192, key=key)
+    np.testing.assert_allclose(values_sample, np.array(ref), atol=0.06)
+
+    if tc.backend.name != "numpy":
+        vg = tc.backend.jit(tc.backend.value_and_grad(lambda p: f(p)[1][0]))
+        v, g = vg(param)
+        np.testing.assert_allclose(v, total, atol=1e-5)
+        assert tc.backend.shape_tuple(g) == (2 * n,)
+
+
 @pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
 def test_sexpps(backend):
     c = tc.Circuit(1, inputs=1 / np.sqrt(2) * np.array([1.0, 1.0j]))
@@ -1445,6 +1808,46 @@ def test_circuit_to_json(backend):
     np.testing.assert_allclose(c.state(), c2.state(), atol=1e-5)
 
 
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_circuit_to_npz(backend, tmp_path):
+    c = tc.Circuit(3)
+    c.h(0)
+    c.CNOT(1, 2)
+    c.rxx(0, 2, theta=0.3)
+    c.crx(0, 1, theta=-0.8)
+    c.r(1, theta=tc.backend.ones([]), alpha=0.2)
+    c.toffoli(0, 2, 1)
+    c.any(0, 1, unitary=tc.gates._xx_matrix * 1.0j)
+    c.multicontrol(1, 2, 0, ctrl=[0, 1], unitary=tc.gates._x_matrix)
+    c.rx(2, theta=0.1, name="rx-layer0")
+    c.exp1(
+        0, 1, theta=0.2, unitary=tc.gates._zz_matrix, split={"max_singular_values": 2}
+    )
+    c.to_npz(os.path.join(tmp_path, "c.npz"))
+    params = {"inputs": None}
+    c2 = tc.Circuit.from_npz(os.path.join(tmp_path, "c.npz"), params)
+    assert params == {"inputs": None}
+    assert c2.to_qir()[4]["parameters"]["alpha"] == 0.2
+    for d1, d2 in zip(c.to_qir(), c2.to_qir()):
+        assert d1["name"] == d2["name"]
+        assert d1["split"] == d2["split"]
+    np.testing.assert_allclose(c.state(), c2.state(), atol=1e-5)
+    arrays = tc.translation.qir2array(c.to_qir())
+    assert arrays["nqubits"] == 3
+    assert arrays["qubit_ptr"][-1] == 19
+    qir = tc.translation.array2qir(arrays)
+    assert [d["name"] for d in qir] == [d["name"] for d in c.to_qir()]
+    np.testing.assert_allclose(qir[4]["gate"].tensor, c.to_qir()[4]["gate"].tensor)
+    assert all(["gate" not in d for d in tc.translation.array2qir(arrays, False)])
+    c3 = tc.DMCircuit.from_qir(qir, {"nqubits": 4})
+    np.testing.assert_allclose(
+        c3.expectation_ps(z=[0]), c.expectation_ps(z=[0]), atol=1e-5
+    )
+    c.apply_general_gate(tc.gates.Gate(tc.gates._x_matrix), 0)
+    with pytest.raises(ValueError):
+        tc.translation.qir2array(c.to_qir())
+
+
 def test_gate_count():
     c = tc.Circuit(3)
     c.x(0)
@@ -1465,7 +1868,7 @@ def test_gate_count():
     # {'x': 1, 'h': 2, 'rx': 1, 'multicontrol': 1, 'toffoli': 3}
 
 
-def test_to_openqasm():
+def test_to_openqasm(tmp_path):
     c = tc.Circuit(3)
     c.H(0)
     c.rz(2, theta=0.2)
@@ -1479,8 +1882,8 @@ def test_to_openqasm():
     c1 = tc.Circuit.from_openqasm(s)
     print(c1.draw())
     np.testing.assert_allclose(c.state(), c1.state())
-    c.to_openqasm(filename="test.qasm")
-    c2 = tc.Circuit.from_openqasm_file("test.qasm")
+    c.to_openqasm(filename=str(tmp_path / "test.qasm"))
+    c2 = tc.Circuit.from_openqasm_file(str(tmp_path / "test.qasm"))
     np.testing.assert_allclose(c.state(), c2.state())
 
 
@@ -1493,9 +1896,86 @@ h q[0];
 measure q[1] -> c[1];
 measure q[0] -> c[0];"""
     c = tc.Circuit.from_openqasm(qasm_str)
-    c.to_openqasm().split("\n")[-2][-3] == "1"
+    assert c.to_openqasm().split("\n")[-2][-3] == "1"
+    c = tc.Circuit.from_openqasm(qasm_str, keep_measure_order=True)
+    assert c.to_openqasm().split("\n")[-2][-3] == "0"
+    c = tc.Circuit(1)
+    c.rx(0, theta=0.2)
+    c.u(0, theta=0.1, phi=-0.3, lbd=1.5)
+    assert "rx(0.2) q[0];" in c.to_openqasm()
+    assert "u3(0.1,-0.3,1.5) q[0];" in c.to_openqasm()
+
+
+def test_native_openqasm():
+    qasm_str = """OPENQASM 2.0;
+include "qelib1.inc";
+// custom gate with parameter expressions
+gate mygate(a, b) x, y {
+  rx(a / 2) x;
+  cx x, y;
+  rz(-b * pi ^ 2 + sin(a)) y;
+  barrier x, y;
+}
+qreg a[2];
+qreg b[1];
+creg c[2];
+creg d[1];
+h a;
+mygate(0.3, 0.2) a[1], b[0];
+cx a, b[0];
+u2(0.1, pi) b[0];
+sx a[0];
+cu(0.3, 0.2, 0.1, 0.4) a[0], b[0];
+reset a[0];
+measure b[0] -> d[0];
+measure a -> c;
+"""
+    c = tc.Circuit.from_openqasm(qasm_str)
+    c1 = tc.Circuit(3)
+    c1.h(0)
+    c1.h(1)
+    c1.rx(1, theta=0.15)
+    c1.cnot(1, 2)
+    c1.rz(2, theta=-0.2 * np.pi**2 + np.sin(0.3))
+    c1.cnot(0, 2)
+    c1.cnot(1, 2)
+    c1.u(2, theta=np.pi / 2, phi=0.1, lbd=np.pi)
+    c1.any(0, unitary=np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]]) / 2)
+    c1.phase(0, theta=0.4)
+    c1.cu(0, 2, theta=0.3, phi=0.2, lbd=0.1)
+    np.testing.assert_allclose(c.state(), c1.state(), atol=1e-5)
+    assert [(d["name"], d["index"][0]) for d in c._extra_qir] == [
+        ("barrier", 1),
+        ("reset", 0),
+        ("measure", 0),
+        ("measure", 1),
+        ("measure", 2),
+    ]
     c = tc.Circuit.from_openqasm(qasm_str, keep_measure_order=True)
-    c.to_openqasm().split("\n")[-2][-3] == "0"
+    assert [(d["name"], d["index"][0]) for d in c._extra_qir] == [
+        ("barrier", 1),
+        ("reset", 0),
+        ("measure", 2),
+        ("measure", 0),
+        ("measure", 1),
+    ]
+    with pytest.raises(ValueError):
+        tc.Circuit.from_openqasm("OPENQASM 2.0;\nqreg q[1];\nfoo q[0];")
+
+    c = tc.Circuit(3)
+    c.ox(0, 1)
+    c.orz(2, 0, theta=0.3)
+    c.iswap(1, 2, theta=0.4)
+    c.ryy(0, 1, theta=0.2)
+    c.wroot(2)
+    c.multicontrol(0, 2, 1, ctrl=[0, 1], unitary=tc.gates._x_matrix)
+    c.exp1(1, theta=0.2, unitary=tc.gates._x_matrix)
+    c.measure_instruction(1)
+    s = c.to_openqasm()
+    assert s.split("\n")[-2] == "measure q[1] -> c[1];"
+    c2 = tc.Circuit.from_openqasm(s)
+    np.testing.assert_allclose(np.abs(np.vdot(c.state(), c2.state())), 1.0, atol=1e-5)
+    np.testing.assert_allclose(c.probability(), c2.probability(), atol=1e-5)
 
 
 def test_initial_mapping():
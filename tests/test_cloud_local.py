@@ -0,0 +1,78 @@
+import sys
+import os
+import time
+
+thisfile = os.path.abspath(__file__)
+modulepath = os.path.dirname(os.path.dirname(thisfile))
+
+sys.path.insert(0, modulepath)
+import tensorcircuit as tc
+from tensorcircuit.cloud import apis, local, wrapper
+
+# tests on the local provider, which need no token
+
+
+def test_local_batch_runner():
+    cs = []
+    for i in range(5):
+        c = tc.Circuit(3)
+        c.x(i % 3)
+        cs.append(c)
+    runner = wrapper.BatchRunner("local::testing", batch_limit=2, max_workers=2)
+    rs = dict(runner.as_completed(cs, shots=128))
+    assert sorted(rs) == list(range(5))
+    run = wrapper.batch_submit_template("local::testing", batch_limit=2)
+    for i, r in enumerate(run(cs, shots=128)):
+        assert r == rs[i]
+        assert r == {["100", "010", "001"][i % 3]: 128}
+    assert run(cs[1], shots=16) == {"010": 16}
+
+
+def test_local_batch_runner_stop():
+    cs = [tc.Circuit(2) for _ in range(8)]
+    runner = wrapper.BatchRunner("local::testing", batch_limit=1, submit_interval=0.2)
+    ntasks = len(local.task_list)
+    for _ in runner.as_completed(cs, shots=16):
+        break
+    time.sleep(1.0)
+    # no more submission after the consumer stops
+    assert len(local.task_list) - ntasks < 3
+
+
+def test_local_result_cache(tmp_path):
+    cache = tc.cloud.cache.set_result_cache(str(tmp_path / "results.sqlite"), maxsize=3)
+    try:
+        cs = []
+        for i in range(3):
+            c = tc.Circuit(2)
+            c.h(0)
+            c.rx(1, theta=0.1 * i)
+            cs.append(c)
+        ts = apis.submit_task(device="local::testing", circuit=cs, shots=64)
+        rs = [t.results() for t in ts]
+        assert len(cache) == 3
+        ts2 = apis.submit_task(device="local::testing", circuit=cs[::-1], shots=64)
+        assert all([isinstance(t, tc.cloud.cache.CachedTask) for t in ts2])
+        assert [t.results() for t in ts2] == rs[::-1]
+        assert cache.hits == 3
+        # different shots is a different job
+        t = apis.submit_task(device="local::testing", circuit=cs[0], shots=32)
+        assert not isinstance(t, tc.cloud.cache.CachedTask)
+        assert sum(t.results().values()) == 32
+        assert len(cache) == 3  # lru eviction
+        cache.ttl = 0
+        t = apis.submit_task(device="local::testing", circuit=cs[0], shots=32)
+        assert not isinstance(t, tc.cloud.cache.CachedTask)
+        # the task in flight is attached to instead of resubmitted
+        cache.ttl = None
+        cache.clear()
+        t = apis.submit_task(device="local::testing", circuit=cs[1], shots=64)
+        key = tc.cloud.cache.result_fingerprint(cs[1], "local::testing", 64)
+        cache.put_submitted(key, t.id_)
+        ntasks = len(local.task_list)
+        t2 = apis.submit_task(device="local::testing", circuit=cs[1], shots=64)
+        assert t2.id_ == t.id_ and len(local.task_list) == ntasks
+        assert t2.results() == t.results()
+        assert cache.get_submitted(key) is None and key in cache
+    finally:
+        tc.cloud.cache.set_result_cache(False)
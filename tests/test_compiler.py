@@ -145,3 +145,72 @@ def test_default_compiler():
     c1, _ = tc.compiler.simple_compiler.simple_compile(c)
     print(c1.draw())
     assert c1.gate_count() == 3
+
+
+def test_fuse():
+    c = tc.Circuit(4)
+    for i in range(4):
+        c.h(i)
+    for j in range(3):
+        for i in range(j % 2, 3, 2):
+            c.rzz(i, i + 1, theta=0.1 * (i + j + 1))
+            c.rx(i, theta=0.2)
+            c.cnot(i, i + 1)
+    c.multicontrol(0, 1, 3, ctrl=[1, 0], unitary=tc.gates._x_matrix)
+    c.measure_instruction(2)
+    for w in [2, 3, 4]:
+        c1 = tc.compiler.simple_compiler.fuse(c, max_width=w)
+        assert c1.gate_count() < c.gate_count()
+        assert max([len(d["index"]) for d in c1.to_qir()]) <= max(w, 3)
+        np.testing.assert_allclose(c.matrix(), c1.matrix(), atol=1e-5)
+    qir = tc.compiler.simple_compiler.fuse(c.to_qir(), max_width=2)
+    np.testing.assert_allclose(
+        c.state(), tc.Circuit.from_qir(qir, {"nqubits": 4}).state(), atol=1e-5
+    )
+    compiler = tc.compiler.Compiler(
+        [tc.compiler.simple_compiler.fuse_compile], [{"max_width": 3}]
+    )
+    c2, _ = compiler(c)
+    np.testing.assert_allclose(c.state(), c2.state(), atol=1e-5)
+    assert c2._extra_qir[0]["pos"] == c2.gate_count()
+
+
+def test_dag_simplify():
+    c = tc.Circuit(3)
+    c.h(0)
+    c.rz(0, theta=0.2)
+    c.cnot(0, 1)
+    c.rz(0, theta=0.3)
+    c.cz(0, 2)
+    c.rz(0, theta=-0.5)
+    c.x(1)
+    c.rx(1, theta=0.1)
+    c.x(1)
+    c.h(2)
+    c.x(2)
+    c.x(2)
+    c.h(2)
+    c.cnot(0, 1)
+    c.ry(1, theta=0.3)
+    c.ry(1, theta=0.4)
+    qir = tc.compiler.dag.dag_simplify(
+        c.to_qir(), tc.compiler.simple_compiler.default_merge_rules
+    )
+    c1 = tc.Circuit.from_qir(qir, c.circuit_param)
+    assert [d["name"] for d in qir] == ["h", "cz", "rx", "ry"]
+    np.testing.assert_allclose(c.matrix(), c1.matrix(), atol=1e-5)
+
+    c1 = tc.compiler.simple_compiler.merge(c)
+    assert c1.gate_count() == 5
+    np.testing.assert_allclose(c.matrix(), c1.matrix(), atol=1e-5)
+
+    n = 8
+    c = tc.Circuit(n)
+    for _ in range(200):
+        for i in range(n - 1):
+            c.rz(i, theta=0.1)
+            c.cnot(i, i + 1)
+            c.cnot(i, i + 1)
+            c.rz(i, theta=-0.1)
+    c1, _ = tc.compiler.simple_compiler.simple_compile(c)
+    assert c1.gate_count() == 0
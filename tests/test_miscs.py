@@ -2,6 +2,7 @@
 
 import sys
 import os
+import subprocess
 from functools import partial
 import numpy as np
 import tensorflow as tf
@@ -36,6 +37,28 @@ def test_about():
     print(tc.about())
 
 
+def test_import_lazy():
+    # guard the import time regression: no heavy framework is imported with tensorcircuit
+    code = (
+        "import sys; import tensorcircuit as tc; "
+        "heavy = [m for m in ['tensorflow', 'torch', 'jax', 'qiskit', 'cirq'] "
+        "if m in sys.modules]; "
+        "assert not heavy, heavy; "
+        "tc.templates.measurements"
+    )
+    r = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=modulepath,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert r.returncode == 0, r.stderr
+    assert "keras" in dir(tc)
+    with pytest.raises(AttributeError):
+        tc.not_a_submodule  # pylint: disable=pointless-statement
+
+
 def test_ps2coo(tfb):
     for l, a in check_pairs:
         r1 = PauliString2COO(tf.constant(l, dtype=tf.int64))
@@ -54,6 +77,22 @@ def test_pss2coo(tfb):
     np.testing.assert_allclose(tc.backend.to_dense(r1), a, atol=1e-5)
 
 
+@pytest.mark.parametrize("backend", [lf("npb"), lf("jaxb"), lf("torchb")])
+def test_pss2coo_backends(backend):
+    l = [t[0] for t in check_pairs[4:]] + [[2, 2, 1, 3]]
+    w = [1.5j, 0.7, 0.2]
+    a = 1.5j * check_pairs[4][1] + 0.7 * check_pairs[5][1]
+    a = a + 0.2 * np.kron(np.kron(np.kron(y, y), x), z)
+    # duplicated terms are merged into the same entries
+    r1 = PauliStringSum2COO(l + [[3, 2, 2, 0]], w + [-0.5j])
+    a1 = a - 0.5j * check_pairs[4][1]
+    np.testing.assert_allclose(tc.backend.to_dense(r1), a1, atol=1e-5)
+    r2 = tc.quantum.PauliStringSum2CSR_numpy(l, w)
+    assert r2.has_sorted_indices
+    np.testing.assert_allclose(r2.toarray(), a, atol=1e-5)
+    np.testing.assert_allclose(tc.quantum.PauliStringSum2Dense(l, w), a, atol=1e-5)
+
+
 def test_sparse(benchmark, tfb):
     def sparse(h):
         return PauliStringSum2COO(h)
@@ -250,6 +289,19 @@ def test_evol(jaxb):
     c.rx(1, theta=np.pi - 0.4)
     np.testing.assert_allclose(c.expectation_ps(z=[1]), 1.0, atol=1e-5)
 
+    ixi_op = tc.quantum.PauliSumOperator([[0, 1, 0]])
+
+    def h_square_op(t, b):
+        return (tc.backend.sign(t - 1.0) + 1) / 2 * b * ixi_op
+
+    c = tc.Circuit(3)
+    c.x(0)
+    c.cx(0, 1)
+    c.h(2)
+    c = experimental.evol_global(c, h_square_op, 2.0, tc.backend.convert_to_tensor(0.2))
+    c.rx(1, theta=np.pi - 0.4)
+    np.testing.assert_allclose(c.expectation_ps(z=[1]), 1.0, atol=1e-5)
+
 
 def test_energy_baseline():
     print(TFIM1Denergy(10))
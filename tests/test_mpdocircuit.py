@@ -0,0 +1,113 @@
+import sys
+import os
+import numpy as np
+import pytest
+from pytest_lazyfixture import lazy_fixture as lf
+
+thisfile = os.path.abspath(__file__)
+modulepath = os.path.dirname(os.path.dirname(thisfile))
+
+sys.path.insert(0, modulepath)
+import tensorcircuit as tc
+
+
+def _build_noisy(c, n):
+    for i in range(n):
+        c.h(i)
+    for i in range(n - 1):
+        c.cnot(i, i + 1)
+        c.depolarizing(i, px=0.05, py=0.02, pz=0.03)
+        c.amplitudedamping(i + 1, gamma=0.2, p=0.7)
+        c.rx(i, theta=0.3)
+    c.cnot(3, 0)
+    c.rzz(0, 2, theta=0.4)
+    c.general_kraus(tc.channels.generaldepolarizingchannel(0.01, 2), 1, 3)
+    c.reset(2)
+    c.phasedamping(1, gamma=0.1)
+    c.ccnot(3, 0, 2)
+    c.multicontrol(2, 0, 1, ctrl=[1, 0], unitary=tc.gates._x_matrix)
+    return c
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_mpdo_circuit_against_dmcircuit(backend):
+    n = 4
+    c1 = _build_noisy(tc.MPDOCircuit(n), n)
+    c2 = _build_noisy(tc.DMCircuit(n), n)
+    dm = tc.backend.numpy(c2.densitymatrix())
+    np.testing.assert_allclose(c1.densitymatrix(), dm, atol=1e-5)
+    np.testing.assert_allclose(
+        c1.expectation_ps(x=[0], z=[3]), c2.expectation_ps(x=[0], z=[3]), atol=1e-5
+    )
+    ops = [(tc.gates.z(), [1]), (tc.gates.cnot(), [3, 2])]
+    np.testing.assert_allclose(
+        c1.expectation(*ops),
+        tc.DMStateCircuit(n, dminputs=dm).expectation(*ops),
+        atol=1e-5,
+    )
+    reduced = np.einsum("abcdefcd->abef", dm.reshape([2] * 8)).reshape([4, 4])
+    np.testing.assert_allclose(c1.densitymatrix([0, 1]), reduced, atol=1e-5)
+    reduced = np.einsum("abcdaefd->cbfe", dm.reshape([2] * 8)).reshape([4, 4])
+    np.testing.assert_allclose(c1.densitymatrix([2, 1]), reduced, atol=1e-5)
+    with pytest.raises(ValueError):
+        c1.expectation((tc.gates.z(), [1]), (tc.gates.x(), [1]))
+
+    r = c1.sample(batch=2048, format="count_vector")
+    np.testing.assert_allclose(
+        tc.backend.numpy(r) / 2048, np.real(np.diag(dm)), atol=0.05
+    )
+    s, p = c1.sample()
+    assert s.shape[0] == n
+
+    # channels are recorded in the qir and replayed
+    assert c1.gate_count(["depolarizing"]) == n - 1
+    c3 = tc.MPDOCircuit._apply_qir(tc.MPDOCircuit(n), c1.copy().to_qir())
+    np.testing.assert_allclose(c3.densitymatrix(), dm, atol=1e-5)
+    with pytest.raises(ValueError):
+        c1.to_openqasm()
+
+
+def test_mpdo_circuit_truncation(jaxb):
+    n = 40
+    c = tc.MPDOCircuit(n, split={"max_singular_values": 8})
+    for i in range(n):
+        c.h(i)
+    for j in range(2):
+        for i in range(j, n - 1, 2):
+            c.cnot(i, i + 1)
+            c.depolarizing(i + 1, px=0.02, py=0.02, pz=0.02)
+        for i in range(n):
+            c.rx(i, theta=0.2)
+    assert max(c.get_bond_dimensions()) <= 8
+    assert max(c.get_kraus_dimensions()) <= 8
+    z = c.expectation_ps(z=[20])
+    assert np.abs(z) < 1.0
+    dm = c.densitymatrix([19, 20])
+    np.testing.assert_allclose(np.trace(dm), 1.0, atol=1e-5)
+    assert tc.backend.numpy(c.sample(batch=4, format="sample_bin")).shape == (4, n)
+
+
+def test_mpdo_circuit_jit(jaxb):
+    def f(gamma):
+        c = tc.MPDOCircuit(3, split={"max_singular_values": 4})
+        c.h(0)
+        c.cnot(0, 1)
+        c.rx(2, theta=gamma)
+        c.amplitudedamping(1, gamma=gamma, p=1.0)
+        c.cnot(2, 0)
+        return tc.backend.real(c.expectation_ps(z=[1]) + c.expectation_ps(y=[2]))
+
+    def g(gamma):
+        c = tc.DMCircuit(3)
+        c.h(0)
+        c.cnot(0, 1)
+        c.rx(2, theta=gamma)
+        c.amplitudedamping(1, gamma=gamma, p=1.0)
+        c.cnot(2, 0)
+        return tc.backend.real(c.expectation_ps(z=[1]) + c.expectation_ps(y=[2]))
+
+    gamma = tc.backend.convert_to_tensor(0.2)
+    v1, g1 = tc.backend.jit(tc.backend.value_and_grad(f))(gamma)
+    v2, g2 = tc.backend.value_and_grad(g)(gamma)
+    np.testing.assert_allclose(v1, v2, atol=1e-5)
+    np.testing.assert_allclose(g1, g2, atol=1e-5)
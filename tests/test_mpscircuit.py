@@ -273,6 +273,34 @@ def do_test_measure(test_circuits: type_test_circuits):
     np.testing.assert_allclose(result_mps_exact[1], result_c[1], atol=1e-8)
 
 
+def do_test_sample(test_circuits: type_test_circuits):
+    (
+        c,
+        w_c,
+        mps,
+        w_mps,
+        mps_exact,
+        w_mps_exact,
+    ) = test_circuits
+    status = np.random.uniform(size=[3, N])
+    results = mps_exact.sample(batch=3, status=status)
+    for i in range(3):
+        sample_c, p_c = c.measure(*range(N), with_prob=True, status=status[i])
+        np.testing.assert_allclose(results[i][0], sample_c, atol=1e-8)
+        np.testing.assert_allclose(results[i][1], p_c, atol=1e-8)
+    # truncated mps samples from its own (normalized) wavefunction
+    probs = np.abs(tc.backend.numpy(w_mps)) ** 2
+    probs /= np.sum(probs)
+    samples = mps.sample(
+        batch=2048,
+        format="sample_int",
+        random_generator=tc.backend.get_random_state(42),
+    )
+    freq = np.bincount(tc.backend.numpy(samples), minlength=2**N) / 2048
+    np.testing.assert_allclose(freq, probs, atol=0.05)
+    assert tc.backend.shape_tuple(mps.sample(batch=5, format="sample_bin")) == (5, N)
+
+
 def test_MPO_conversion(highp, tfb):
     O3 = reproducible_unitary(3, 1.0)
     I = tc.backend.eye(2, dtype=tc.dtypestr)
@@ -307,6 +335,7 @@ def test_circuits(backend, dtype):
     do_test_proj(circuits, external)
     do_test_tensor_input(circuits)
     do_test_measure(circuits)
+    do_test_sample(circuits)
 
 
 @pytest.mark.parametrize("backend, dtype", [(lf("tfb"), lf("highp"))])
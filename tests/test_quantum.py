@@ -319,6 +319,49 @@ def test_heisenberg_ham(tfb):
     np.testing.assert_allclose(e[0], -11.2111, atol=1e-4)
 
 
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb"), lf("torchb")])
+def test_pauli_sum_operator(backend):
+    from scipy.sparse.linalg import eigsh
+
+    n = 5
+    ls = np.random.randint(0, 4, size=[10, n])
+    w = np.random.normal(size=[10])
+    h = np.asarray(qu.PauliStringSum2Dense(ls, w, numpy=True))
+    op = qu.PauliSumOperator(ls, w)
+    v = np.random.normal(size=[2**n, 3]).astype(np.complex64)
+    np.testing.assert_allclose(op @ tc.backend.convert_to_tensor(v), h @ v, atol=1e-4)
+    np.testing.assert_allclose(
+        (-2.0 * op).matvec(tc.backend.convert_to_tensor(v[:, 0])),
+        -2.0 * h @ v[:, 0],
+        atol=1e-4,
+    )
+    np.testing.assert_allclose(
+        eigsh(op, k=1, which="SA")[0], np.linalg.eigvalsh(h)[:1], atol=1e-4
+    )
+
+    def f(param, dense):
+        c = tc.Circuit(n)
+        for i in range(n):
+            c.rx(i, theta=param[i])
+        for i in range(n - 1):
+            c.cnot(i, i + 1)
+        if dense:
+            return tc.templates.measurements.operator_expectation(
+                c, tc.backend.convert_to_tensor(h)
+            )
+        return tc.templates.measurements.operator_expectation(c, op)
+
+    param = tc.backend.ones([n])
+    np.testing.assert_allclose(f(param, False), f(param, True), atol=1e-4)
+    if tc.backend.name != "numpy":
+        vg = tc.backend.jit(tc.backend.value_and_grad(partial(f, dense=False)))
+        _, g1 = vg(param)
+        _, g2 = tc.backend.value_and_grad(partial(f, dense=True))(param)
+        np.testing.assert_allclose(g1, g2, atol=1e-4)
+        r = tc.backend.vmap(op.matvec)(tc.backend.convert_to_tensor(v.T))
+        np.testing.assert_allclose(r, (h @ v).T, atol=1e-4)
+
+
 @pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
 def test_reduced_density_from_density(backend):
     n = 6
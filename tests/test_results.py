@@ -29,6 +29,41 @@ def test_expectation():
     assert counts.expectation(d, None, [[1, -1], [1, 0], [1, 1]]) == -5 / 9
 
 
+def test_counts_container():
+    c = counts.Counts.from_dict(d)
+    assert c.to_dict() == d
+    assert c.shots == 9
+    assert c.marginal([2, 1, 0]).to_dict() == counts.marginal_count(d, [2, 1, 0])
+    assert c.marginal([1]).to_dict() == {"0": 9}
+    assert c.expectation(z=[0, 1]) == counts.expectation(d, [0, 1])
+    assert list(c.sort().to_dict().keys()) == ["100", "101", "000"]
+    assert c.merge(c).to_dict() == {"000": 4, "100": 8, "101": 6}
+    assert counts.merge_count(d, {"111": 1}) == {**d, "111": 1}
+    assert c.kl_divergence(c) == 0
+    np.testing.assert_allclose(
+        c.kl_divergence(counts.Counts.from_dict({"000": 1})),
+        counts.kl_divergence(d, {"000": 1}),
+    )
+    keys, values = c.to_tuple()
+    assert tc.quantum.count_tuple2dict((keys, values), 3) == d
+    assert counts.Counts.from_tuple((keys, values), 3).to_dict() == d
+    np.testing.assert_allclose(c.to_vector(), counts.count2vec(d))
+    # a repeated index is a single Z
+    assert counts.expectation({"01": 3, "11": 2}, z=[1, 1]) == -1.0
+    assert counts.Counts.from_dict({}).to_dict() == {}
+    assert counts.marginal_count({}, [0]) == {}
+    assert counts.merge_count() == {}
+    assert counts.merge_count({}, d) == d
+
+    samples = np.random.default_rng(42).integers(0, 2, size=[1000, 70])
+    c = counts.Counts.from_samples(samples)
+    assert c.shots == 1000
+    assert c.marginal([69, 3]).to_dict() == counts.marginal_count(c.to_dict(), [69, 3])
+    np.testing.assert_allclose(
+        c.expectation(z=[1, 68]), np.mean((-1) ** (samples[:, 1] + samples[:, 68]))
+    )
+
+
 def test_plot_histogram():
     d = {"00": 10, "01": 2, "11": 8}
     d1 = {"00": 11, "11": 9}
@@ -90,6 +125,84 @@ def test_readout_masks():
     )
 
 
+def test_readout_tensored():
+    nqubit = 5
+    c = tc.Circuit(nqubit)
+    c.H(0)
+    for i in range(nqubit - 1):
+        c.cnot(i, i + 1)
+    raw_count = run([c], 10000)[0]
+    mit = ReadoutMit(execute=run)
+    mit.cals_from_system(nqubit, shots=10000, method="local")
+    mit.use_qubits = list(range(nqubit))
+    p = counts.count2vec(raw_count)
+    np.testing.assert_allclose(
+        mit.mitigate_probability(p), np.linalg.inv(mit.get_matrix()) @ p, atol=1e-8
+    )
+    r1 = mit.apply_readout_mitigation(raw_count)
+    np.testing.assert_allclose(sum(r1.values()), 10000, atol=1e-3)
+    r2 = mit.apply_readout_mitigation(raw_count, subspace=True)
+    for k in raw_count:
+        np.testing.assert_allclose(r1[k], r2[k], atol=1e-6)
+    for subspace in [False, True]:
+        r = mit.apply_readout_mitigation(raw_count, "square", subspace=subspace)
+        np.testing.assert_allclose(sum(r.values()), 10000, atol=1e-3)
+        assert min(r.values()) >= 0
+        assert counts.kl_divergence({"00000": 1, "11111": 1}, r) < 0.05
+
+
+def test_m3_reduced_matrix():
+    from tensorcircuit.results.readout_mitigation import (
+        _ReducedCalMatrix,
+        _hamming_distance,
+        _pack_bits,
+    )
+
+    rng = np.random.default_rng(42)
+    bits = rng.integers(0, 2, size=[50, 70]).astype(np.uint8)
+    np.testing.assert_allclose(
+        _hamming_distance(_pack_bits(bits), _pack_bits(bits[:3])),
+        np.sum(bits[:, None, :] != bits[None, :3, :], axis=-1),
+    )
+
+    n = 5
+    mit = ReadoutMit(execute=run)
+    mit.cals_from_system(n, shots=10000, method="local")
+    raw_count = {
+        format(i, "05b"): int(v) for i, v in enumerate(rng.integers(1, 20, size=32))
+    }
+    raw_count = {k: v for k, v in raw_count.items() if int(k, 2) % 3 != 1}
+    qubits = [3, 0, 4, 2, 1]
+    count = counts.Counts.from_dict(raw_count).merge()
+    index = count.to_tuple()[0]
+    A = mit.get_matrix(qubits)[index][:, index]
+    dist = np.sum(count.bits[:, None, :] != count.bits[None, :, :], axis=-1)
+    A = A * (dist <= 2)
+    A /= np.sum(A, axis=0, keepdims=True)
+    M = _ReducedCalMatrix(mit._local_cals(qubits), count.bits, 2)
+    np.testing.assert_allclose(M.to_dense(), A, atol=1e-10)
+    x = rng.normal(size=[len(count)])
+    np.testing.assert_allclose(M.matvec(x), A @ x, atol=1e-10)
+    np.testing.assert_allclose(M.rmatvec(x), A.T @ x, atol=1e-10)
+    np.testing.assert_allclose(M.get_diagonal(), np.diag(A), atol=1e-10)
+    M2 = _ReducedCalMatrix(mit._local_cals(qubits), count.bits, 2, nthreads=2)
+    np.testing.assert_allclose(M2.matvec(x), A @ x, atol=1e-10)
+
+    A1, sorted_count = mit.reduced_cal_matrix(raw_count, qubits, distance=2)
+    np.testing.assert_allclose(A1, A, atol=1e-10)
+    assert list(sorted_count.keys()) == sorted(raw_count.keys())
+    assert len(mit._m3_cache) == 1
+    # the kron tables are shared by the different observed bitstrings,
+    # and the least recently used matrices beyond the memory budget are dropped
+    mit.m3_cache_bytes = mit._m3_cache[next(iter(mit._m3_cache))]["M"].nbytes
+    raw_count2 = dict(list(raw_count.items())[:-2])
+    mit.reduced_cal_matrix(raw_count2, qubits, distance=2)
+    assert len(mit._m3_cache) == 1 and len(mit._m3_tables) == 1
+    mit.m3_cache_bytes = 0
+    mit.reduced_cal_matrix(raw_count, qubits, distance=2)
+    assert len(mit._m3_cache) == 0
+
+
 def test_readout_expv():
     nqubit = 4
     c = tc.Circuit(nqubit)
@@ -0,0 +1,185 @@
+import sys
+import os
+import numpy as np
+import pytest
+from pytest_lazyfixture import lazy_fixture as lf
+
+thisfile = os.path.abspath(__file__)
+modulepath = os.path.dirname(os.path.dirname(thisfile))
+
+sys.path.insert(0, modulepath)
+import tensorcircuit as tc
+
+
+def _build(cls, n, **kws):
+    c = cls(n, **kws)
+    for i in range(n):
+        c.h(i)
+    for j in range(n - 1):
+        c.rzz(j, j + 1, theta=0.3 * j + 0.1)
+        c.rx(j, theta=0.2)
+    c.exp1(1, 3, theta=0.3, unitary=tc.gates.array_to_tensor(tc.gates._xx_matrix))
+    c.any(
+        2,
+        0,
+        unitary=tc.gates.array_to_tensor(
+            np.kron(tc.gates._x_matrix, tc.gates._z_matrix)
+        ),
+    )
+    return c
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb"), lf("torchb")])
+def test_state_circuit_against_circuit(backend):
+    n = 5
+    c1 = _build(tc.StateCircuit, n)
+    c2 = _build(tc.Circuit, n)
+    x = tc.gates.array_to_tensor(tc.gates._x_matrix)
+    c1.multicontrol(0, 2, 4, ctrl=[1, 0], unitary=x)
+    c2.multicontrol(0, 2, 4, ctrl=[1, 0], unitary=x)
+    np.testing.assert_allclose(c1.state(), c2.state(), atol=1e-5)
+    np.testing.assert_allclose(
+        c1.expectation_ps(x=[0], z=[3]), c2.expectation_ps(x=[0], z=[3]), atol=1e-5
+    )
+    ops = [(tc.gates.z(), [1]), (tc.gates.cnot(), [3, 2])]
+    np.testing.assert_allclose(c1.expectation(*ops), c2.expectation(*ops), atol=1e-5)
+    np.testing.assert_allclose(c1.matrix(), c2.matrix(), atol=1e-5)
+    np.testing.assert_allclose(c1.amplitude("01011"), c2.amplitude("01011"), atol=1e-5)
+    np.testing.assert_allclose(c1.probability(), c2.probability(), atol=1e-5)
+    assert c1.to_qir()[0]["name"] == "h"
+    c3 = c1.copy()
+    assert isinstance(c3, tc.StateCircuit)
+    np.testing.assert_allclose(c3.state(), c1.state(), atol=1e-5)
+    c1.mid_measurement(1, keep=1)
+    c2.mid_measurement(1, keep=1)
+    np.testing.assert_allclose(c1.state(), c2.state(), atol=1e-5)
+    with pytest.raises(ValueError):
+        c1.expectation((tc.gates.z(), [1]), (tc.gates.x(), [1]))
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_state_circuit_inputs_and_sample(backend):
+    n = 4
+    w = np.ones([2**n], dtype=np.complex64) / 2 ** (n / 2)
+    c1 = _build(tc.StateCircuit, n, inputs=w)
+    c2 = _build(tc.Circuit, n, inputs=w)
+    np.testing.assert_allclose(c1.state(), c2.state(), atol=1e-5)
+    w = np.eye(2**n, dtype=np.complex64)[3]
+    c1.replace_inputs(tc.backend.convert_to_tensor(w))
+    c2.replace_inputs(tc.backend.convert_to_tensor(w))
+    np.testing.assert_allclose(c1.state(), c2.state(), atol=1e-5)
+    r = c1.sample(batch=16, allow_state=True, format="count_dict_bin")
+    assert sum(r.values()) == 16
+    c = tc.StateCircuit(2)
+    c.x(0)
+    assert tc.backend.numpy(c.sample()[0]).tolist() == [1.0, 0.0]
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("jaxb")])
+def test_state_circuit_replay_mid_measurement(backend):
+    def build(cls, **kws):
+        c = cls(2, **kws)
+        c.h(0)
+        c.cnot(0, 1)
+        c.mid_measurement(0, keep=0)
+        c.x(1)
+        return c
+
+    w = np.eye(4, dtype=np.complex64)[0]
+    c1 = build(tc.StateCircuit, inputs=w)
+    c2 = build(tc.Circuit, inputs=w)
+    c1.replace_inputs(tc.backend.convert_to_tensor(w))
+    c2.replace_inputs(tc.backend.convert_to_tensor(w))
+    np.testing.assert_allclose(c1.state(), [0, 0.70710677, 0, 0], atol=1e-5)
+    np.testing.assert_allclose(c1.state(), c2.state(), atol=1e-5)
+    np.testing.assert_allclose(
+        build(tc.StateCircuit).matrix(), build(tc.Circuit).matrix(), atol=1e-5
+    )
+
+
+@pytest.mark.parametrize("backend", [lf("tfb"), lf("jaxb")])
+def test_state_circuit_ad_jit(backend):
+    def f(theta, cls):
+        c = cls(4)
+        c.h(0)
+        c.rx(1, theta=theta)
+        c.cnot(1, 2)
+        c.ry(2, theta=theta)
+        return tc.backend.real(c.expectation_ps(z=[2]) + c.expectation_ps(x=[0]))
+
+    theta = tc.backend.convert_to_tensor(0.3)
+    v1, g1 = tc.backend.jit(tc.backend.value_and_grad(lambda t: f(t, tc.StateCircuit)))(
+        theta
+    )
+    v2, g2 = tc.backend.value_and_grad(lambda t: f(t, tc.Circuit))(theta)
+    np.testing.assert_allclose(v1, v2, atol=1e-5)
+    np.testing.assert_allclose(g1, g2, atol=1e-5)
+
+
+def _build_noisy(cls, n):
+    c = cls(n)
+    for i in range(n):
+        c.h(i)
+    for i in range(n - 1):
+        c.cnot(i, i + 1)
+        c.depolarizing(i, px=0.05, py=0.02, pz=0.03)
+        c.amplitudedamping(i + 1, gamma=0.2, p=0.7)
+        c.phasedamping(i, gamma=0.1)
+        c.rx(i, theta=0.3)
+    c.reset(0)
+    c.thermalrelaxation(
+        1, t1=300, t2=100, time=100, method="AUTO", excitedstatepopulation=0.0
+    )
+    c.general_kraus(tc.channels.generaldepolarizingchannel(0.01, 2), 1, 3)
+    return c
+
+
+@pytest.mark.parametrize("backend", [lf("npb"), lf("tfb"), lf("jaxb")])
+def test_dm_state_circuit_against_dmcircuit(backend):
+    n = 4
+    c1 = _build_noisy(tc.DMStateCircuit, n)
+    c2 = _build_noisy(tc.DMCircuit, n)
+    np.testing.assert_allclose(c1.densitymatrix(), c2.densitymatrix(), atol=1e-5)
+    np.testing.assert_allclose(
+        c1.expectation_ps(x=[0], z=[3]), c2.expectation_ps(x=[0], z=[3]), atol=1e-5
+    )
+    ops = [(tc.gates.z(), [1]), (tc.gates.y(), [2])]
+    np.testing.assert_allclose(c1.expectation(*ops), c2.expectation(*ops), atol=1e-5)
+    np.testing.assert_allclose(c1.amplitude("0101"), c2.amplitude("0101"), atol=1e-5)
+    np.testing.assert_allclose(c1.probability(), c2.probability(), atol=1e-5)
+    r = c1.sample(batch=16, allow_state=True, format="count_dict_bin")
+    assert sum(r.values()) == 16
+    with pytest.raises(ValueError):
+        c1.expectation((tc.gates.z(), [1]), (tc.gates.x(), [1]))
+
+    w = np.eye(2**n, dtype=np.complex64)[3]
+    c3 = _build_noisy(tc.DMStateCircuit, n)
+    c3.replace_inputs(tc.backend.convert_to_tensor(w))
+    c4 = _build_noisy(lambda n: tc.DMCircuit(n, inputs=w), n)
+    np.testing.assert_allclose(c3.densitymatrix(), c4.densitymatrix(), atol=1e-5)
+    dm = c4.densitymatrix()
+    c5 = tc.DMStateCircuit(n, dminputs=dm)
+    c5.cnot(0, 1)
+    c6 = tc.DMCircuit(n, dminputs=dm)
+    c6.cnot(0, 1)
+    np.testing.assert_allclose(c5.state(), c6.state(), atol=1e-5)
+
+
+@pytest.mark.parametrize("backend", [lf("tfb"), lf("jaxb")])
+def test_dm_state_circuit_ad_jit(backend):
+    def f(gamma, cls):
+        c = cls(3)
+        c.h(0)
+        c.cnot(0, 1)
+        c.rx(2, theta=gamma)
+        c.amplitudedamping(1, gamma=gamma, p=1.0)
+        c.depolarizing(2, px=gamma / 3, py=gamma / 3, pz=gamma / 3)
+        return tc.backend.real(c.expectation_ps(z=[1]) + c.expectation_ps(y=[2]))
+
+    gamma = tc.backend.convert_to_tensor(0.2)
+    v1, g1 = tc.backend.jit(
+        tc.backend.value_and_grad(lambda t: f(t, tc.DMStateCircuit))
+    )(gamma)
+    v2, g2 = tc.backend.value_and_grad(lambda t: f(t, tc.DMCircuit))(gamma)
+    np.testing.assert_allclose(v1, v2, atol=1e-5)
+    np.testing.assert_allclose(g1, g2, atol=1e-5)